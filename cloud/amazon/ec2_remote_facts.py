@@ -26,6 +26,38 @@ options:
       - A dict of filters to apply. Each dict item consists of a filter key and a filter value. See U(http://docs.aws.amazon.com/AWSEC2/latest/APIReference/API_DescribeInstances.html) for possible filters.
     required: false
     default: null
+  regions:
+    description:
+      - List of regions to gather facts from, or C(all) for every region
+        known to boto. Regions are queried concurrently and the instances
+        of all regions are returned in one list. When not set, only the
+        region given by C(region) is queried.
+    required: false
+    default: null
+    version_added: "2.2"
+  page_size:
+    description:
+      - Maximum number of reservations returned by each DescribeInstances
+        call. Results are paged through until every instance has been
+        returned.
+    required: false
+    default: null
+    version_added: "2.2"
+  workers:
+    description:
+      - Number of regions queried concurrently when C(regions) is set.
+    required: false
+    default: 4
+    version_added: "2.2"
+  fields:
+    description:
+      - List of instance keys to return, for example C(id), C(tags) and
+        C(private_ip_address). Keys that are not requested, such as
+        C(block_device_mapping), are not built at all. All keys are
+        returned when not set.
+    required: false
+    default: null
+    version_added: "2.2"
 author:
     - "Michael Schuett (@michaeljs1990)"
 extends_documentation_fragment:
@@ -56,6 +88,17 @@ EXAMPLES = '''
       vpc-id: vpc-123456
       instance-type: t2.small
 
+# Gather the id, tags and private address of running instances in every region
+- ec2_remote_facts:
+    regions: all
+    page_size: 500
+    fields:
+      - id
+      - tags
+      - private_ip_address
+    filters:
+      instance-state-name: running
+
 '''
 
 try:
@@ -65,17 +108,21 @@ try:
 except ImportError:
     HAS_BOTO = False
 
-def get_instance_info(instance):
+from multiprocessing.pool import ThreadPool
+
+def get_instance_info(instance, fields=None):
 
     # Get groups
     groups = []
-    for group in instance.groups:
-        groups.append({ 'id': group.id, 'name': group.name }.copy())
+    if fields is None or 'groups' in fields:
+        for group in instance.groups:
+            groups.append({ 'id': group.id, 'name': group.name }.copy())
 
     # Get interfaces
     interfaces = []
-    for interface in instance.interfaces:
-        interfaces.append({ 'id': interface.id, 'mac_address': interface.mac_address }.copy())
+    if fields is None or 'interfaces' in fields:
+        for interface in instance.interfaces:
+            interfaces.append({ 'id': interface.id, 'mac_address': interface.mac_address }.copy())
 
     # If an instance is terminated, sourceDestCheck is no longer returned
     try:
@@ -84,19 +131,20 @@ def get_instance_info(instance):
         source_dest_check = None
 
     # Get block device mapping
-    try:
-        bdm_dict = []
-        bdm = getattr(instance, 'block_device_mapping')
-        for device_name in bdm.keys():
-            bdm_dict.append({
-                'device_name': device_name,
-                'status': bdm[device_name].status,
-                'volume_id': bdm[device_name].volume_id,
-                'delete_on_termination': bdm[device_name].delete_on_termination,
-                'attach_time': bdm[device_name].attach_time
-            })
-    except AttributeError:
-        pass
+    bdm_dict = []
+    if fields is None or 'block_device_mapping' in fields:
+        try:
+            bdm = getattr(instance, 'block_device_mapping')
+            for device_name in bdm.keys():
+                bdm_dict.append({
+                    'device_name': device_name,
+                    'status': bdm[device_name].status,
+                    'volume_id': bdm[device_name].volume_id,
+                    'delete_on_termination': bdm[device_name].delete_on_termination,
+                    'attach_time': bdm[device_name].attach_time
+                })
+        except AttributeError:
+            pass
 
     instance_info = { 'id': instance.id,
                     'kernel': instance.kernel,
@@ -134,21 +182,71 @@ def get_instance_info(instance):
                     'block_device_mapping': bdm_dict,
                   }
 
+    if fields is not None:
+        instance_info = dict((k, v) for k, v in instance_info.items() if k in fields)
+
     return instance_info
 
 
+def get_ec2_instances(connection, filters, page_size=None, fields=None):
+
+    instance_dict_array = []
+    next_token = None
+
+    while True:
+        reservations = connection.get_all_reservations(filters=filters,
+                                                       max_results=page_size,
+                                                       next_token=next_token)
+        for reservation in reservations:
+            for instance in reservation.instances:
+                instance_dict_array.append(get_instance_info(instance, fields))
+        next_token = getattr(reservations, 'next_token', None)
+        if not next_token:
+            break
+
+    return instance_dict_array
+
+
 def list_ec2_instances(connection, module):
 
     filters = module.params.get("filters")
-    instance_dict_array = []
+    page_size = module.params.get("page_size")
+    fields = module.params.get("fields")
 
     try:
-        all_instances = connection.get_only_instances(filters=filters)
+        instance_dict_array = get_ec2_instances(connection, filters, page_size, fields)
     except BotoServerError as e:
         module.fail_json(msg=e.message)
 
-    for instance in all_instances:
-        instance_dict_array.append(get_instance_info(instance))
+    module.exit_json(instances=instance_dict_array)
+
+
+def list_ec2_instances_in_regions(regions, aws_connect_params, module):
+
+    filters = module.params.get("filters")
+    page_size = module.params.get("page_size")
+    fields = module.params.get("fields")
+    workers = module.params.get("workers")
+
+    if regions == ['all']:
+        regions = [r.name for r in boto.ec2.regions()]
+
+    def get_region_instances(region):
+        connection = connect_to_aws(boto.ec2, region, **aws_connect_params)
+        return get_ec2_instances(connection, filters, page_size, fields)
+
+    pool = ThreadPool(max(1, min(workers, len(regions))))
+    try:
+        results = pool.map(get_region_instances, regions)
+    except (BotoServerError, boto.exception.NoAuthHandlerFound, AnsibleAWSError), e:
+        module.fail_json(msg=getattr(e, 'message', None) or str(e))
+    finally:
+        pool.close()
+        pool.join()
+
+    instance_dict_array = []
+    for region_instances in results:
+        instance_dict_array.extend(region_instances)
 
     module.exit_json(instances=instance_dict_array)
 
@@ -157,7 +255,11 @@ def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
-            filters = dict(default=None, type='dict')
+            filters = dict(default=None, type='dict'),
+            regions = dict(default=None, type='list'),
+            page_size = dict(default=None, type='int'),
+            workers = dict(default=4, type='int'),
+            fields = dict(default=None, type='list'),
         )
     )
 
@@ -168,6 +270,10 @@ def main():
 
     region, ec2_url, aws_connect_params = get_aws_connection_info(module)
 
+    regions = module.params.get("regions")
+    if regions:
+        list_ec2_instances_in_regions(regions, aws_connect_params, module)
+
     if region:
         try:
             connection = connect_to_aws(boto.ec2, region, **aws_connect_params)
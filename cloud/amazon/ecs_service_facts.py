@@ -43,6 +43,19 @@ options:
         description:
             - The service to get details for (required if details is true)
         required: false
+    events_limit:
+        description:
+            - Maximum number of the most recent events returned for each service when details is true.
+              All events are returned when not set.
+        required: false
+        version_added: "2.2"
+    workers:
+        description:
+            - Number of describe requests sent concurrently. Services are described in batches of ten,
+              the most a single request accepts.
+        required: false
+        default: 4
+        version_added: "2.2"
 extends_documentation_fragment:
     - aws
     - ec2
@@ -60,6 +73,13 @@ EXAMPLES = '''
 # Basic listing example
 - ecs_service_facts:
     cluster: test-cluster
+
+# Describe many services, keeping only their five latest events
+- ecs_service_facts:
+    cluster: test-cluster
+    service: "{{ service_arns | join(',') }}"
+    details: "true"
+    events_limit: 5
 '''
 
 RETURN = '''
@@ -139,6 +159,11 @@ try:
 except ImportError:
     HAS_BOTO3 = False
 
+from multiprocessing.pool import ThreadPool
+
+# DescribeServices accepts at most this many services per request
+DESCRIBE_SERVICES_LIMIT = 10
+
 class EcsServiceManager:
     """Handles ECS Services"""
 
@@ -167,22 +192,51 @@ class EcsServiceManager:
         fn_args = dict()
         if cluster and cluster is not None:
             fn_args['cluster'] = cluster
-        response = self.ecs.list_services(**fn_args)
-        relevant_response = dict(services = response['serviceArns'])
+        service_arns = []
+        while True:
+            response = self.ecs.list_services(**fn_args)
+            service_arns.extend(response['serviceArns'])
+            if not response.get('nextToken'):
+                break
+            fn_args['nextToken'] = response['nextToken']
+        relevant_response = dict(services = service_arns)
         return relevant_response
 
-    def describe_services(self, cluster, services):
-        fn_args = dict()
-        if cluster and cluster is not None:
-            fn_args['cluster'] = cluster
-        fn_args['services']=services.split(",")
-        response = self.ecs.describe_services(**fn_args)
-        relevant_response = dict(services = map(self.extract_service_from, response['services']))
-        if 'failures' in response and len(response['failures'])>0:
-            relevant_response['services_not_running'] = response['failures']
+    def describe_services(self, cluster, services, events_limit=None, workers=1):
+        services = services.split(",")
+        chunks = [services[i:i + DESCRIBE_SERVICES_LIMIT] for i in range(0, len(services), DESCRIBE_SERVICES_LIMIT)]
+
+        def describe_chunk(chunk):
+            fn_args = dict()
+            if cluster and cluster is not None:
+                fn_args['cluster'] = cluster
+            fn_args['services'] = chunk
+            return self.ecs.describe_services(**fn_args)
+
+        if workers > 1 and len(chunks) > 1:
+            pool = ThreadPool(min(workers, len(chunks)))
+            try:
+                responses = pool.map(describe_chunk, chunks)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            responses = map(describe_chunk, chunks)
+
+        described = []
+        failures = []
+        for response in responses:
+            described.extend(response['services'])
+            failures.extend(response.get('failures', []))
+        relevant_response = dict(services = [self.extract_service_from(service, events_limit) for service in described])
+        if len(failures)>0:
+            relevant_response['services_not_running'] = failures
         return relevant_response
 
-    def extract_service_from(self, service):
+    def extract_service_from(self, service, events_limit=None):
+        # events are returned newest first, drop the oldest before converting them
+        if events_limit is not None and 'events' in service:
+            service['events'] = service['events'][:events_limit]
         # some fields are datetime which is not JSON serializable
         # make them strings
         if 'deployments' in service:
@@ -203,7 +257,9 @@ def main():
     argument_spec.update(dict(
         details=dict(required=False, choices=['true', 'false'] ),
         cluster=dict(required=False, type='str' ),
-        service=dict(required=False, type='str' )
+        service=dict(required=False, type='str' ),
+        events_limit=dict(required=False, type='int' ),
+        workers=dict(required=False, type='int', default=4 )
     ))
 
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
@@ -222,7 +278,8 @@ def main():
     if show_details:
         if 'service' not in module.params or not module.params['service']:
             module.fail_json(msg="service must be specified for ecs_service_facts")
-        ecs_facts = task_mgr.describe_services(module.params['cluster'], module.params['service'])
+        ecs_facts = task_mgr.describe_services(module.params['cluster'], module.params['service'],
+                                               module.params['events_limit'], module.params['workers'])
     else:
         ecs_facts = task_mgr.list_services(module.params['cluster'])
 
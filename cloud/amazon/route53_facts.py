@@ -112,6 +112,38 @@ options:
         'tags',
         ]
     default: 'list'
+  paginate:
+    description:
+      - "Follow every marker of list requests and return the consolidated
+        results of all pages. Used with query: hosted_zone, health_check,
+        record_sets and reusable_delegation_set. C(max_items) then sets the
+        page size. With query: record_sets and no C(hosted_zone_id), the
+        record sets of every hosted zone are returned, keyed by zone id."
+    required: false
+    default: false
+    version_added: "2.2"
+  workers:
+    description:
+      - Number of hosted zones whose record sets are fetched concurrently
+        when walking every zone.
+    required: false
+    default: 8
+    version_added: "2.2"
+  retries:
+    description:
+      - Number of attempts made for each request throttled by Route53
+        when C(paginate) is set, with an exponential backoff between them.
+    required: false
+    default: 10
+    version_added: "2.2"
+  record_index:
+    description:
+      - "Used with query: record_sets and C(paginate). Return the record sets
+        as a compact index keyed by record name and then record type in
+        C(RecordSetIndex) instead of the C(ResourceRecordSets) list."
+    required: false
+    default: false
+    version_added: "2.2"
 author: Karen Cheng(@Etherdaemon)
 extends_documentation_fragment: aws
 '''
@@ -158,6 +190,20 @@ EXAMPLES = '''
     delegation_set_id: 'delegation id'
   register: delegation_sets
 
+- name: List every hosted zone, following all markers
+  route53_facts:
+    query: hosted_zone
+    paginate: yes
+  register: all_hosted_zones
+
+- name: Index the record sets of every hosted zone by name and type
+  route53_facts:
+    query: record_sets
+    paginate: yes
+    record_index: yes
+    workers: 16
+  register: all_record_sets
+
 '''
 try:
     import boto
@@ -172,6 +218,68 @@ try:
 except ImportError:
     HAS_BOTO3 = False
 
+import random
+import time
+from multiprocessing.pool import ThreadPool
+
+# result key and the request parameter each response marker feeds, per list call
+PAGINATION = {
+    'list_hosted_zones': ('HostedZones', {'Marker': 'NextMarker'}),
+    'list_health_checks': ('HealthChecks', {'Marker': 'NextMarker'}),
+    'list_reusable_delegation_sets': ('DelegationSets', {'Marker': 'NextMarker'}),
+    'list_resource_record_sets': ('ResourceRecordSets', {
+        'StartRecordName': 'NextRecordName',
+        'StartRecordType': 'NextRecordType',
+        'StartRecordIdentifier': 'NextRecordIdentifier',
+    }),
+}
+
+THROTTLING_ERRORS = ('Throttling', 'PriorRequestNotComplete')
+
+
+def call_with_backoff(method, retries, **params):
+    delay = 1
+    for attempt in range(retries):
+        try:
+            return method(**params)
+        except botocore.exceptions.ClientError, e:
+            if e.response['Error']['Code'] not in THROTTLING_ERRORS or attempt == retries - 1:
+                raise
+            time.sleep(delay + random.random())
+            delay = min(delay * 2, 30)
+
+
+def get_all_pages(client, module, method_name, params):
+    result_key, markers = PAGINATION[method_name]
+    method = getattr(client, method_name)
+    retries = module.params.get('retries')
+
+    params = dict(params)
+    results = call_with_backoff(method, retries, **params)
+    items = results[result_key]
+    while results.get('IsTruncated'):
+        for param, marker in markers.items():
+            if results.get(marker):
+                params[param] = results[marker]
+            else:
+                params.pop(param, None)
+        results = call_with_backoff(method, retries, **params)
+        items.extend(results[result_key])
+
+    for marker in markers.values():
+        results.pop(marker, None)
+    results['IsTruncated'] = False
+    results[result_key] = items
+    return results
+
+
+def index_record_sets(record_sets):
+    index = dict()
+    for record_set in record_sets:
+        record = dict((k, v) for k, v in record_set.items() if k not in ('Name', 'Type'))
+        index.setdefault(record_set['Name'], dict()).setdefault(record_set['Type'], []).append(record)
+    return index
+
 
 def get_hosted_zone(client, module):
     params = dict()
@@ -194,7 +302,10 @@ def reusable_delegation_set_details(client, module):
         if module.params.get('next_marker'):
             params['Marker'] = module.params.get('next_marker')
 
-        results = client.list_reusable_delegation_sets(**params)
+        if module.params.get('paginate'):
+            results = get_all_pages(client, module, 'list_reusable_delegation_sets', params)
+        else:
+            results = client.list_reusable_delegation_sets(**params)
     else:
         params['DelegationSetId'] = module.params.get('delegation_set_id')
         results = client.get_reusable_delegation_set(**params)
@@ -214,7 +325,10 @@ def list_hosted_zones(client, module):
     if module.params.get('delegation_set_id'):
         params['DelegationSetId'] = module.params.get('delegation_set_id')
 
-    results = client.list_hosted_zones(**params)
+    if module.params.get('paginate'):
+        results = get_all_pages(client, module, 'list_hosted_zones', params)
+    else:
+        results = client.list_hosted_zones(**params)
     return results
 
 
@@ -304,7 +418,40 @@ def list_health_checks(client, module):
     if module.params.get('next_marker'):
         params['Marker'] = module.params.get('next_marker')
 
-    results = client.list_health_checks(**params)
+    if module.params.get('paginate'):
+        results = get_all_pages(client, module, 'list_health_checks', params)
+    else:
+        results = client.list_health_checks(**params)
+    return results
+
+
+def all_record_sets_details(client, module):
+    params = dict()
+
+    if module.params.get('max_items'):
+        params['MaxItems'] = module.params.get('max_items')
+
+    hosted_zones = get_all_pages(client, module, 'list_hosted_zones', params)['HostedZones']
+
+    def get_zone_record_sets(hosted_zone):
+        zone_params = dict(params, HostedZoneId=hosted_zone['Id'])
+        return get_all_pages(client, module, 'list_resource_record_sets', zone_params)['ResourceRecordSets']
+
+    record_sets = []
+    if hosted_zones:
+        pool = ThreadPool(max(1, min(module.params.get('workers'), len(hosted_zones))))
+        try:
+            record_sets = pool.map(get_zone_record_sets, hosted_zones)
+        finally:
+            pool.close()
+            pool.join()
+
+    results = dict(HostedZones=hosted_zones)
+    zone_ids = [hosted_zone['Id'] for hosted_zone in hosted_zones]
+    if module.params.get('record_index'):
+        results['RecordSetIndex'] = dict(zip(zone_ids, map(index_record_sets, record_sets)))
+    else:
+        results['ResourceRecordSets'] = dict(zip(zone_ids, record_sets))
     return results
 
 
@@ -313,6 +460,8 @@ def record_sets_details(client, module):
 
     if module.params.get('hosted_zone_id'):
         params['HostedZoneId'] = module.params.get('hosted_zone_id')
+    elif module.params.get('paginate'):
+        return all_record_sets_details(client, module)
     else:
         module.fail_json(msg="Hosted Zone Id is required")
 
@@ -327,7 +476,12 @@ def record_sets_details(client, module):
     elif module.params.get('type'):
         params['StartRecordType'] = module.params.get('type')
 
-    results = client.list_resource_record_sets(**params)
+    if module.params.get('paginate'):
+        results = get_all_pages(client, module, 'list_resource_record_sets', params)
+        if module.params.get('record_index'):
+            results['RecordSetIndex'] = index_record_sets(results.pop('ResourceRecordSets'))
+    else:
+        results = client.list_resource_record_sets(**params)
     return results
 
 
@@ -396,6 +550,10 @@ def main():
             'count',
             'tags',
         ], default='list'),
+        paginate=dict(type='bool', default=False),
+        workers=dict(type='int', default=8),
+        retries=dict(type='int', default=10),
+        record_index=dict(type='bool', default=False),
         )
     )
 
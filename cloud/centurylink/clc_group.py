@@ -54,6 +54,20 @@ options:
     choices: [ True, False ]
     default: True
     required: False
+  group_cache_dir:
+    description:
+      - Directory in which the group tree of the datacenter is cached between runs. The cache is shared with
+        the clc_server module when both use the same directory, and is dropped when this module changes a group.
+        Caching is disabled when not set.
+    default: None
+    required: False
+    version_added: "2.2"
+  group_cache_ttl:
+    description:
+      - Maximum age in seconds of a cached group tree.
+    default: 60
+    required: False
+    version_added: "2.2"
 requirements:
     - python = 2.7
     - requests >= 2.5.0
@@ -212,6 +226,16 @@ group:
 
 __version__ = '${version}'
 
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
+import hashlib
+import os
+import tempfile
+import time
+from collections import deque
 from distutils.version import LooseVersion
 
 try:
@@ -235,10 +259,159 @@ else:
     CLC_FOUND = True
 
 
+class ClcGroupTree(object):
+    """
+    Index of the group tree of a CLC datacenter.
+
+    The root group returned by the CLC API already holds its subgroups
+    nested to any depth, so the whole tree is fetched with one call and
+    walked breadth-first locally. Groups are indexed by name and by their
+    slash separated path below the root group (e.g. "Web/Frontend").
+    When a cache directory is given, the tree is kept there for cache_ttl
+    seconds and shared by every module and run using the same directory.
+    """
+
+    def __init__(self, clc, location=None, cache_dir=None, cache_ttl=60):
+        """
+        :param clc: the clc-sdk instance to use
+        :param location: the datacenter (ex: 'UC1'), the account default if None
+        :param cache_dir: the directory holding the cached trees, no cache if None
+        :param cache_ttl: the maximum age of a cached tree in seconds
+        """
+        self.clc = clc
+        self.alias = clc.v2.Account.GetAlias()
+        self.location = location or clc.v2.Account.GetLocation()
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.root = None
+        self.parents = {}
+        self.by_name = {}
+        self.by_path = {}
+        self.nodes = []
+
+    def _cache_file(self):
+        key = '%s|%s' % (self.alias, self.location)
+        return os.path.join(
+            self.cache_dir,
+            'clc_group_tree_%s.json' % hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def _read_cache(self):
+        if not self.cache_dir:
+            return None
+        try:
+            f = open(self._cache_file())
+            try:
+                entry = json.load(f)
+            finally:
+                f.close()
+        except (IOError, ValueError):
+            return None
+        if time.time() - entry.get('timestamp', 0) > self.cache_ttl:
+            return None
+        return entry.get('root')
+
+    def _write_cache(self, root):
+        if not self.cache_dir:
+            return
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        try:
+            f = os.fdopen(fd, 'w')
+            try:
+                json.dump(dict(timestamp=time.time(), root=root), f)
+            finally:
+                f.close()
+            os.rename(tmp_path, self._cache_file())
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, refresh=False):
+        """
+        Load the tree from the cache or the CLC API and index it
+        :param refresh: skip the cache and fetch the tree
+        :return: self
+        """
+        root = None
+        if not refresh:
+            root = self._read_cache()
+        if root is None:
+            root = self.clc.v2.Datacenter(
+                location=self.location).RootGroup().data
+            self._write_cache(root)
+        self._index(root)
+        return self
+
+    def invalidate(self):
+        """
+        Drop the cached tree after the groups of the datacenter changed
+        :return: none
+        """
+        if self.cache_dir and os.path.exists(self._cache_file()):
+            os.remove(self._cache_file())
+
+    def _index(self, root):
+        self.root = root
+        self.parents = {root['id']: None}
+        self.by_name = {}
+        self.by_path = {}
+        self.nodes = [root]
+        self.by_name.setdefault(root['name'], []).append(root)
+        queue = deque([(root, '')])
+        while queue:
+            parent, parent_path = queue.popleft()
+            for group in parent.get('groups') or []:
+                path = '%s/%s' % (parent_path, group['name']) if parent_path else group['name']
+                self.parents[group['id']] = parent
+                self.by_name.setdefault(group['name'], []).append(group)
+                self.by_path.setdefault(path, group)
+                self.nodes.append(group)
+                queue.append((group, path))
+
+    def find(self, lookup_group):
+        """
+        Find a group by its path or, failing that, by its name. Of several
+        groups with that name the one closest to the root group wins.
+        :param lookup_group: the path or name of the group
+        :return: the group data dict or None
+        """
+        if lookup_group in self.by_path:
+            return self.by_path[lookup_group]
+        groups = self.by_name.get(lookup_group)
+        if groups:
+            return groups[0]
+        return None
+
+    def parent(self, group_data):
+        """
+        :param group_data: a group data dict of this tree
+        :return: the data dict of the parent group, None for the root group
+        """
+        return self.parents.get(group_data['id'])
+
+    def group(self, group_data, refresh=False):
+        """
+        Build a clc-sdk.Group instance for a group of the tree
+        :param group_data: a group data dict of this tree
+        :param refresh: fetch the current group from the CLC API instead of
+                        using the indexed data, e.g. to list its servers
+        :return: clc-sdk.Group instance
+        """
+        if refresh:
+            return self.clc.v2.Group(id=group_data['id'], alias=self.alias)
+        return self.clc.v2.Group(
+            id=group_data['id'],
+            alias=self.alias,
+            group_obj=group_data)
+
+
 class ClcGroup(object):
 
     clc = None
     root_group = None
+    group_tree = None
 
     def __init__(self, module):
         """
@@ -283,6 +456,8 @@ class ClcGroup(object):
         else:
             changed, group = self._ensure_group_is_present(
                 group_name=group_name, parent_name=parent_name, group_description=group_description)
+        if changed and not self.module.check_mode:
+            self.group_tree.invalidate()
         try:
             group = group.data
         except AttributeError:
@@ -301,7 +476,9 @@ class ClcGroup(object):
             parent=dict(default=None),
             location=dict(default=None),
             state=dict(default='present', choices=['present', 'absent']),
-            wait=dict(type='bool', default=True))
+            wait=dict(type='bool', default=True),
+            group_cache_dir=dict(type='path', default=None),
+            group_cache_ttl=dict(type='int', default=60))
 
         return argument_spec
 
@@ -444,31 +621,29 @@ class ClcGroup(object):
 
     def _get_group_tree_for_datacenter(self, datacenter=None):
         """
-        Walk the tree of groups for a datacenter
+        Index the tree of groups for a datacenter
         :param datacenter: string - the datacenter to walk (ex: 'UC1')
         :return: a dictionary of groups and parents
         """
-        self.root_group = self.clc.v2.Datacenter(
-            location=datacenter).RootGroup()
-        return self._walk_groups_recursive(
-            parent_group=None,
-            child_group=self.root_group)
-
-    def _walk_groups_recursive(self, parent_group, child_group):
-        """
-        Walk a parent-child tree of groups, starting with the provided child group
-        :param parent_group: clc_sdk.Group - the parent group to start the walk
-        :param child_group: clc_sdk.Group - the child group to start the walk
-        :return: a dictionary of groups and parents
-        """
-        result = {str(child_group): (child_group, parent_group)}
-        groups = child_group.Subgroups().groups
-        if len(groups) > 0:
-            for group in groups:
-                if group.type != 'default':
-                    continue
-
-                result.update(self._walk_groups_recursive(child_group, group))
+        self.group_tree = ClcGroupTree(
+            self.clc,
+            location=datacenter,
+            cache_dir=self.module.params.get('group_cache_dir'),
+            cache_ttl=self.module.params.get('group_cache_ttl')).load()
+        tree = self.group_tree
+        self.root_group = tree.group(tree.root)
+
+        result = {str(self.root_group): (self.root_group, None)}
+        groups = {tree.root['id']: self.root_group}
+        # tree.nodes is in breadth-first order, so parents come first. Only
+        # default groups and their subgroups are managed.
+        for group_data in tree.nodes[1:]:
+            parent_group = groups.get(tree.parent(group_data)['id'])
+            if parent_group is None or group_data.get('type') != 'default':
+                continue
+            group = tree.group(group_data)
+            groups[group_data['id']] = group
+            result[str(group)] = (group, parent_group)
         return result
 
     def _wait_for_requests_to_complete(self, requests_lst):
@@ -101,6 +101,7 @@ options:
   group:
     description:
       - The Server Group to create servers under.
+      - Either the name of the group or its path below the datacenter root group (e.g. "Web/Frontend").
     default: 'Default Group'
     required: False
   ip_address:
@@ -224,6 +225,43 @@ options:
     default: True
     required: False
     choices: [True, False]
+  group_cache_dir:
+    description:
+      - Directory in which the group tree of the datacenter is cached between runs. The cache is shared with
+        the clc_group module when both use the same directory. Caching is disabled when not set.
+    default: None
+    required: False
+    version_added: "2.2"
+  group_cache_ttl:
+    description:
+      - Maximum age in seconds of a cached group tree.
+    default: 60
+    required: False
+    version_added: "2.2"
+  workers:
+    description:
+      - The number of threads polling the status of the requests and servers of the task together.
+    default: 8
+    required: False
+    version_added: "2.2"
+  api_rate_limit:
+    description:
+      - The maximum number of CLC API calls per second shared by all the polling threads. 0 disables the limit.
+    default: 10
+    required: False
+    version_added: "2.2"
+  poll_interval:
+    description:
+      - The number of seconds between two rounds of polling the outstanding requests.
+    default: 2
+    required: False
+    version_added: "2.2"
+  poll_timeout:
+    description:
+      - The maximum number of seconds to wait for the requests of the task to complete when wait is True.
+    default: 3600
+    required: False
+    version_added: "2.2"
 requirements:
     - python = 2.7
     - requests >= 2.5.0
@@ -456,8 +494,20 @@ servers:
 
 __version__ = '${version}'
 
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import deque
+import time
 from time import sleep
 from distutils.version import LooseVersion
+from multiprocessing.pool import ThreadPool
 
 try:
     import requests
@@ -481,9 +531,313 @@ else:
     CLC_FOUND = True
 
 
+class ClcGroupTree(object):
+    """
+    Index of the group tree of a CLC datacenter.
+
+    The root group returned by the CLC API already holds its subgroups
+    nested to any depth, so the whole tree is fetched with one call and
+    walked breadth-first locally. Groups are indexed by name and by their
+    slash separated path below the root group (e.g. "Web/Frontend").
+    When a cache directory is given, the tree is kept there for cache_ttl
+    seconds and shared by every module and run using the same directory.
+    """
+
+    def __init__(self, clc, location=None, cache_dir=None, cache_ttl=60):
+        """
+        :param clc: the clc-sdk instance to use
+        :param location: the datacenter (ex: 'UC1'), the account default if None
+        :param cache_dir: the directory holding the cached trees, no cache if None
+        :param cache_ttl: the maximum age of a cached tree in seconds
+        """
+        self.clc = clc
+        self.alias = clc.v2.Account.GetAlias()
+        self.location = location or clc.v2.Account.GetLocation()
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.root = None
+        self.parents = {}
+        self.by_name = {}
+        self.by_path = {}
+        self.nodes = []
+
+    def _cache_file(self):
+        key = '%s|%s' % (self.alias, self.location)
+        return os.path.join(
+            self.cache_dir,
+            'clc_group_tree_%s.json' % hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def _read_cache(self):
+        if not self.cache_dir:
+            return None
+        try:
+            f = open(self._cache_file())
+            try:
+                entry = json.load(f)
+            finally:
+                f.close()
+        except (IOError, ValueError):
+            return None
+        if time.time() - entry.get('timestamp', 0) > self.cache_ttl:
+            return None
+        return entry.get('root')
+
+    def _write_cache(self, root):
+        if not self.cache_dir:
+            return
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        try:
+            f = os.fdopen(fd, 'w')
+            try:
+                json.dump(dict(timestamp=time.time(), root=root), f)
+            finally:
+                f.close()
+            os.rename(tmp_path, self._cache_file())
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, refresh=False):
+        """
+        Load the tree from the cache or the CLC API and index it
+        :param refresh: skip the cache and fetch the tree
+        :return: self
+        """
+        root = None
+        if not refresh:
+            root = self._read_cache()
+        if root is None:
+            root = self.clc.v2.Datacenter(
+                location=self.location).RootGroup().data
+            self._write_cache(root)
+        self._index(root)
+        return self
+
+    def invalidate(self):
+        """
+        Drop the cached tree after the groups of the datacenter changed
+        :return: none
+        """
+        if self.cache_dir and os.path.exists(self._cache_file()):
+            os.remove(self._cache_file())
+
+    def _index(self, root):
+        self.root = root
+        self.parents = {root['id']: None}
+        self.by_name = {}
+        self.by_path = {}
+        self.nodes = [root]
+        self.by_name.setdefault(root['name'], []).append(root)
+        queue = deque([(root, '')])
+        while queue:
+            parent, parent_path = queue.popleft()
+            for group in parent.get('groups') or []:
+                path = '%s/%s' % (parent_path, group['name']) if parent_path else group['name']
+                self.parents[group['id']] = parent
+                self.by_name.setdefault(group['name'], []).append(group)
+                self.by_path.setdefault(path, group)
+                self.nodes.append(group)
+                queue.append((group, path))
+
+    def find(self, lookup_group):
+        """
+        Find a group by its path or, failing that, by its name. Of several
+        groups with that name the one closest to the root group wins.
+        :param lookup_group: the path or name of the group
+        :return: the group data dict or None
+        """
+        if lookup_group in self.by_path:
+            return self.by_path[lookup_group]
+        groups = self.by_name.get(lookup_group)
+        if groups:
+            return groups[0]
+        return None
+
+    def parent(self, group_data):
+        """
+        :param group_data: a group data dict of this tree
+        :return: the data dict of the parent group, None for the root group
+        """
+        return self.parents.get(group_data['id'])
+
+    def group(self, group_data, refresh=False):
+        """
+        Build a clc-sdk.Group instance for a group of the tree
+        :param group_data: a group data dict of this tree
+        :param refresh: fetch the current group from the CLC API instead of
+                        using the indexed data, e.g. to list its servers
+        :return: clc-sdk.Group instance
+        """
+        if refresh:
+            return self.clc.v2.Group(id=group_data['id'], alias=self.alias)
+        return self.clc.v2.Group(
+            id=group_data['id'],
+            alias=self.alias,
+            group_obj=group_data)
+
+
+# Request statuses reported by the CLC operations API while a request runs
+CLC_PENDING_STATUSES = ('notStarted', 'executing', 'resumed', 'queued', 'running')
+
+
+class ClcRequestTracker:
+    """
+    Track many CLC requests and servers at once.
+
+    Every round polls all the outstanding items together on a thread pool,
+    with the API calls of all the threads spaced out by one shared rate
+    limit, and the tracker returns as soon as the whole batch settled.
+    """
+
+    def __init__(self, workers=8, api_rate_limit=10, poll_interval=2, poll_timeout=3600):
+        """
+        :param workers: the number of threads polling the API
+        :param api_rate_limit: the maximum API calls per second, 0 for no limit
+        :param poll_interval: the seconds between two polling rounds
+        :param poll_timeout: the seconds after which waiting for requests fails
+        """
+        self.workers = max(workers, 1)
+        self.interval = 1.0 / api_rate_limit if api_rate_limit > 0 else 0
+        self.poll_interval = poll_interval
+        self.poll_timeout = poll_timeout
+        self._lock = threading.Lock()
+        self._next_call = 0
+
+    def _throttle(self):
+        """
+        Block until the shared rate limit allows one more API call
+        :return: none
+        """
+        with self._lock:
+            now = time.time()
+            delay = self._next_call - now
+            self._next_call = max(now, self._next_call) + self.interval
+        if delay > 0:
+            sleep(delay)
+
+    def _map(self, func, items):
+        """
+        Call func on every item on the thread pool
+        :param func: the function to call
+        :param items: the list of items
+        :return: the list of results in the order of items
+        """
+        if self.workers == 1 or len(items) < 2:
+            return [func(item) for item in items]
+        pool = ThreadPool(min(self.workers, len(items)))
+        try:
+            return pool.map(func, items)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _status(self, request):
+        self._throttle()
+        return request.Status()
+
+    def wait_for_requests(self, request_list):
+        """
+        Block until all the requests completed or poll_timeout expired
+        :param request_list: a list of clc-sdk.Requests instances
+        :return: the count of failed requests
+        """
+        deadline = time.time() + self.poll_timeout
+        failed = 0
+        pending = []
+        for requests_obj in request_list:
+            failed += len(getattr(requests_obj, 'error_requests', []))
+            pending.extend(requests_obj.requests)
+
+        while pending:
+            statuses = self._map(self._status, pending)
+            still_pending = []
+            for request, status in zip(pending, statuses):
+                if status in CLC_PENDING_STATUSES:
+                    still_pending.append(request)
+                elif status != 'succeeded':
+                    failed += 1
+            pending = still_pending
+            if pending:
+                if time.time() + self.poll_interval > deadline:
+                    raise CLCException(
+                        'Timed out after %s seconds waiting for %s requests' %
+                        (self.poll_timeout, len(pending)))
+                sleep(self.poll_interval)
+        return failed
+
+    def refresh_servers(self, servers):
+        """
+        Refresh all the servers
+        :param servers: list of clc-sdk.Server instances to refresh
+        :return: list of (server, error message) tuples for the failed refreshes
+        """
+        def refresh(server):
+            self._throttle()
+            try:
+                server.Refresh()
+            except CLCException as ex:
+                return server, ex.message
+            return None
+
+        return [r for r in self._map(refresh, servers) if r is not None]
+
+    def find_servers_by_uuid(self, clc, alias, svr_uuids, retries=5, back_out=2):
+        """
+        Find the clc servers by the UUIDs returned from provisioning requests.
+        The UUIDs the api answers with a 404 for are retried together with a
+        doubling back off.
+        :param clc: the clc-sdk instance to use
+        :param alias: the Account Alias to search
+        :param svr_uuids: list of server UUIDs
+        :param retries: the number of rounds to make prior to fail
+        :param back_out: the seconds to wait before the first retry
+        :return: list of clc-sdk.Server instances in the order of svr_uuids
+        """
+        def find(svr_uuid):
+            self._throttle()
+            try:
+                server_obj = clc.v2.API.Call(
+                    method='GET', url='servers/%s/%s?uuid=true' %
+                    (alias, svr_uuid))
+            except APIFailedResponse as e:
+                if e.response_status_code != 404:
+                    raise CLCException(
+                        'A failure response was received from CLC API when '
+                        'attempting to get details for a server:  UUID=%s, Code=%i, Message=%s' %
+                        (svr_uuid, e.response_status_code, e.message))
+                return None
+            return clc.v2.Server(
+                id=server_obj['id'],
+                alias=alias,
+                server_obj=server_obj)
+
+        attempts = retries
+        found = {}
+        pending = list(svr_uuids)
+        while pending:
+            retries -= 1
+            for svr_uuid, server in zip(pending, self._map(find, pending)):
+                if server is not None:
+                    found[svr_uuid] = server
+            pending = [u for u in pending if u not in found]
+            if pending:
+                if retries == 0:
+                    raise CLCException(
+                        'Unable to reach the CLC API after %s attempts' % attempts)
+                sleep(back_out)
+                back_out *= 2
+        return [found[u] for u in svr_uuids]
+
+
 class ClcServer:
     clc = clc_sdk
 
+    # ClcGroupTree instances by datacenter id, loaded once per run
+    group_trees = {}
+
     def __init__(self, module):
         """
         Construct module
@@ -640,7 +994,13 @@ class ClcServer:
                              'windows2012R2Standard_64Bit',
                              'ubuntu14_64Bit'
                          ]),
-            wait=dict(type='bool', default=True))
+            wait=dict(type='bool', default=True),
+            group_cache_dir=dict(type='path', default=None),
+            group_cache_ttl=dict(type='int', default=60),
+            workers=dict(type='int', default=8),
+            api_rate_limit=dict(type='int', default=10),
+            poll_interval=dict(type='int', default=2),
+            poll_timeout=dict(type='int', default=3600))
 
         mutually_exclusive = [
             ['exact_count', 'count'],
@@ -1007,16 +1367,18 @@ class ClcServer:
 
         if not changed:
             return server_dict_array, created_server_ids, partial_created_servers_ids, changed
+        server_uuids = []
         for i in range(0, count):
             if not module.check_mode:
                 req = self._create_clc_server(clc=clc,
                                               module=module,
                                               server_params=params)
-                server = req.requests[0].Server()
+                server_uuids.append(req.requests[0].server_uuid)
                 request_list.append(req)
-                servers.append(server)
 
         self._wait_for_requests(module, request_list)
+        servers = self._find_servers_by_uuid(
+            module, clc, server_uuids, params.get('alias'))
         self._refresh_servers(module, servers)
 
         ip_failed_servers = self._add_public_ip_to_servers(
@@ -1093,19 +1455,35 @@ class ClcServer:
 
         return server_dict_array, changed_server_ids, partial_servers_ids, changed
 
+    @staticmethod
+    def _get_tracker(module):
+        """
+        Build the tracker polling requests and servers for this module
+        :param module: the AnsibleModule object
+        :return: a ClcRequestTracker instance
+        """
+        p = module.params
+        return ClcRequestTracker(
+            workers=p.get('workers'),
+            api_rate_limit=p.get('api_rate_limit'),
+            poll_interval=p.get('poll_interval'),
+            poll_timeout=p.get('poll_timeout'))
+
     @staticmethod
     def _wait_for_requests(module, request_list):
         """
         Block until server provisioning requests are completed.
         :param module: the AnsibleModule object
-        :param request_list: a list of clc-sdk.Request instances
+        :param request_list: a list of clc-sdk.Requests instances
         :return: none
         """
         wait = module.params.get('wait')
         if wait:
-            # Requests.WaitUntilComplete() returns the count of failed requests
-            failed_requests_count = sum(
-                [request.WaitUntilComplete() for request in request_list])
+            try:
+                failed_requests_count = ClcServer._get_tracker(
+                    module).wait_for_requests(request_list)
+            except CLCException as ex:
+                return module.fail_json(msg=ex.message)
 
             if failed_requests_count > 0:
                 module.fail_json(
@@ -1114,18 +1492,37 @@ class ClcServer:
     @staticmethod
     def _refresh_servers(module, servers):
         """
-        Loop through a list of servers and refresh them.
+        Refresh a list of servers together.
         :param module: the AnsibleModule object
         :param servers: list of clc-sdk.Server instances to refresh
         :return: none
         """
-        for server in servers:
-            try:
-                server.Refresh()
-            except CLCException as ex:
-                module.fail_json(msg='Unable to refresh the server {0}. {1}'.format(
-                    server.id, ex.message
-                ))
+        failures = ClcServer._get_tracker(module).refresh_servers(servers)
+        if failures:
+            server, message = failures[0]
+            module.fail_json(msg='Unable to refresh the server {0}. {1}'.format(
+                server.id, message
+            ))
+
+    @staticmethod
+    def _find_servers_by_uuid(module, clc, svr_uuids, alias=None):
+        """
+        Find the clc servers by the UUIDs returned from the provisioning requests.
+        :param module: the AnsibleModule object
+        :param clc: the clc-sdk instance to use
+        :param svr_uuids: list of server UUIDs
+        :param alias: the Account Alias to search
+        :return: list of clc-sdk.Server instances
+        """
+        if not svr_uuids:
+            return []
+        if not alias:
+            alias = clc.v2.Account.GetAlias()
+        try:
+            return ClcServer._get_tracker(module).find_servers_by_uuid(
+                clc, alias, svr_uuids)
+        except CLCException as ex:
+            return module.fail_json(msg=ex.message)
 
     @staticmethod
     def _add_public_ip_to_servers(
@@ -1353,7 +1750,8 @@ class ClcServer:
         group = ClcServer._find_group(
             module=module,
             datacenter=datacenter,
-            lookup_group=count_group)
+            lookup_group=count_group,
+            refresh=True)
 
         servers = group.Servers().Servers()
         running_servers = []
@@ -1365,28 +1763,52 @@ class ClcServer:
         return servers, running_servers
 
     @staticmethod
-    def _find_group(module, datacenter, lookup_group=None):
+    def _get_group_tree(module, datacenter, refresh=False):
         """
-        Find a server group in a datacenter by calling the CLC API
+        Return the indexed group tree of a datacenter, loading it once per run
+        :param module: the AnsibleModule instance
+        :param datacenter: clc-sdk.Datacenter instance of the tree
+        :param refresh: reload the tree from the CLC API
+        :return: ClcGroupTree instance
+        """
+        tree = ClcServer.group_trees.get(datacenter.id)
+        if tree is not None and not refresh:
+            return tree
+        try:
+            if tree is None:
+                tree = ClcGroupTree(
+                    ClcServer.clc,
+                    location=datacenter.id,
+                    cache_dir=module.params.get('group_cache_dir'),
+                    cache_ttl=module.params.get('group_cache_ttl'))
+            ClcServer.group_trees[datacenter.id] = tree.load(refresh=refresh)
+            return tree
+        except CLCException as ex:
+            module.fail_json(
+                msg='Unable to load the groups of location {0}. {1}'.format(
+                    datacenter.id, ex.message))
+
+    @staticmethod
+    def _find_group(module, datacenter, lookup_group=None, refresh=False):
+        """
+        Find a server group in a datacenter in the indexed group tree
         :param module: the AnsibleModule instance
         :param datacenter: clc-sdk.Datacenter instance to search for the group
-        :param lookup_group: string name of the group to search for
+        :param lookup_group: string name or path of the group to search for
+        :param refresh: fetch the current group data, e.g. to list its servers
         :return: clc-sdk.Group instance
         """
         if not lookup_group:
             lookup_group = module.params.get('group')
-        try:
-            return datacenter.Groups().Get(lookup_group)
-        except CLCException:
-            pass
 
-        # The search above only acts on the main
-        result = ClcServer._find_group_recursive(
-            module,
-            datacenter.Groups(),
-            lookup_group)
+        tree = ClcServer._get_group_tree(module, datacenter)
+        group_data = tree.find(lookup_group)
+        if group_data is None and tree.cache_dir:
+            # The cached tree may predate the group
+            tree = ClcServer._get_group_tree(module, datacenter, refresh=True)
+            group_data = tree.find(lookup_group)
 
-        if result is None:
+        if group_data is None:
             module.fail_json(
                 msg=str(
                     "Unable to find group: " +
@@ -1394,32 +1816,7 @@ class ClcServer:
                     " in location: " +
                     datacenter.id))
 
-        return result
-
-    @staticmethod
-    def _find_group_recursive(module, group_list, lookup_group):
-        """
-        Find a server group by recursively walking the tree
-        :param module: the AnsibleModule instance to use
-        :param group_list: a list of groups to search
-        :param lookup_group: the group to look for
-        :return: list of groups
-        """
-        result = None
-        for group in group_list.groups:
-            subgroups = group.Subgroups()
-            try:
-                return subgroups.Get(lookup_group)
-            except CLCException:
-                result = ClcServer._find_group_recursive(
-                    module,
-                    subgroups,
-                    lookup_group)
-
-            if result is not None:
-                break
-
-        return result
+        return tree.group(group_data, refresh=refresh)
 
     @staticmethod
     def _create_clc_server(
@@ -1478,6 +1875,7 @@ class ClcServer:
         # Find the server's UUID from the API response
         server_uuid = [obj['id']
                        for obj in res['links'] if obj['rel'] == 'self'][0]
+        result.requests[0].server_uuid = server_uuid
 
         # Change the request server method to a _find_server_by_uuid closure so
         # that it will work
@@ -1534,6 +1932,8 @@ class ClcServer:
         if not alias:
             alias = clc.v2.Account.GetAlias()
 
+        attempts = retries
+
         # Wait and retry if the api returns a 404
         while True:
             retries -= 1
@@ -1556,7 +1956,7 @@ class ClcServer:
                         (svr_uuid, e.response_status_code, e.message))
                 if retries == 0:
                     return module.fail_json(
-                        msg='Unable to reach the CLC API after 5 attempts')
+                        msg='Unable to reach the CLC API after %s attempts' % attempts)
                 sleep(back_out)
                 back_out *= 2
 
@@ -209,6 +209,21 @@ options:
       - Poll async jobs until job has finished.
     required: false
     default: true
+  instance_cache_dir:
+    description:
+      - Directory in which an index from instance name, display name and ID to the instance ID is kept.
+      - The index is built from one paged listing and shared by the cs_* modules using the same directory,
+        API endpoint, account, domain and project. Instances are still fetched by ID, so their data is current.
+      - If not set, instances are looked up with a server side C(keyword) filter.
+    required: false
+    default: null
+    version_added: "2.2"
+  instance_cache_ttl:
+    description:
+      - Maximum age in seconds of the instance index in C(instance_cache_dir).
+    required: false
+    default: 60
+    version_added: "2.2"
 extends_documentation_fragment: cloudstack
 '''
 
@@ -392,14 +407,291 @@ instance_name:
   returned: success
   type: string
   sample: i-44-3992-VM
+job_id:
+  description: ID of the async job of the last change, e.g. to wait for with M(cs_job) when C(poll_async=false).
+  returned: success, when poll_async is false and a job was started
+  type: string
+  sample: 8b4e4c3d-2b49-4f6a-9b1f-3c1d52c3a6a1
+async_jobs:
+  description: Status, latency in seconds and poll count of the async jobs polled, in the order they were started.
+  returned: success, when async jobs were polled
+  type: list
+  sample: '[ { "job_id": "8b4e4c3d-2b49-4f6a-9b1f-3c1d52c3a6a1", "status": "succeeded", "latency": 12.42, "polls": 6 } ]'
 '''
 
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
 import base64
+import hashlib
+import os
+import re
+import tempfile
+import time
 
 # import cloudstack common
 from ansible.module_utils.cloudstack import *
 
 
+# CS_LIST_PAGE_SIZE is the page size used for paged list API calls.
+CS_LIST_PAGE_SIZE = 500
+
+CS_UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+
+
+def cs_list_all(cs, api, key, page_size=CS_LIST_PAGE_SIZE, **args):
+    """Return all items of a list API call, fetched page by page.
+
+    :param cs: The CloudStack API client.
+    :param api: Name of the list API (e.g. listVirtualMachines).
+    :param key: Key of the items in the response (e.g. virtualmachine).
+    :param page_size: Number of items requested per page.
+    """
+    list_func = getattr(cs, api)
+    items = []
+    page = 1
+    while True:
+        res = list_func(page=page, pagesize=page_size, **args)
+        page_items = []
+        if res:
+            page_items = res.get(key, [])
+        items.extend(page_items)
+        if len(page_items) < page_size or len(items) >= res.get('count', 0):
+            return items
+        page += 1
+
+
+def instance_matches(instance, name):
+    """Return True if name is the name, display name or ID of the instance."""
+    name = name.lower()
+    return name in [instance['name'].lower(), instance['displayname'].lower(), instance['id']]
+
+
+class CloudStackInstanceIndex(object):
+    """Lookup of instances by name, display name or ID.
+
+    Without a cache directory every lookup asks the API for the instances
+    matching the name (keyword filter, paged) and picks the exact match.
+
+    With a cache directory, an index from the lowercased name, display name
+    and ID to the instance ID is built from one paged listing and kept on
+    disk for cache_ttl seconds, shared by all cs_* modules using the same
+    directory, endpoint, account, domain and project. Lookups then only
+    fetch the indexed instance by its ID, so the returned data is current.
+    """
+
+    def __init__(self, cs, args, cache_dir=None, cache_ttl=60, page_size=CS_LIST_PAGE_SIZE):
+        """
+        :param cs: The CloudStack API client.
+        :param args: The account, domainid and projectid to list in.
+        :param cache_dir: Directory holding the index, no index if None.
+        :param cache_ttl: Maximum age of the index in seconds.
+        :param page_size: Number of instances requested per page.
+        """
+        self.cs = cs
+        self.args = args
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.page_size = page_size
+        self.index = None
+
+    def _cache_file(self):
+        key = '%s|%s|%s|%s' % (
+            getattr(self.cs, 'endpoint', ''),
+            self.args.get('account'),
+            self.args.get('domainid'),
+            self.args.get('projectid'),
+        )
+        return os.path.join(self.cache_dir, 'cs_instance_index_%s.json' % hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def _read_cache(self):
+        try:
+            f = open(self._cache_file())
+            try:
+                entry = json.load(f)
+            finally:
+                f.close()
+        except (IOError, ValueError):
+            return None
+        if time.time() - entry.get('timestamp', 0) > self.cache_ttl:
+            return None
+        return entry.get('index')
+
+    def _write_cache(self, index):
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        try:
+            f = os.fdopen(fd, 'w')
+            try:
+                json.dump(dict(timestamp=time.time(), index=index), f)
+            finally:
+                f.close()
+            os.rename(tmp_path, self._cache_file())
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get_index(self):
+        """Return the index, loading or building it if needed."""
+        if self.index is None:
+            self.index = self._read_cache()
+        if self.index is None:
+            index = {}
+            for instance in cs_list_all(self.cs, 'listVirtualMachines', 'virtualmachine',
+                                        page_size=self.page_size, **self.args):
+                # The first instance in the listing wins, like a linear scan.
+                for key in (instance['name'].lower(), instance['displayname'].lower(), instance['id']):
+                    index.setdefault(key, instance['id'])
+            self._write_cache(index)
+            self.index = index
+        return self.index
+
+    def invalidate(self):
+        """Drop the index after instances were created or expunged."""
+        self.index = None
+        if self.cache_dir and os.path.exists(self._cache_file()):
+            os.remove(self._cache_file())
+
+    def get_by_id(self, instance_id):
+        res = self.cs.listVirtualMachines(id=instance_id, **self.args)
+        if res and res.get('virtualmachine'):
+            return res['virtualmachine'][0]
+        return None
+
+    def search(self, name):
+        """Find an instance by asking the API for the matching instances only."""
+        if CS_UUID_RE.match(name.lower()):
+            instance = self.get_by_id(name.lower())
+            if instance:
+                return instance
+        for instance in cs_list_all(self.cs, 'listVirtualMachines', 'virtualmachine',
+                                    page_size=self.page_size, keyword=name, **self.args):
+            if instance_matches(instance, name):
+                return instance
+        return None
+
+    def find(self, name):
+        """Return the instance with the name, display name or ID, or None."""
+        if self.cache_dir:
+            instance_id = self.get_index().get(name.lower())
+            if instance_id:
+                instance = self.get_by_id(instance_id)
+                if instance and instance_matches(instance, name):
+                    return instance
+                # The instance was expunged or renamed since.
+                self.invalidate()
+        return self.search(name)
+
+
+# CS_JOB_STATUSES maps the jobstatus of an async job to its name.
+CS_JOB_STATUSES = {
+    0: 'pending',
+    1: 'succeeded',
+    2: 'failed',
+}
+
+
+class CloudStackJobPoller(object):
+    """Wait for many async jobs in one polling loop.
+
+    Every round queries each pending job once with queryAsyncJobResult.
+    The pause between rounds starts at min_interval and grows by backoff
+    up to max_interval, so short jobs are seen soon after they finish and
+    long ones are not polled needlessly often. The time from adding a job
+    until its result was seen is kept per job.
+    """
+
+    def __init__(self, cs, min_interval=0.5, max_interval=5, backoff=1.5, timeout=None):
+        """
+        :param cs: The CloudStack API client.
+        :param min_interval: First pause between two rounds in seconds.
+        :param max_interval: Longest pause between two rounds in seconds.
+        :param backoff: Factor the pause grows by after every round.
+        :param timeout: Seconds after which wait returns with jobs pending.
+        """
+        self.cs = cs
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.jobs = {}
+        self.job_ids = []
+
+    def add(self, job):
+        """Track an async job.
+
+        :param job: An async API response with a jobid, or a job ID.
+        :returns: The job ID.
+        """
+        if isinstance(job, dict):
+            job_id = job['jobid']
+        else:
+            job_id = job
+        if job_id not in self.jobs:
+            self.jobs[job_id] = {
+                'added': time.time(),
+                'polls': 0,
+                'response': None,
+                'latency': None,
+            }
+            self.job_ids.append(job_id)
+        return job_id
+
+    def wait(self, job_ids=None):
+        """Block until the jobs finished or the timeout expired.
+
+        :param job_ids: The jobs to wait for, all tracked jobs by default.
+        :returns: Map of job ID to its queryAsyncJobResult response, None
+                  for the jobs still pending at the timeout.
+        """
+        if job_ids is None:
+            job_ids = self.job_ids
+        pending = [j for j in job_ids if self.jobs[j]['response'] is None]
+        interval = self.min_interval
+        deadline = None
+        if self.timeout is not None:
+            deadline = time.time() + self.timeout
+        while pending:
+            still_pending = []
+            for job_id in pending:
+                job = self.jobs[job_id]
+                res = self.cs.queryAsyncJobResult(jobid=job_id)
+                job['polls'] += 1
+                if res.get('jobstatus', 0) != 0 and 'jobresult' in res:
+                    job['response'] = res
+                    job['latency'] = round(time.time() - job['added'], 3)
+                else:
+                    still_pending.append(job_id)
+            pending = still_pending
+            if not pending:
+                break
+            if deadline is not None and time.time() + interval > deadline:
+                break
+            time.sleep(interval)
+            interval = min(interval * self.backoff, self.max_interval)
+        return dict((j, self.jobs[j]['response']) for j in job_ids)
+
+    def stats(self):
+        """Return the status, latency and poll count of every tracked job."""
+        stats = []
+        for job_id in self.job_ids:
+            job = self.jobs[job_id]
+            status = 0
+            if job['response'] is not None:
+                status = job['response']['jobstatus']
+            stats.append({
+                'job_id': job_id,
+                'status': CS_JOB_STATUSES.get(status, str(status)),
+                'latency': job['latency'],
+                'polls': job['polls'],
+            })
+        return stats
+
+
 class AnsibleCloudStackInstance(AnsibleCloudStack):
 
     def __init__(self, module):
@@ -415,8 +707,11 @@ class AnsibleCloudStackInstance(AnsibleCloudStack):
             'isoname':              'iso',
             'templatename':         'template',
             'keypair':              'ssh_key',
+            'jobid':                'job_id',
         }
         self.instance = None
+        self.instance_index = None
+        self.job_poller = CloudStackJobPoller(self.cs)
         self.template = None
         self.iso = None
 
@@ -489,22 +784,36 @@ class AnsibleCloudStackInstance(AnsibleCloudStack):
         self.module.fail_json(msg="Disk offering '%s' not found" % disk_offering)
 
 
-    def get_instance(self):
-        instance = self.instance
-        if not instance:
-            instance_name = self.get_or_fallback('name', 'display_name')
+    def poll_job(self, job=None, key=None):
+        if job and 'jobid' in job:
+            job_id = self.job_poller.add(job)
+            res = self.job_poller.wait([job_id])[job_id]
+            if 'errortext' in res['jobresult']:
+                self.module.fail_json(msg="Failed: '%s'" % res['jobresult']['errortext'])
+            if key and key in res['jobresult']:
+                job = res['jobresult'][key]
+        return job
+
 
+    def get_instance_index(self):
+        if not self.instance_index:
             args                = {}
             args['account']     = self.get_account(key='name')
             args['domainid']    = self.get_domain(key='id')
             args['projectid']   = self.get_project(key='id')
             # Do not pass zoneid, as the instance name must be unique across zones.
-            instances = self.cs.listVirtualMachines(**args)
-            if instances:
-                for v in instances['virtualmachine']:
-                    if instance_name.lower() in [ v['name'].lower(), v['displayname'].lower(), v['id'] ]:
-                        self.instance = v
-                        break
+            self.instance_index = CloudStackInstanceIndex(self.cs, args,
+                cache_dir=self.module.params.get('instance_cache_dir'),
+                cache_ttl=self.module.params.get('instance_cache_ttl'))
+        return self.instance_index
+
+
+    def get_instance(self):
+        instance = self.instance
+        if not instance:
+            instance_name = self.get_or_fallback('name', 'display_name')
+
+            self.instance = self.get_instance_index().find(instance_name)
         return self.instance
 
 
@@ -663,6 +972,7 @@ class AnsibleCloudStackInstance(AnsibleCloudStack):
 
             if 'errortext' in instance:
                 self.module.fail_json(msg="Failed: '%s'" % instance['errortext'])
+            self.get_instance_index().invalidate()
 
             poll_async = self.module.params.get('poll_async')
             if poll_async:
@@ -795,6 +1105,8 @@ class AnsibleCloudStackInstance(AnsibleCloudStack):
 
             if res and 'errortext' in res:
                 self.module.fail_json(msg="Failed: '%s'" % res['errortext'])
+            if res:
+                self.get_instance_index().invalidate()
 
             poll_async = self.module.params.get('poll_async')
             if poll_async:
@@ -900,6 +1212,8 @@ class AnsibleCloudStackInstance(AnsibleCloudStack):
                 for nic in instance['nic']:
                     if nic['isdefault'] and 'ipaddress' in nic:
                         self.result['default_ip'] = nic['ipaddress']
+        if self.job_poller.job_ids:
+            self.result['async_jobs'] = self.job_poller.stats()
         return self.result
 
 
@@ -937,6 +1251,8 @@ def main():
         force = dict(type='bool', default=False),
         tags = dict(type='list', aliases=[ 'tag' ], default=None),
         poll_async = dict(type='bool', default=True),
+        instance_cache_dir = dict(type='path', default=None),
+        instance_cache_ttl = dict(type='int', default=60),
     ))
 
     required_together = cs_required_together()
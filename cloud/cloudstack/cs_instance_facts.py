@@ -46,6 +46,21 @@ options:
       - Project the instance is related to.
     required: false
     default: null
+  instance_cache_dir:
+    description:
+      - Directory in which an index from instance name, display name and ID to the instance ID is kept.
+      - The index is built from one paged listing and shared by the cs_* modules using the same directory,
+        API endpoint, account, domain and project. Instances are still fetched by ID, so their data is current.
+      - If not set, instances are looked up with a server side C(keyword) filter.
+    required: false
+    default: null
+    version_added: "2.2"
+  instance_cache_ttl:
+    description:
+      - Maximum age in seconds of the instance index in C(instance_cache_dir).
+    required: false
+    default: 60
+    version_added: "2.2"
 extends_documentation_fragment: cloudstack
 '''
 
@@ -176,16 +191,180 @@ cloudstack_instance.instance_name:
   sample: i-44-3992-VM
 '''
 
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
 import base64
+import hashlib
+import os
+import re
+import tempfile
+import time
 
 # import cloudstack common
 from ansible.module_utils.cloudstack import *
 
+
+# CS_LIST_PAGE_SIZE is the page size used for paged list API calls.
+CS_LIST_PAGE_SIZE = 500
+
+CS_UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+
+
+def cs_list_all(cs, api, key, page_size=CS_LIST_PAGE_SIZE, **args):
+    """Return all items of a list API call, fetched page by page.
+
+    :param cs: The CloudStack API client.
+    :param api: Name of the list API (e.g. listVirtualMachines).
+    :param key: Key of the items in the response (e.g. virtualmachine).
+    :param page_size: Number of items requested per page.
+    """
+    list_func = getattr(cs, api)
+    items = []
+    page = 1
+    while True:
+        res = list_func(page=page, pagesize=page_size, **args)
+        page_items = []
+        if res:
+            page_items = res.get(key, [])
+        items.extend(page_items)
+        if len(page_items) < page_size or len(items) >= res.get('count', 0):
+            return items
+        page += 1
+
+
+def instance_matches(instance, name):
+    """Return True if name is the name, display name or ID of the instance."""
+    name = name.lower()
+    return name in [instance['name'].lower(), instance['displayname'].lower(), instance['id']]
+
+
+class CloudStackInstanceIndex(object):
+    """Lookup of instances by name, display name or ID.
+
+    Without a cache directory every lookup asks the API for the instances
+    matching the name (keyword filter, paged) and picks the exact match.
+
+    With a cache directory, an index from the lowercased name, display name
+    and ID to the instance ID is built from one paged listing and kept on
+    disk for cache_ttl seconds, shared by all cs_* modules using the same
+    directory, endpoint, account, domain and project. Lookups then only
+    fetch the indexed instance by its ID, so the returned data is current.
+    """
+
+    def __init__(self, cs, args, cache_dir=None, cache_ttl=60, page_size=CS_LIST_PAGE_SIZE):
+        """
+        :param cs: The CloudStack API client.
+        :param args: The account, domainid and projectid to list in.
+        :param cache_dir: Directory holding the index, no index if None.
+        :param cache_ttl: Maximum age of the index in seconds.
+        :param page_size: Number of instances requested per page.
+        """
+        self.cs = cs
+        self.args = args
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.page_size = page_size
+        self.index = None
+
+    def _cache_file(self):
+        key = '%s|%s|%s|%s' % (
+            getattr(self.cs, 'endpoint', ''),
+            self.args.get('account'),
+            self.args.get('domainid'),
+            self.args.get('projectid'),
+        )
+        return os.path.join(self.cache_dir, 'cs_instance_index_%s.json' % hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def _read_cache(self):
+        try:
+            f = open(self._cache_file())
+            try:
+                entry = json.load(f)
+            finally:
+                f.close()
+        except (IOError, ValueError):
+            return None
+        if time.time() - entry.get('timestamp', 0) > self.cache_ttl:
+            return None
+        return entry.get('index')
+
+    def _write_cache(self, index):
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+        try:
+            f = os.fdopen(fd, 'w')
+            try:
+                json.dump(dict(timestamp=time.time(), index=index), f)
+            finally:
+                f.close()
+            os.rename(tmp_path, self._cache_file())
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get_index(self):
+        """Return the index, loading or building it if needed."""
+        if self.index is None:
+            self.index = self._read_cache()
+        if self.index is None:
+            index = {}
+            for instance in cs_list_all(self.cs, 'listVirtualMachines', 'virtualmachine',
+                                        page_size=self.page_size, **self.args):
+                # The first instance in the listing wins, like a linear scan.
+                for key in (instance['name'].lower(), instance['displayname'].lower(), instance['id']):
+                    index.setdefault(key, instance['id'])
+            self._write_cache(index)
+            self.index = index
+        return self.index
+
+    def invalidate(self):
+        """Drop the index after instances were created or expunged."""
+        self.index = None
+        if self.cache_dir and os.path.exists(self._cache_file()):
+            os.remove(self._cache_file())
+
+    def get_by_id(self, instance_id):
+        res = self.cs.listVirtualMachines(id=instance_id, **self.args)
+        if res and res.get('virtualmachine'):
+            return res['virtualmachine'][0]
+        return None
+
+    def search(self, name):
+        """Find an instance by asking the API for the matching instances only."""
+        if CS_UUID_RE.match(name.lower()):
+            instance = self.get_by_id(name.lower())
+            if instance:
+                return instance
+        for instance in cs_list_all(self.cs, 'listVirtualMachines', 'virtualmachine',
+                                    page_size=self.page_size, keyword=name, **self.args):
+            if instance_matches(instance, name):
+                return instance
+        return None
+
+    def find(self, name):
+        """Return the instance with the name, display name or ID, or None."""
+        if self.cache_dir:
+            instance_id = self.get_index().get(name.lower())
+            if instance_id:
+                instance = self.get_by_id(instance_id)
+                if instance and instance_matches(instance, name):
+                    return instance
+                # The instance was expunged or renamed since.
+                self.invalidate()
+        return self.search(name)
+
+
 class AnsibleCloudStackInstanceFacts(AnsibleCloudStack):
 
     def __init__(self, module):
         super(AnsibleCloudStackInstanceFacts, self).__init__(module)
         self.instance = None
+        self.instance_index = None
         self.returns = {
             'group':                'group',
             'hypervisor':           'hypervisor',
@@ -203,22 +382,25 @@ class AnsibleCloudStackInstanceFacts(AnsibleCloudStack):
         }
 
 
-    def get_instance(self):
-        instance = self.instance
-        if not instance:
-            instance_name = self.module.params.get('name')
-
+    def get_instance_index(self):
+        if not self.instance_index:
             args                = {}
             args['account']     = self.get_account(key='name')
             args['domainid']    = self.get_domain(key='id')
             args['projectid']   = self.get_project(key='id')
             # Do not pass zoneid, as the instance name must be unique across zones.
-            instances = self.cs.listVirtualMachines(**args)
-            if instances:
-                for v in instances['virtualmachine']:
-                    if instance_name.lower() in [ v['name'].lower(), v['displayname'].lower(), v['id'] ]:
-                        self.instance = v
-                        break
+            self.instance_index = CloudStackInstanceIndex(self.cs, args,
+                cache_dir=self.module.params.get('instance_cache_dir'),
+                cache_ttl=self.module.params.get('instance_cache_ttl'))
+        return self.instance_index
+
+
+    def get_instance(self):
+        instance = self.instance
+        if not instance:
+            instance_name = self.module.params.get('name')
+
+            self.instance = self.get_instance_index().find(instance_name)
         return self.instance
 
 
@@ -257,6 +439,8 @@ def main():
         domain = dict(default=None),
         account = dict(default=None),
         project = dict(default=None),
+        instance_cache_dir = dict(type='path', default=None),
+        instance_cache_ttl = dict(type='int', default=60),
     ))
 
     module = AnsibleModule(
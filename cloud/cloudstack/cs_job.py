@@ -0,0 +1,266 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible. If not, see <http://www.gnu.org/licenses/>.
+
+DOCUMENTATION = '''
+---
+module: cs_job
+short_description: Waits for async jobs on Apache CloudStack based clouds.
+description:
+    - Waits until all the given async jobs finished, e.g. the jobs started by a loop of M(cs_instance)
+      tasks with C(poll_async=false), so their waits overlap instead of adding up.
+    - All the jobs are polled in one loop with a pause between the rounds growing from C(poll_interval)
+      up to C(poll_interval_max).
+version_added: "2.2"
+author: "agent <agent@local>"
+options:
+  job_ids:
+    description:
+      - List of IDs of the async jobs to wait for.
+    required: true
+  timeout:
+    description:
+      - Seconds to wait for the jobs before failing.
+    required: false
+    default: 600
+  poll_interval:
+    description:
+      - Seconds between the first two polling rounds.
+    required: false
+    default: 0.5
+  poll_interval_max:
+    description:
+      - Longest pause in seconds between two polling rounds.
+    required: false
+    default: 5
+  fail_on_error:
+    description:
+      - Whether to fail if one of the jobs failed.
+    required: false
+    default: true
+extends_documentation_fragment: cloudstack
+'''
+
+EXAMPLES = '''
+- local_action:
+    module: cs_instance
+    name: "{{ item }}"
+    template: Linux Debian 7 64-bit
+    service_offering: Tiny
+    poll_async: false
+  with_items: "{{ web_vms }}"
+  register: deployed
+
+- local_action:
+    module: cs_job
+    job_ids: "{{ deployed.results | selectattr('job_id', 'defined') | map(attribute='job_id') | list }}"
+'''
+
+RETURN = '''
+---
+jobs:
+  description: Status, latency in seconds, poll count and result of every job, in the order of job_ids.
+  returned: success
+  type: list
+  sample: '[ { "job_id": "8b4e4c3d-2b49-4f6a-9b1f-3c1d52c3a6a1", "status": "succeeded", "latency": 12.42, "polls": 6, "command": "org.apache.cloudstack.api.command.user.vm.DeployVMCmd", "result": {} } ]'
+failed_job_ids:
+  description: IDs of the jobs which failed.
+  returned: success
+  type: list
+  sample: '[]'
+'''
+
+import time
+
+# import cloudstack common
+from ansible.module_utils.cloudstack import *
+
+
+# CS_JOB_STATUSES maps the jobstatus of an async job to its name.
+CS_JOB_STATUSES = {
+    0: 'pending',
+    1: 'succeeded',
+    2: 'failed',
+}
+
+
+class CloudStackJobPoller(object):
+    """Wait for many async jobs in one polling loop.
+
+    Every round queries each pending job once with queryAsyncJobResult.
+    The pause between rounds starts at min_interval and grows by backoff
+    up to max_interval, so short jobs are seen soon after they finish and
+    long ones are not polled needlessly often. The time from adding a job
+    until its result was seen is kept per job.
+    """
+
+    def __init__(self, cs, min_interval=0.5, max_interval=5, backoff=1.5, timeout=None):
+        """
+        :param cs: The CloudStack API client.
+        :param min_interval: First pause between two rounds in seconds.
+        :param max_interval: Longest pause between two rounds in seconds.
+        :param backoff: Factor the pause grows by after every round.
+        :param timeout: Seconds after which wait returns with jobs pending.
+        """
+        self.cs = cs
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.jobs = {}
+        self.job_ids = []
+
+    def add(self, job):
+        """Track an async job.
+
+        :param job: An async API response with a jobid, or a job ID.
+        :returns: The job ID.
+        """
+        if isinstance(job, dict):
+            job_id = job['jobid']
+        else:
+            job_id = job
+        if job_id not in self.jobs:
+            self.jobs[job_id] = {
+                'added': time.time(),
+                'polls': 0,
+                'response': None,
+                'latency': None,
+            }
+            self.job_ids.append(job_id)
+        return job_id
+
+    def wait(self, job_ids=None):
+        """Block until the jobs finished or the timeout expired.
+
+        :param job_ids: The jobs to wait for, all tracked jobs by default.
+        :returns: Map of job ID to its queryAsyncJobResult response, None
+                  for the jobs still pending at the timeout.
+        """
+        if job_ids is None:
+            job_ids = self.job_ids
+        pending = [j for j in job_ids if self.jobs[j]['response'] is None]
+        interval = self.min_interval
+        deadline = None
+        if self.timeout is not None:
+            deadline = time.time() + self.timeout
+        while pending:
+            still_pending = []
+            for job_id in pending:
+                job = self.jobs[job_id]
+                res = self.cs.queryAsyncJobResult(jobid=job_id)
+                job['polls'] += 1
+                if res.get('jobstatus', 0) != 0 and 'jobresult' in res:
+                    job['response'] = res
+                    job['latency'] = round(time.time() - job['added'], 3)
+                else:
+                    still_pending.append(job_id)
+            pending = still_pending
+            if not pending:
+                break
+            if deadline is not None and time.time() + interval > deadline:
+                break
+            time.sleep(interval)
+            interval = min(interval * self.backoff, self.max_interval)
+        return dict((j, self.jobs[j]['response']) for j in job_ids)
+
+    def stats(self):
+        """Return the status, latency and poll count of every tracked job."""
+        stats = []
+        for job_id in self.job_ids:
+            job = self.jobs[job_id]
+            status = 0
+            if job['response'] is not None:
+                status = job['response']['jobstatus']
+            stats.append({
+                'job_id': job_id,
+                'status': CS_JOB_STATUSES.get(status, str(status)),
+                'latency': job['latency'],
+                'polls': job['polls'],
+            })
+        return stats
+
+
+class AnsibleCloudStackJob(AnsibleCloudStack):
+
+    def __init__(self, module):
+        super(AnsibleCloudStackJob, self).__init__(module)
+        self.job_poller = CloudStackJobPoller(self.cs,
+            min_interval=self.module.params.get('poll_interval'),
+            max_interval=self.module.params.get('poll_interval_max'),
+            timeout=self.module.params.get('timeout'))
+
+
+    def wait_for_jobs(self):
+        job_ids = []
+        for job_id in self.module.params.get('job_ids'):
+            if job_id and job_id not in job_ids:
+                job_ids.append(self.job_poller.add(job_id))
+        responses = self.job_poller.wait(job_ids)
+
+        jobs = []
+        failed_job_ids = []
+        pending_job_ids = []
+        for stats in self.job_poller.stats():
+            res = responses[stats['job_id']]
+            if res is None:
+                pending_job_ids.append(stats['job_id'])
+            else:
+                stats['command'] = res.get('cmd')
+                stats['result'] = res['jobresult']
+                if stats['status'] == 'failed':
+                    failed_job_ids.append(stats['job_id'])
+            jobs.append(stats)
+
+        self.result['jobs'] = jobs
+        self.result['failed_job_ids'] = failed_job_ids
+        if pending_job_ids:
+            self.module.fail_json(msg="Timeout waiting for jobs: %s" % ', '.join(pending_job_ids), **self.result)
+        if failed_job_ids and self.module.params.get('fail_on_error'):
+            self.module.fail_json(msg="Failed jobs: %s" % ', '.join(failed_job_ids), **self.result)
+        return self.result
+
+
+def main():
+    argument_spec = cs_argument_spec()
+    argument_spec.update(dict(
+        job_ids = dict(type='list', required=True),
+        timeout = dict(type='int', default=600),
+        poll_interval = dict(type='float', default=0.5),
+        poll_interval_max = dict(type='float', default=5),
+        fail_on_error = dict(type='bool', default=True),
+    ))
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_together=cs_required_together(),
+        supports_check_mode=True
+    )
+
+    try:
+        acs_job = AnsibleCloudStackJob(module)
+        result = acs_job.wait_for_jobs()
+
+    except CloudStackException as e:
+        module.fail_json(msg='CloudStackException: %s' % str(e))
+
+    module.exit_json(**result)
+
+# import module snippets
+from ansible.module_utils.basic import *
+if __name__ == '__main__':
+    main()
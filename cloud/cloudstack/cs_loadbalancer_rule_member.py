@@ -203,6 +203,33 @@ state:
 # import cloudstack common
 from ansible.module_utils.cloudstack import *
 
+
+# CS_LIST_PAGE_SIZE is the page size used for paged list API calls.
+CS_LIST_PAGE_SIZE = 500
+
+
+def cs_list_all(cs, api, key, page_size=CS_LIST_PAGE_SIZE, **args):
+    """Return all items of a list API call, fetched page by page.
+
+    :param cs: The CloudStack API client.
+    :param api: Name of the list API (e.g. listVirtualMachines).
+    :param key: Key of the items in the response (e.g. virtualmachine).
+    :param page_size: Number of items requested per page.
+    """
+    list_func = getattr(cs, api)
+    items = []
+    page = 1
+    while True:
+        res = list_func(page=page, pagesize=page_size, **args)
+        page_items = []
+        if res:
+            page_items = res.get(key, [])
+        items.extend(page_items)
+        if len(page_items) < page_size or len(items) >= res.get('count', 0):
+            return items
+        page += 1
+
+
 class AnsibleCloudStackLBRuleMember(AnsibleCloudStack):
 
     def __init__(self, module):
@@ -274,10 +301,13 @@ class AnsibleCloudStackLBRuleMember(AnsibleCloudStack):
             return rule
 
         args = self._get_common_args()
-        vms = self.cs.listVirtualMachines(**args)
+        if len(to_change) == 1:
+            # The API matches substrings of the name, the exact match follows.
+            args['name'] = list(to_change)[0]
+        vms = cs_list_all(self.cs, 'listVirtualMachines', 'virtualmachine', **args)
         to_change_ids = []
         for name in to_change:
-            for vm in vms.get('virtualmachine', []):
+            for vm in vms:
                 if vm['name'] == name:
                     to_change_ids.append(vm['id'])
                     break
@@ -149,11 +149,33 @@ options:
         choices:
           - gzip
           - bzip2
+          - xz
           - none
         description:
           - Type of compression to use when creating an archive of a running
             container.
         default: gzip
+    archive_threads:
+        version_added: "2.2"
+        description:
+          - Number of threads used to compress an archive. When above 1 the
+            archive is compressed with pigz, pbzip2 or xz -T if installed,
+            otherwise with the single threaded compressor.
+        required: false
+        default: 1
+    archive_incremental:
+        version_added: "2.2"
+        choices:
+          - true
+          - false
+        description:
+          - Only archive the changes since the last archive. The GNU tar
+            manifest of the archives is kept as <name>.snar in
+            "archive_path" and every archive gets a timestamp in its name.
+            The first archive, or the one made after the manifest is
+            removed, is a full archive.
+        required: false
+        default: false
     state:
         choices:
           - started
@@ -191,9 +213,11 @@ notes:
     When using "container_command" a log file is created in the /tmp/ directory
     which contains both stdout and stderr of any command executed.
   - If "archive" is **true** the system will attempt to create a compressed
-    tarball of the running container. The "archive" option supports LVM backed
-    containers and will create a snapshot of the running container when
-    creating the archive.
+    tarball of the running container. The "archive" option supports LVM and
+    btrfs backed containers and will create a snapshot of the running
+    container when creating the archive. The container is only frozen while
+    the snapshot is taken and the archive is streamed from the snapshot.
+    Other containers stay frozen until the archive is written.
   - If your distro does not have a package for "python2-lxc", which is a
     requirement for this module, it can be installed from source at
     "https://github.com/lxc/python2-lxc" or installed via pip using the package
@@ -316,6 +340,17 @@ EXAMPLES = """
     archive: true
     archive_path: /opt/archives
 
+# Create an incremental archive of a container compressed with 8 threads.
+# Only the changes since the previous archive in the path are written.
+- name: Archive container changes
+  lxc_container:
+    name: test-container-started
+    archive: true
+    archive_path: /opt/archives
+    archive_compression: xz
+    archive_threads: 8
+    archive_incremental: true
+
 # Create a container using overlayfs, create an archive of it, create a
 # snapshot clone of the container and and finally leave the container
 # in a frozen state. The container archive will be compressed using gzip.
@@ -417,6 +452,11 @@ lxc_container:
             returned: success, when archive is true
             type: string
             sample: "/tmp/test-container-config.tar"
+        archive_manifest:
+            description: path of the incremental archive manifest
+            returned: success, when archive and archive_incremental are true
+            type: string
+            sample: "/tmp/test-container-config.snar"
         clone:
             description: if the container was cloned
             returned: success, when clone_name is specified
@@ -424,6 +464,7 @@ lxc_container:
             sample: True
 """
 
+import pipes
 import re
 
 try:
@@ -439,11 +480,18 @@ else:
 LXC_COMPRESSION_MAP = {
     'gzip': {
         'extension': 'tar.tgz',
-        'argument': '-czf'
+        'argument': '-czf',
+        'threaded': 'pigz -p %(threads)d'
     },
     'bzip2': {
         'extension': 'tar.bz2',
-        'argument': '-cjf'
+        'argument': '-cjf',
+        'threaded': 'pbzip2 -p%(threads)d'
+    },
+    'xz': {
+        'extension': 'tar.xz',
+        'argument': '-cJf',
+        'threaded': 'xz -T%(threads)d'
     },
     'none': {
         'extension': 'tar',
@@ -452,6 +500,12 @@ LXC_COMPRESSION_MAP = {
 }
 
 
+# LXC_ARCHIVE_SNAPSHOT_DIR is the directory, within the container directory,
+# which holds a read only btrfs snapshot of the rootfs while it is archived.
+# Snapshots have to live on the same btrfs file system as their source.
+LXC_ARCHIVE_SNAPSHOT_DIR = '.lxc_archive_snapshot'
+
+
 # LXC_COMMAND_MAP is a map of variables that are available to a method based
 # on the state the container is in.
 LXC_COMMAND_MAP = {
@@ -607,6 +661,7 @@ class LxcContainerManagement(object):
         self.container_name = self.module.params['name']
         self.container = self.get_container_bind()
         self.archive_info = None
+        self.archive_manifest = None
         self.clone_info = None
 
     def get_container_bind(self):
@@ -1001,6 +1056,8 @@ class LxcContainerManagement(object):
             self.archive_info = {
                 'archive': self._container_create_tar()
             }
+            if self.archive_manifest:
+                self.archive_info['archive_manifest'] = self.archive_manifest
 
     def _check_clone(self):
         """Create a compressed archive of a container.
@@ -1365,11 +1422,46 @@ class LxcContainerManagement(object):
                     % (vg, lv_name, mount_point)
             )
 
-    def _create_tar(self, source_dir):
-        """Create an archive of a given ``source_dir`` to ``output_path``.
+    def _compress_argument(self, compression_type):
+        """Return the tar argument selecting the compressor.
+
+        When ``archive_threads`` is above one and a parallel compressor for
+        the compression type is installed, tar streams into it instead of
+        its single threaded built in compressor.
+
+        :param compression_type: Entry of ``LXC_COMPRESSION_MAP``.
+        :type compression_type: ``dict``
+        """
 
-        :param source_dir:  Path to the directory to be archived.
-        :type source_dir: ``str``
+        threads = self.module.params.get('archive_threads')
+        threaded = compression_type.get('threaded')
+        if threaded and threads > 1:
+            if self.module.get_bin_path(threaded.split()[0]):
+                return [
+                    pipes.quote(
+                        '--use-compress-program=%s' % (
+                            threaded % {'threads': threads}
+                        )
+                    ),
+                    '-cf'
+                ]
+        return [compression_type['argument']]
+
+    def _create_tar(self, sources):
+        """Create an archive of the given ``sources`` in ``archive_path``.
+
+        Every source is a tuple of a directory and the entries within it
+        to add, so the container directory and a snapshot of its rootfs
+        can be written to one archive without copying them together first.
+
+        When ``archive_incremental`` is true the archive only holds the
+        changes since the manifest kept next to the archives. The manifest
+        is only replaced once tar has succeeded.
+
+        :param sources: List of ``(directory, entries)`` tuples.
+        :type sources: ``list``
+        :returns: archive name and manifest path or None.
+        :rtype: ``tuple``
         """
 
         old_umask = os.umask(int('0077',8))
@@ -1380,25 +1472,52 @@ class LxcContainerManagement(object):
 
         archive_compression = self.module.params.get('archive_compression')
         compression_type = LXC_COMPRESSION_MAP[archive_compression]
-
-        # remove trailing / if present.
+        incremental = self.module.params.get('archive_incremental')
+
+        # Incremental archives are kept side by side, so they need a unique
+        # name.
+        archive_base = os.path.join(archive_path, self.container_name)
+        if incremental:
+            archive_base = '%s.%s' % (
+                archive_base,
+                time.strftime('%Y%m%d%H%M%S')
+            )
         archive_name = '%s.%s' % (
-            os.path.join(
-                archive_path,
-                self.container_name
-            ),
+            archive_base,
             compression_type['extension']
         )
 
-        build_command = [
-            self.module.get_bin_path('tar', True),
-            '--directory=%s' % os.path.realpath(
-                os.path.expanduser(source_dir)
-            ),
-            compression_type['argument'],
-            archive_name,
-            '.'
-        ]
+        build_command = [self.module.get_bin_path('tar', True)]
+        build_command.extend(self._compress_argument(compression_type))
+        build_command.append(pipes.quote(archive_name))
+
+        manifest = manifest_work = None
+        if incremental:
+            manifest = os.path.join(
+                archive_path,
+                '%s.snar' % self.container_name
+            )
+            manifest_work = '%s.tmp' % manifest
+            if os.path.exists(manifest):
+                shutil.copy2(manifest, manifest_work)
+            elif os.path.exists(manifest_work):
+                os.remove(manifest_work)
+            # Snapshots are mounted anew for every archive and get a new
+            # device number, so only the inodes and times are compared.
+            build_command.extend([
+                '--listed-incremental=%s' % pipes.quote(manifest_work),
+                '--no-check-device'
+            ])
+
+        for directory, entries in sources:
+            build_command.append(
+                '--directory=%s' % pipes.quote(
+                    os.path.realpath(os.path.expanduser(directory))
+                )
+            )
+            build_command.extend(
+                [pipes.quote('./%s' % entry) for entry in entries]
+            )
 
         rc, stdout, err = self._run_command(
             build_command=build_command,
@@ -1408,6 +1527,8 @@ class LxcContainerManagement(object):
         os.umask(old_umask)
 
         if rc != 0:
+            if manifest_work and os.path.exists(manifest_work):
+                os.remove(manifest_work)
             self.failure(
                 err=err,
                 rc=rc,
@@ -1415,7 +1536,10 @@ class LxcContainerManagement(object):
                 command=' '.join(build_command)
             )
 
-        return archive_name
+        if incremental:
+            os.rename(manifest_work, manifest)
+
+        return archive_name, manifest
 
     def _lvm_lv_remove(self, lv_name):
         """Remove an LV.
@@ -1439,42 +1563,69 @@ class LxcContainerManagement(object):
                 command=' '.join(build_command)
             )
 
-    def _rsync_data(self, container_path, temp_dir):
-        """Sync the container directory to the temp directory.
+    def _btrfs_subvolume(self, path):
+        """Return True when ``path`` is a btrfs subvolume.
 
-        :param container_path: path to the container container
-        :type container_path: ``str``
-        :param temp_dir: path to the temporary local working directory
-        :type temp_dir: ``str``
+        :param path: path to test.
+        :type path: ``str``
         """
-        # This loop is created to support overlayfs archives. This should
-        # squash all of the layers into a single archive.
-        fs_paths = container_path.split(':')
-        if 'overlayfs' in fs_paths:
-            fs_paths.pop(fs_paths.index('overlayfs'))
-
-        for fs_path in fs_paths:
-            # Set the path to the container data
-            fs_path = os.path.dirname(fs_path)
-
-            # Run the sync command
-            build_command = [
-                self.module.get_bin_path('rsync', True),
-                '-aHAX',
-                fs_path,
-                temp_dir
-            ]
-            rc, stdout, err = self._run_command(
-                build_command,
-                unsafe_shell=True
+
+        btrfs_bin = self.module.get_bin_path('btrfs')
+        if not btrfs_bin or not os.path.isdir(path):
+            return False
+        rc, stdout, err = self._run_command(
+            [btrfs_bin, 'subvolume', 'show', pipes.quote(path)]
+        )
+        return rc == 0
+
+    def _btrfs_snapshot_create(self, source, snapshot):
+        """Create a read only btrfs snapshot.
+
+        :param source: path of the subvolume to snapshot.
+        :type source: ``str``
+        :param snapshot: path of the new snapshot.
+        :type snapshot: ``str``
+        """
+
+        build_command = [
+            self.module.get_bin_path('btrfs', True),
+            'subvolume',
+            'snapshot',
+            '-r',
+            source,
+            snapshot
+        ]
+        rc, stdout, err = self._run_command(build_command)
+        if rc != 0:
+            self.failure(
+                err=err,
+                rc=rc,
+                msg='Failed to create btrfs snapshot %s --> %s'
+                    % (source, snapshot),
+                command=' '.join(build_command)
+            )
+
+    def _btrfs_snapshot_remove(self, snapshot):
+        """Remove a btrfs snapshot.
+
+        :param snapshot: path of the snapshot.
+        :type snapshot: ``str``
+        """
+
+        build_command = [
+            self.module.get_bin_path('btrfs', True),
+            'subvolume',
+            'delete',
+            snapshot
+        ]
+        rc, stdout, err = self._run_command(build_command)
+        if rc != 0:
+            self.failure(
+                err=err,
+                rc=rc,
+                msg='Failed to remove btrfs snapshot %s' % snapshot,
+                command=' '.join(build_command)
             )
-            if rc != 0:
-                self.failure(
-                    err=err,
-                    rc=rc,
-                    msg='failed to perform archive',
-                    command=' '.join(build_command)
-                )
 
     def _unmount(self, mount_point):
         """Unmount a file system.
@@ -1523,42 +1674,76 @@ class LxcContainerManagement(object):
                     % (lowerdir, upperdir, mount_point, build_command)
             )
 
+    def _restore_state(self, container_state):
+        """Restore the state the container had before it was archived.
+
+        :param container_state: state of the container before archiving.
+        :type container_state: ``str``
+        """
+
+        if container_state == 'running':
+            if self._get_state() == 'frozen':
+                self.container.unfreeze()
+            elif self._get_state() != 'running':
+                self.container.start()
+
     def _container_create_tar(self):
         """Create a tar archive from an LXC container.
 
         The process is as follows:
             * Stop or Freeze the container
-            * Create temporary dir
-            * Copy container and config to temporary directory
             * If LVM backed:
                 * Create LVM snapshot of LV backing the container
                 * Mount the snapshot to tmpdir/rootfs
+                * Restore the state of the container
+            * If btrfs backed:
+                * Create a read only snapshot of the rootfs subvolume
+                * Restore the state of the container
+            * If overlayfs backed:
+                * Mount the layers to tmpdir/rootfs
+            * Stream the container directory and the rootfs into tar
             * Restore the state of the container
-            * Create tar of tmpdir
             * Clean up
+
+        Nothing is copied before tar reads it. Snapshot backed containers
+        are only frozen while the snapshot is taken.
         """
 
         # Create a temp dir
         temp_dir = tempfile.mkdtemp()
 
-        # Set the name of the working dir, temp + container_name
-        work_dir = os.path.join(temp_dir, self.container_name)
-
         # LXC container rootfs
         lxc_rootfs = self.container.get_config_item('lxc.rootfs')
 
+        # The directory holding the container config
+        container_dir = os.path.dirname(self.container.config_file_name)
+
         # Test if the containers rootfs is a block device
         block_backed = lxc_rootfs.startswith(os.path.join(os.sep, 'dev'))
 
         # Test if the container is using overlayfs
         overlayfs_backed = lxc_rootfs.startswith('overlayfs')
 
-        mount_point = os.path.join(work_dir, 'rootfs')
+        # Test if the containers rootfs is a btrfs subvolume
+        btrfs_backed = (
+            not block_backed and not overlayfs_backed and
+            self._btrfs_subvolume(lxc_rootfs)
+        )
+
+        mount_point = os.path.join(temp_dir, 'rootfs')
+        btrfs_dir = os.path.join(container_dir, LXC_ARCHIVE_SNAPSHOT_DIR)
+        btrfs_snapshot = os.path.join(btrfs_dir, 'rootfs')
 
         # Set the snapshot name if needed
         snapshot_name = '%s_lxc_snapshot' % self.container_name
 
+        # Entries of the container directory which are replaced by the
+        # snapshot or mount of the rootfs in the archive.
+        skip_entries = [LXC_ARCHIVE_SNAPSHOT_DIR]
+        rootfs_dir = None
+
         container_state = self._get_state()
+        snapshot_created = mounted = False
         try:
             # Ensure the original container is stopped or frozen
             if container_state not in ['stopped', 'frozen']:
@@ -1567,13 +1752,9 @@ class LxcContainerManagement(object):
                 else:
                     self.container.stop()
 
-            # Sync the container data from the container_path to work_dir
-            self._rsync_data(lxc_rootfs, temp_dir)
-
             if block_backed:
                 if snapshot_name not in self._lvm_lv_list():
-                    if not os.path.exists(mount_point):
-                        os.makedirs(mount_point)
+                    os.makedirs(mount_point)
 
                     # Take snapshot
                     size, measurement = self._get_lv_size(
@@ -1584,12 +1765,18 @@ class LxcContainerManagement(object):
                         snapshot_name=snapshot_name,
                         snapshot_size_gb=size
                     )
+                    snapshot_created = True
+
+                    # The snapshot holds the data from here on
+                    self._restore_state(container_state)
 
                     # Mount snapshot
                     self._lvm_lv_mount(
                         lv_name=snapshot_name,
                         mount_point=mount_point
                     )
+                    mounted = True
+                    rootfs_dir = temp_dir
                 else:
                     self.failure(
                         err='snapshot [ %s ] already exists' % snapshot_name,
@@ -1598,32 +1785,69 @@ class LxcContainerManagement(object):
                             ' up old snapshot of containers before continuing.'
                             % snapshot_name
                     )
+            elif btrfs_backed:
+                if os.path.exists(btrfs_dir):
+                    self.failure(
+                        err='snapshot [ %s ] already exists' % btrfs_snapshot,
+                        rc=1,
+                        msg='The snapshot [ %s ] already exists. Please clean'
+                            ' up old snapshot of containers before continuing.'
+                            % btrfs_snapshot
+                    )
+                os.makedirs(btrfs_dir)
+                self._btrfs_snapshot_create(lxc_rootfs, btrfs_snapshot)
+
+                # The snapshot holds the data from here on
+                self._restore_state(container_state)
+                rootfs_dir = btrfs_dir
             elif overlayfs_backed:
                 lowerdir, upperdir = lxc_rootfs.split(':')[1:]
+                os.makedirs(mount_point)
                 self._overlayfs_mount(
                     lowerdir=lowerdir,
                     upperdir=upperdir,
                     mount_point=mount_point
                 )
+                mounted = True
+                rootfs_dir = temp_dir
+                # The upper layer is part of the merged rootfs.
+                if os.path.dirname(upperdir) == container_dir:
+                    skip_entries.append(os.path.basename(upperdir))
+
+            sources = []
+            if rootfs_dir:
+                skip_entries.append('rootfs')
+            container_entries = [
+                i for i in sorted(os.listdir(container_dir))
+                if i not in skip_entries
+            ]
+            if container_entries:
+                sources.append((container_dir, container_entries))
+            if rootfs_dir:
+                sources.append((rootfs_dir, ['rootfs']))
 
             # Set the state as changed and set a new fact
             self.state_change = True
-            return self._create_tar(source_dir=work_dir)
+            archive_name, manifest = self._create_tar(sources=sources)
+            if manifest:
+                self.archive_manifest = manifest
+            return archive_name
         finally:
-            if block_backed or overlayfs_backed:
+            if mounted:
                 # unmount snapshot
                 self._unmount(mount_point)
 
-            if block_backed:
+            if snapshot_created:
                 # Remove snapshot
                 self._lvm_lv_remove(snapshot_name)
 
+            if btrfs_backed and os.path.exists(btrfs_dir):
+                if os.path.exists(btrfs_snapshot):
+                    self._btrfs_snapshot_remove(btrfs_snapshot)
+                os.rmdir(btrfs_dir)
+
             # Restore original state of container
-            if container_state == 'running':
-                if self._get_state() == 'frozen':
-                    self.container.unfreeze()
-                else:
-                    self.container.start()
+            self._restore_state(container_state)
 
             # Remove tmpdir
             shutil.rmtree(temp_dir)
@@ -1754,6 +1978,14 @@ def main():
             archive_compression=dict(
                 choices=LXC_COMPRESSION_MAP.keys(),
                 default='gzip'
+            ),
+            archive_threads=dict(
+                type='int',
+                default=1
+            ),
+            archive_incremental=dict(
+                type='bool',
+                default='false'
             )
         ),
         supports_check_mode=False,
@@ -86,10 +86,42 @@ class LXDClient(object):
     def do(self, method, url, body_json=None, ok_error_codes=None, timeout=None):
         resp_json = self._send_request(method, url, body_json=body_json, ok_error_codes=ok_error_codes, timeout=timeout)
         if resp_json['type'] == 'async':
-            url = '{0}/wait'.format(resp_json['operation'])
-            resp_json = self._send_request('GET', url)
-            if resp_json['metadata']['status'] != 'Success':
-                self._raise_err_from_json(resp_json)
+            resp_json = self.wait_for_operation(resp_json['operation'])
+        return resp_json
+
+    def submit(self, method, url, body_json=None, ok_error_codes=None, timeout=None):
+        """Send a request without waiting for the operation it starts.
+
+        The response of an async request carries the operation URL in
+        ``operation`` which can be passed to ``wait_for_operation`` later,
+        so several operations can run on the server at the same time while
+        sharing this client's connection.
+        """
+        return self._send_request(method, url, body_json=body_json, ok_error_codes=ok_error_codes, timeout=timeout)
+
+    def wait_for_operation(self, operation, timeout=None, ok_error_codes=None):
+        """Block on the LXD operation wait endpoint until the operation is done.
+
+        :param operation: The operation URL (e.g. /1.0/operations/<id>).
+        :type operation: ``str``
+        :param timeout: The maximum seconds the server waits before answering.
+        :type timeout: ``int``
+        :param ok_error_codes: Error codes returned instead of raised, e.g. 404
+            for an operation the server already removed some seconds after
+            it finished.
+        :type ok_error_codes: ``list``
+        """
+        url = '{0}/wait'.format(operation)
+        if timeout is not None:
+            url = '{0}?timeout={1}'.format(url, timeout)
+        resp_json = self._send_request('GET', url, ok_error_codes=ok_error_codes)
+        if resp_json['type'] == 'error':
+            return resp_json
+        status = resp_json['metadata']['status']
+        if status in ('Pending', 'Running'):
+            self._raise_err_from_json(resp_json, 'timeout waiting for operation {0}'.format(operation))
+        if status != 'Success':
+            self._raise_err_from_json(resp_json)
         return resp_json
 
     def authenticate(self, trust_password):
@@ -116,11 +148,13 @@ class LXDClient(object):
         except socket.error as e:
             raise LXDClientException('cannot connect to the LXD server', err=e)
 
-    def _raise_err_from_json(self, resp_json):
+    def _raise_err_from_json(self, resp_json, msg=None):
         err_params = {}
         if self.debug:
             err_params['logs'] = self.logs
-        raise LXDClientException(self._get_err_from_resp_json(resp_json), **err_params)
+        if msg is None:
+            msg = self._get_err_from_resp_json(resp_json)
+        raise LXDClientException(msg, **err_params)
 
     @staticmethod
     def _get_err_from_resp_json(resp_json):
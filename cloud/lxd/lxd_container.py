@@ -31,7 +31,22 @@ options:
     name:
         description:
           - Name of a container.
-        required: true
+          - Required unless I(containers) is given.
+        required: false
+    containers:
+        description:
+          - A list of containers to manage in one task, instead of I(name).
+          - Each item is a container name or a dict with a C(name) key and
+            optionally C(state), C(timeout), C(wait_for_ipv4_addresses),
+            C(force_stop), C(architecture), C(config), C(devices),
+            C(ephemeral), C(profiles) and C(source), which override the
+            values of the task for that container.
+          - All the containers share one connection to the LXD server. The
+            create and state change operations of the containers are
+            submitted together and waited on with the LXD operation wait
+            endpoint, so they run on the server at the same time.
+        required: false
+        version_added: "2.2"
     architecture:
         description:
           - The archiecture for the container (e.g. "x86_64" or "i686").
@@ -207,6 +222,23 @@ EXAMPLES = '''
         name: mycontainer
         state: restarted
 
+# An example for creating many containers at once
+- hosts: localhost
+  connection: local
+  tasks:
+    - name: Create started CI containers
+      lxd_container:
+        containers:
+          - ci1
+          - ci2
+          - name: ci3
+            profiles: ["default", "big"]
+        state: started
+        source:
+          type: image
+          alias: ubuntu/xenial/amd64
+        wait_for_ipv4_addresses: true
+
 # Note your container must be in the inventory for the below example.
 #
 # [containers]
@@ -243,9 +275,16 @@ actions:
   returned: success
   type: list
   sample: '["create", "start"]'
+containers:
+  description: Per container results with name, changed, old_state, actions,
+    elapsed seconds, addresses (when waited for) and msg (on failure).
+  returned: when containers is given
+  type: list
+  sample: '[{"name": "ci1", "changed": true, "old_state": "absent", "actions": ["create", "start"], "elapsed": 4.127}]'
 '''
 
 import os
+import time
 from ansible.modules.extras.cloud.lxd import LXDClient, LXDClientException
 
 # LXD_ANSIBLE_STATES is a map of states that contain values of methods used
@@ -271,6 +310,26 @@ CONFIG_PARAMS = [
     'architecture', 'config', 'devices', 'ephemeral', 'profiles', 'source'
 ]
 
+# LXD_ACTION_STATES is a map of the actions of state change requests to
+# the module state a container is in once the action succeeded.
+LXD_ACTION_STATES = {
+    'start': 'started',
+    'stop': 'stopped',
+    'restart': 'started',
+    'freeze': 'frozen',
+    'unfreeze': 'started'
+}
+
+# CONTAINER_ITEM_PARAMS is a list of parameters which can be set per item
+# of the containers parameter. The others are shared by all the items.
+CONTAINER_ITEM_PARAMS = [
+    'name', 'state', 'timeout', 'wait_for_ipv4_addresses', 'force_stop'
+] + CONFIG_PARAMS
+
+# ADDRESSES_POLL_MAX_DELAY is the longest pause in seconds between two
+# rounds of IPv4 address checks in the containers mode.
+ADDRESSES_POLL_MAX_DELAY = 2
+
 try:
     callable(all)
 except NameError:
@@ -282,45 +341,66 @@ except NameError:
                 return False
         return True
 
+def connect_lxd(module):
+    """Create the LXD client for the module's url and certificate options."""
+    try:
+        return LXDClient(
+            module.params['url'], key_file=module.params.get('key_file', None),
+            cert_file=module.params.get('cert_file', None),
+            debug=module._verbosity >= 4
+        )
+    except LXDClientException as e:
+        module.fail_json(msg=e.msg)
+
 class LXDContainerManagement(object):
-    def __init__(self, module):
+    def __init__(self, module, params=None, client=None):
         """Management of LXC containers via Ansible.
 
         :param module: Processed Ansible Module.
         :type module: ``object``
+        :param params: Parameters of this container, module.params by default.
+        :type params: ``dict``
+        :param client: A LXD client shared with other containers.
+        :type client: ``object``
         """
         self.module = module
-        self.name = self.module.params['name']
+        self.params = params if params is not None else self.module.params
+        self.name = self.params['name']
         self._build_config()
 
-        self.state = self.module.params['state']
+        self.state = self.params['state']
 
-        self.timeout = self.module.params['timeout']
-        self.wait_for_ipv4_addresses = self.module.params['wait_for_ipv4_addresses']
-        self.force_stop = self.module.params['force_stop']
+        self.timeout = self.params['timeout']
+        self.wait_for_ipv4_addresses = self.params['wait_for_ipv4_addresses']
+        self.force_stop = self.params['force_stop']
         self.addresses = None
 
         self.url = self.module.params['url']
         self.key_file = self.module.params.get('key_file', None)
         self.cert_file = self.module.params.get('cert_file', None)
         self.debug = self.module._verbosity >= 4
-        try:
-            self.client = LXDClient(
-                self.url, key_file=self.key_file, cert_file=self.cert_file,
-                debug=self.debug
-            )
-        except LXDClientException as e:
-            self.module.fail_json(msg=e.msg)
+        if client is None:
+            client = connect_lxd(self.module)
+        self.client = client
         self.trust_password = self.module.params.get('trust_password', None)
         self.actions = []
+        # When steps is a list, state changing requests are queued in it
+        # instead of being sent, so LXDContainerBatch can run them later.
+        self.steps = None
 
     def _build_config(self):
         self.config = {}
         for attr in CONFIG_PARAMS:
-            param_val = self.module.params.get(attr, None)
+            param_val = self.params.get(attr, None)
             if param_val is not None:
                 self.config[attr] = param_val
 
+    def _request(self, method, url, body_json=None):
+        if self.steps is not None:
+            self.steps.append((method, url, body_json))
+            return None
+        return self.client.do(method, url, body_json=body_json)
+
     def _get_container_json(self):
         return self.client.do(
             'GET', '/1.0/containers/{0}'.format(self.name),
@@ -343,12 +423,12 @@ class LXDContainerManagement(object):
         body_json={'action': action, 'timeout': self.timeout}
         if force_stop:
             body_json['force'] = True
-        return self.client.do('PUT', '/1.0/containers/{0}/state'.format(self.name), body_json=body_json)
+        return self._request('PUT', '/1.0/containers/{0}/state'.format(self.name), body_json=body_json)
 
     def _create_container(self):
         config = self.config.copy()
         config['name'] = self.name
-        self.client.do('POST', '/1.0/containers', config)
+        self._request('POST', '/1.0/containers', config)
         self.actions.append('create')
 
     def _start_container(self):
@@ -364,7 +444,7 @@ class LXDContainerManagement(object):
         self.actions.append('restart')
 
     def _delete_container(self):
-        return self.client.do('DELETE', '/1.0/containers/{0}'.format(self.name))
+        return self._request('DELETE', '/1.0/containers/{0}'.format(self.name))
         self.actions.append('delete')
 
     def _freeze_container(self):
@@ -387,6 +467,9 @@ class LXDContainerManagement(object):
         return len(addresses) > 0 and all([len(v) > 0 for v in addresses.itervalues()])
 
     def _get_addresses(self):
+        if self.steps is not None:
+            # Queued containers are polled together by LXDContainerBatch.
+            return
         try:
             due = datetime.datetime.now() + datetime.timedelta(seconds=self.timeout)
             while datetime.datetime.now() < due:
@@ -498,7 +581,7 @@ class LXDContainerManagement(object):
             body_json['devices'] = self.config['devices']
         if self._needs_to_change_container_config('profiles'):
             body_json['profiles'] = self.config['profiles']
-        self.client.do('PUT', '/1.0/containers/{0}'.format(self.name), body_json=body_json)
+        self._request('PUT', '/1.0/containers/{0}'.format(self.name), body_json=body_json)
         self.actions.append('apply_container_configs')
 
     def run(self):
@@ -536,6 +619,180 @@ class LXDContainerManagement(object):
                 fail_params['logs'] = e.kwargs['logs']
             self.module.fail_json(**fail_params)
 
+class LXDContainerBatch(object):
+    def __init__(self, module):
+        """Management of many LXD containers sharing one client connection.
+
+        :param module: Processed Ansible Module.
+        :type module: ``object``
+        """
+        self.module = module
+        self.client = connect_lxd(self.module)
+        self.trust_password = self.module.params.get('trust_password', None)
+        self.containers = []
+        names = set()
+        for item in self.module.params['containers']:
+            params = self._container_params(item)
+            if params['name'] in names:
+                self.module.fail_json(msg='container {0} is listed twice in containers'.format(params['name']))
+            names.add(params['name'])
+            self.containers.append(LXDContainerManagement(self.module, params=params, client=self.client))
+        self.started_at = {}
+        self.finished_at = {}
+        self.errors = {}
+
+    def _container_params(self, item):
+        if not isinstance(item, dict):
+            item = {'name': item}
+        unknown = [k for k in item if k not in CONTAINER_ITEM_PARAMS]
+        if unknown:
+            self.module.fail_json(msg='unsupported parameters for a container item: {0}'.format(', '.join(sorted(unknown))))
+        if not item.get('name'):
+            self.module.fail_json(msg='each item of containers requires a name')
+        if item.get('state', 'started') not in LXD_ANSIBLE_STATES:
+            self.module.fail_json(msg='invalid state {0} for container {1}'.format(item['state'], item['name']))
+        params = dict(self.module.params)
+        params.update(item)
+        return params
+
+    def _failed(self, container, e):
+        self.errors[container.name] = e.msg
+        container.steps = []
+
+    def _run_steps(self, containers):
+        """Run the queued requests of the containers in rounds.
+
+        Every round submits the next request of each container without
+        waiting, then waits on the operations, so the operations of one
+        round run on the LXD server at the same time.
+        """
+        pending = [c for c in containers if c.steps]
+        while pending:
+            operations = []
+            for container in pending:
+                method, url, body_json = container.steps.pop(0)
+                self.started_at.setdefault(container.name, time.time())
+                try:
+                    resp_json = self.client.submit(method, url, body_json=body_json)
+                except LXDClientException as e:
+                    self._failed(container, e)
+                    continue
+                if resp_json['type'] == 'async':
+                    operations.append((container, resp_json['operation'], method, body_json))
+                else:
+                    self.finished_at[container.name] = time.time()
+            for container, operation, method, body_json in operations:
+                try:
+                    resp_json = self.client.wait_for_operation(operation, ok_error_codes=[404])
+                    if resp_json['type'] == 'error':
+                        self._check_step(container, method, body_json)
+                except LXDClientException as e:
+                    self._failed(container, e)
+                self.finished_at[container.name] = time.time()
+            pending = [c for c in pending if c.steps]
+
+    def _check_step(self, container, method, body_json):
+        """Check the outcome of a step whose operation is already gone.
+
+        LXD removes finished operations a few seconds after they ended, so
+        an operation of a round can be unknown by the time it is waited on.
+        The container itself then tells whether the step succeeded.
+        """
+        state = container._container_json_to_module_state(container._get_container_json())
+        if method == 'DELETE':
+            expected = 'absent'
+        elif method == 'PUT' and 'action' in body_json:
+            expected = LXD_ACTION_STATES[body_json['action']]
+        elif state != 'absent':
+            # the container exists and its creation or configuration ended
+            return
+        else:
+            expected = 'present'
+        if state != expected:
+            raise LXDClientException(
+                'container {0} is {1} instead of {2} after its operation ended'.format(container.name, state, expected)
+            )
+
+    def _wait_for_addresses(self, containers):
+        """Poll IPv4 addresses of all the containers in one loop."""
+        now = time.time()
+        due = dict((c.name, now + c.timeout) for c in containers)
+        delay = 0.25
+        while containers:
+            remaining = []
+            for container in containers:
+                try:
+                    addresses = container._container_ipv4_addresses()
+                except LXDClientException as e:
+                    e.msg = 'timeout for getting IPv4 addresses'
+                    self._failed(container, e)
+                    continue
+                if container._has_all_ipv4_addresses(addresses):
+                    container.addresses = addresses
+                    self.finished_at[container.name] = time.time()
+                elif time.time() < due[container.name]:
+                    remaining.append(container)
+            containers = remaining
+            if containers:
+                time.sleep(delay)
+                delay = min(delay * 2, ADDRESSES_POLL_MAX_DELAY)
+
+    def _container_result(self, container):
+        result = {
+            'name': container.name,
+            'changed': len(container.actions) > 0,
+            'old_state': container.old_state,
+            'actions': container.actions,
+            'elapsed': 0.0
+        }
+        if container.name in self.started_at:
+            result['elapsed'] = round(self.finished_at.get(container.name, time.time()) - self.started_at[container.name], 3)
+        if container.addresses is not None:
+            result['addresses'] = container.addresses
+        if container.name in self.errors:
+            result['msg'] = self.errors[container.name]
+        return result
+
+    def run(self):
+        """Run the main method for the containers parameter."""
+
+        try:
+            if self.trust_password is not None:
+                self.client.authenticate(self.trust_password)
+
+            for container in self.containers:
+                container.old_container_json = container._get_container_json()
+                container.old_state = container._container_json_to_module_state(container.old_container_json)
+                container.steps = []
+                getattr(container, LXD_ANSIBLE_STATES[container.state])()
+
+            self._run_steps(self.containers)
+            self._wait_for_addresses([
+                c for c in self.containers
+                if c.wait_for_ipv4_addresses and c.state in ('started', 'restarted') and c.name not in self.errors
+            ])
+        except LXDClientException as e:
+            fail_params = {
+                'msg': e.msg,
+                'changed': any(len(c.actions) > 0 for c in self.containers)
+            }
+            if self.client.debug:
+                fail_params['logs'] = e.kwargs['logs']
+            self.module.fail_json(**fail_params)
+
+        results = [self._container_result(c) for c in self.containers]
+        result_json = {
+            'log_verbosity': self.module._verbosity,
+            'changed': any(r['changed'] for r in results),
+            'containers': results
+        }
+        if self.client.debug:
+            result_json['logs'] = self.client.logs
+        if self.errors:
+            result_json['msg'] = 'failed to manage containers: {0}'.format(', '.join(sorted(self.errors)))
+            self.module.fail_json(**result_json)
+        self.module.exit_json(**result_json)
+
 def main():
     """Ansible Main module."""
 
@@ -543,7 +800,9 @@ def main():
         argument_spec=dict(
             name=dict(
                 type='str',
-                required=True
+            ),
+            containers=dict(
+                type='list',
             ),
             architecture=dict(
                 type='str',
@@ -598,10 +857,15 @@ def main():
                 type='str',
             )
         ),
+        required_one_of=[['name', 'containers']],
+        mutually_exclusive=[['name', 'containers']],
         supports_check_mode=False,
     )
 
-    lxd_manage = LXDContainerManagement(module=module)
+    if module.params['containers'] is not None:
+        lxd_manage = LXDContainerBatch(module=module)
+    else:
+        lxd_manage = LXDContainerManagement(module=module)
     lxd_manage.run()
 
 # import module bits
@@ -40,8 +40,20 @@ options:
   vmid:
     description:
       - the instance id
+      - required unless C(instances) is given
     default: null
-    required: true
+    required: false
+  instances:
+    description:
+      - list of instances to manage in one task, each a dict with a C(vmid) and any
+        of the instance options (node, hostname, password, ostemplate, disk, cpus,
+        memory, ...) that should differ from the module options
+      - all create, start or stop tasks are submitted first and then awaited
+        together within C(timeout)
+      - can be used only with states C(present), C(started) and C(stopped)
+    default: null
+    required: false
+    version_added: "2.2"
   validate_certs:
     description:
       - enable / disable https certificate verification
@@ -198,6 +210,31 @@ EXAMPLES = '''
 
 # Remove container
 - proxmox: vmid=100 api_user='root@pam' api_password='1q2w3e' api_host='node1' state=absent
+
+# Create several containers at once, waiting for all of them together
+- proxmox:
+    api_user: root@pam
+    api_password: 1q2w3e
+    api_host: node1
+    node: uk-mc02
+    password: 123456
+    ostemplate: 'local:vztmpl/ubuntu-14.04-x86_64.tar.gz'
+    timeout: 300
+    instances:
+      - { vmid: 101, hostname: ci1.example.org }
+      - { vmid: 102, hostname: ci2.example.org }
+      - { vmid: 103, hostname: ci3.example.org, memory: 1024 }
+
+# Start several containers at once
+- proxmox:
+    api_user: root@pam
+    api_password: 1q2w3e
+    api_host: node1
+    state: started
+    instances:
+      - { vmid: 101 }
+      - { vmid: 102 }
+      - { vmid: 103 }
 '''
 
 import os
@@ -210,9 +247,22 @@ except ImportError:
   HAS_PROXMOXER = False
 
 VZ_TYPE=None
+CLUSTER_RESOURCES=None
+
+# seconds between task status polls, growing up to the maximum
+TASK_POLL_INTERVAL=0.5
+TASK_POLL_MAX_INTERVAL=5
+
+def get_cluster_resources(proxmox, refresh=False):
+  global CLUSTER_RESOURCES
+  if CLUSTER_RESOURCES is None or refresh:
+    CLUSTER_RESOURCES = {}
+    for vm in proxmox.cluster.resources.get(type='vm'):
+      CLUSTER_RESOURCES.setdefault(int(vm['vmid']), []).append(vm)
+  return CLUSTER_RESOURCES
 
 def get_instance(proxmox, vmid):
-  return [ vm for vm in proxmox.cluster.resources.get(type='vm') if vm['vmid'] == int(vmid) ]
+  return get_cluster_resources(proxmox).get(int(vmid), [])
 
 def content_check(proxmox, node, ostemplate, storage):
   return [ True for cnt in proxmox.nodes(node).storage(storage).content.get() if cnt['volid'] == ostemplate ]
@@ -220,7 +270,35 @@ def content_check(proxmox, node, ostemplate, storage):
 def node_check(proxmox, node):
   return [ True for nd in proxmox.nodes.get() if nd['node'] == node ]
 
-def create_instance(module, proxmox, vmid, node, disk, storage, cpus, memory, swap, timeout, **kwargs):
+def wait_for_tasks(module, proxmox, tasks, timeout, action):
+  """
+  Waits until every (node, taskid) in tasks has finished, polling each
+  pending task once per tick with a growing interval, and fails the
+  module if one of them does not end with OK before timeout seconds.
+  """
+  pending = list(tasks)
+  deadline = time.time() + timeout
+  interval = TASK_POLL_INTERVAL
+  while pending:
+    for node, taskid in list(pending):
+      status = proxmox.nodes(node).tasks(taskid).status.get()
+      if status['status'] != 'stopped':
+        continue
+      if status.get('exitstatus') != 'OK':
+        module.fail_json(msg='Task %s failed while %s VM with exit status %s. Last line in task: %s'
+                         % (taskid, action, status.get('exitstatus'), proxmox.nodes(node).tasks(taskid).log.get()[:1]))
+      pending.remove((node, taskid))
+    if not pending:
+      break
+    if time.time() >= deadline:
+      node, taskid = pending[0]
+      module.fail_json(msg='Reached timeout while waiting for %s VM. Last line in task before timeout: %s'
+                       % (action, proxmox.nodes(node).tasks(taskid).log.get()[:1]))
+    time.sleep(min(interval, max(deadline - time.time(), 0)))
+    interval = min(interval * 1.5, TASK_POLL_MAX_INTERVAL)
+  return True
+
+def submit_create(proxmox, vmid, node, disk, storage, cpus, memory, swap, **kwargs):
   proxmox_node = proxmox.nodes(node)
   kwargs = dict((k,v) for k, v in kwargs.iteritems() if v is not None)
   if VZ_TYPE =='lxc':
@@ -235,64 +313,89 @@ def create_instance(module, proxmox, vmid, node, disk, storage, cpus, memory, sw
   else:
       kwargs['cpus']=cpus
       kwargs['disk']=disk
-  taskid = getattr(proxmox_node, VZ_TYPE).create(vmid=vmid, storage=storage, memory=memory, swap=swap, **kwargs)
+  return getattr(proxmox_node, VZ_TYPE).create(vmid=vmid, storage=storage, memory=memory, swap=swap, **kwargs)
 
-  while timeout:
-    if ( proxmox_node.tasks(taskid).status.get()['status'] == 'stopped'
-        and proxmox_node.tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-      return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for creating VM. Last line in task before timeout: %s'
-                       % proxmox_node.tasks(taskid).log.get()[:1])
+def create_instance(module, proxmox, vmid, node, disk, storage, cpus, memory, swap, timeout, **kwargs):
+  taskid = submit_create(proxmox, vmid, node, disk, storage, cpus, memory, swap, **kwargs)
+  return wait_for_tasks(module, proxmox, [(node, taskid)], timeout, 'creating')
 
-    time.sleep(1)
-  return False
+def submit_start(proxmox, vm, vmid):
+  return getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.start.post()
 
 def start_instance(module, proxmox, vm, vmid, timeout):
-  taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.start.post()
-  while timeout:
-    if ( proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['status'] == 'stopped'
-        and proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-      return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for starting VM. Last line in task before timeout: %s'
-                       % proxmox.nodes(vm[0]['node']).tasks(taskid).log.get()[:1])
-
-    time.sleep(1)
-  return False
+  taskid = submit_start(proxmox, vm, vmid)
+  return wait_for_tasks(module, proxmox, [(vm[0]['node'], taskid)], timeout, 'starting')
 
-def stop_instance(module, proxmox, vm, vmid, timeout, force):
+def submit_stop(proxmox, vm, vmid, force):
   if force:
-    taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.shutdown.post(forceStop=1)
-  else:
-    taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.shutdown.post()
-  while timeout:
-    if ( proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['status'] == 'stopped'
-        and proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-      return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for stopping VM. Last line in task before timeout: %s'
-                       % proxmox_node.tasks(taskid).log.get()[:1])
-
-    time.sleep(1)
-  return False
+    return getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.shutdown.post(forceStop=1)
+  return getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.shutdown.post()
+
+def stop_instance(module, proxmox, vm, vmid, timeout, force):
+  taskid = submit_stop(proxmox, vm, vmid, force)
+  return wait_for_tasks(module, proxmox, [(vm[0]['node'], taskid)], timeout, 'stopping')
 
 def umount_instance(module, proxmox, vm, vmid, timeout):
   taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.umount.post()
-  while timeout:
-    if ( proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['status'] == 'stopped'
-        and proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-      return True
-    timeout = timeout - 1
-    if timeout == 0:
-      module.fail_json(msg='Reached timeout while waiting for unmounting VM. Last line in task before timeout: %s'
-                       % proxmox_node.tasks(taskid).log.get()[:1])
-
-    time.sleep(1)
-  return False
+  return wait_for_tasks(module, proxmox, [(vm[0]['node'], taskid)], timeout, 'unmounting')
+
+def get_instance_status(proxmox, vm, vmid):
+  return getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE)(vmid).status.current.get()['status']
+
+def manage_instances(module, proxmox, state, timeout):
+  """
+  Submits the create, start or stop task of every item of instances
+  first and then waits for all of them together.
+  """
+  tasks = []
+  changed = []
+  for item in module.params['instances']:
+    params = dict(module.params)
+    params.update(item)
+    vmid = params.get('vmid')
+    if not vmid:
+      module.fail_json(msg='each item of instances needs a vmid')
+    vm = get_instance(proxmox, vmid)
+
+    if state == 'present':
+      if vm and not params['force']:
+        continue
+      node = params['node']
+      if not (node and params['hostname'] and params['password'] and params['ostemplate']):
+        module.fail_json(msg='node, hostname, password and ostemplate are mandatory for creating vm %s' % vmid)
+      taskid = submit_create(proxmox, vmid, node, params['disk'], params['storage'], params['cpus'],
+                             params['memory'], params['swap'],
+                             password = params['password'],
+                             hostname = params['hostname'],
+                             ostemplate = params['ostemplate'],
+                             netif = params['netif'],
+                             mounts = params['mounts'],
+                             ip_address = params['ip_address'],
+                             onboot = int(params['onboot']),
+                             cpuunits = params['cpuunits'],
+                             nameserver = params['nameserver'],
+                             searchdomain = params['searchdomain'],
+                             force = int(params['force']))
+    else:
+      if not vm:
+        module.fail_json(msg='VM with vmid = %s not exists in cluster' % vmid)
+      node = vm[0]['node']
+      status = get_instance_status(proxmox, vm, vmid)
+      if state == 'started':
+        if status == 'running':
+          continue
+        taskid = submit_start(proxmox, vm, vmid)
+      else:
+        if status in ('stopped', 'mounted'):
+          continue
+        taskid = submit_stop(proxmox, vm, vmid, params['force'])
+
+    tasks.append((node, taskid))
+    changed.append(vmid)
+
+  action = dict(present='creating', started='starting', stopped='stopping')[state]
+  wait_for_tasks(module, proxmox, tasks, timeout, action)
+  return changed
 
 def main():
   module = AnsibleModule(
@@ -300,7 +403,8 @@ def main():
       api_host = dict(required=True),
       api_user = dict(required=True),
       api_password = dict(no_log=True),
-      vmid = dict(required=True),
+      vmid = dict(required=False),
+      instances = dict(type='list'),
       validate_certs = dict(type='bool', default='no'),
       node = dict(),
       password = dict(no_log=True),
@@ -321,7 +425,8 @@ def main():
       timeout = dict(type='int', default=30),
       force = dict(type='bool', default='no'),
       state = dict(default='present', choices=['present', 'absent', 'stopped', 'started', 'restarted']),
-    )
+    ),
+    required_one_of = [['vmid', 'instances']],
   )
 
   if not HAS_PROXMOXER:
@@ -356,6 +461,16 @@ def main():
   except Exception, e:
     module.fail_json(msg='authorization on proxmox cluster failed with exception: %s' % e)
 
+  if module.params['instances'] is not None:
+    if state not in ('present', 'started', 'stopped'):
+      module.fail_json(msg='instances can only be used with states present, started and stopped')
+    try:
+      changed = manage_instances(module, proxmox, state, timeout)
+    except Exception, e:
+      module.fail_json(msg="%s of VMs failed with exception: %s" % (state, e))
+    module.exit_json(changed=bool(changed), vmids=changed,
+                     msg="VMs %s are %s" % (', '.join(str(v) for v in changed), state))
+
   if state == 'present':
     try:
       if get_instance(proxmox, vmid) and not module.params['force']:
@@ -448,16 +563,8 @@ def main():
         module.exit_json(changed=False, msg="VM %s is mounted. Stop it with force option before deletion." % vmid)
 
       taskid = getattr(proxmox.nodes(vm[0]['node']), VZ_TYPE).delete(vmid)
-      while timeout:
-        if ( proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['status'] == 'stopped'
-            and proxmox.nodes(vm[0]['node']).tasks(taskid).status.get()['exitstatus'] == 'OK' ):
-          module.exit_json(changed=True, msg="VM %s removed" % vmid)
-        timeout = timeout - 1
-        if timeout == 0:
-          module.fail_json(msg='Reached timeout while waiting for removing VM. Last line in task before timeout: %s'
-                           % proxmox_node.tasks(taskid).log.get()[:1])
-
-        time.sleep(1)
+      if wait_for_tasks(module, proxmox, [(vm[0]['node'], taskid)], timeout, 'removing'):
+        module.exit_json(changed=True, msg="VM %s removed" % vmid)
     except Exception, e:
       module.fail_json(msg="deletion of VM %s failed with exception: %s" % ( vmid, e ))
 
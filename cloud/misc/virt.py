@@ -155,36 +155,91 @@ class LibvirtConnection(object):
             raise Exception("hypervisor connection failure")
 
         self.conn = conn
+        self.domains = None
 
-    def find_vm(self, vmid):
+    def get_domains(self):
         """
-        Extra bonus feature: vmid = -1 returns a list of everything
+        Returns the per-run index of every running and defined domain,
+        built with a single listAllDomains call where libvirt supports it
         """
+        if self.domains is not None:
+            return self.domains
+
         conn = self.conn
 
-        vms = []
+        if hasattr(conn, 'listAllDomains'):
+            vms = conn.listAllDomains(0)
+        else:
+            vms = []
+
+            # this block of code borrowed from virt-manager:
+            # get working domain's name
+            ids = conn.listDomainsID()
+            for id in ids:
+                vm = conn.lookupByID(id)
+                vms.append(vm)
+            # get defined domain
+            names = conn.listDefinedDomains()
+            for name in names:
+                vm = conn.lookupByName(name)
+                vms.append(vm)
+
+        self.domains = dict(list=vms, names=dict(), uuids=dict())
+        for vm in vms:
+            self.domains['names'][vm.name()] = vm
+            self.domains['uuids'][vm.UUIDString()] = vm
+        return self.domains
+
+    def invalidate_domains(self):
+        self.domains = None
 
-        # this block of code borrowed from virt-manager:
-        # get working domain's name
-        ids = conn.listDomainsID()
-        for id in ids:
-            vm = conn.lookupByID(id)
-            vms.append(vm)
-        # get defined domain
-        names = conn.listDefinedDomains()
-        for name in names:
-            vm = conn.lookupByName(name)
-            vms.append(vm)
+    def find_vm(self, vmid):
+        """
+        Extra bonus feature: vmid = -1 returns a list of everything
+        """
+        domains = self.get_domains()
 
         if vmid == -1:
-            return vms
+            return domains['list']
 
-        for vm in vms:
-            if vm.name() == vmid:
-                return vm
+        if vmid in domains['names']:
+            return domains['names'][vmid]
+        if vmid in domains['uuids']:
+            return domains['uuids'][vmid]
 
         raise VMNotFound("virtual machine %s not found" % vmid)
 
+    def get_all_info(self):
+        """
+        Returns the info() tuple of every domain keyed by name, using one
+        getAllDomainStats call where libvirt supports it
+        """
+        vms = self.find_vm(-1)
+        infos = dict()
+
+        if hasattr(self.conn, 'getAllDomainStats'):
+            stats = libvirt.VIR_DOMAIN_STATS_STATE | libvirt.VIR_DOMAIN_STATS_BALLOON | \
+                libvirt.VIR_DOMAIN_STATS_VCPU | libvirt.VIR_DOMAIN_STATS_CPU_TOTAL
+            for vm, data in self.conn.getAllDomainStats(stats):
+                try:
+                    infos[vm.name()] = (data['state.state'], data['balloon.maximum'],
+                                        data['balloon.current'], data['vcpu.current'],
+                                        data['cpu.time'])
+                except KeyError:
+                    # inactive domains do not report every statistic
+                    pass
+
+        for vm in vms:
+            if vm.name() not in infos:
+                infos[vm.name()] = vm.info()
+        return infos
+
+    def get_autostart_names(self):
+        if hasattr(self.conn, 'listAllDomains'):
+            vms = self.conn.listAllDomains(libvirt.VIR_CONNECT_LIST_DOMAINS_AUTOSTART)
+            return set(vm.name() for vm in vms)
+        return set(vm.name() for vm in self.find_vm(-1) if vm.autostart())
+
     def shutdown(self, vmid):
         return self.find_vm(vmid).shutdown()
 
@@ -207,7 +262,9 @@ class LibvirtConnection(object):
         return self.find_vm(vmid).destroy()
 
     def undefine(self, vmid):
-        return self.find_vm(vmid).undefine()
+        result = self.find_vm(vmid).undefine()
+        self.invalidate_domains()
+        return result
 
     def get_status2(self, vm):
         state = vm.info()[0]
@@ -224,30 +281,32 @@ class LibvirtConnection(object):
         return self.conn.getType()
 
     def get_xml(self, vmid):
-        vm = self.conn.lookupByName(vmid)
+        vm = self.find_vm(vmid)
         return vm.XMLDesc(0)
 
     def get_maxVcpus(self, vmid):
-        vm = self.conn.lookupByName(vmid)
+        vm = self.find_vm(vmid)
         return vm.maxVcpus()
 
     def get_maxMemory(self, vmid):
-        vm = self.conn.lookupByName(vmid)
+        vm = self.find_vm(vmid)
         return vm.maxMemory()
 
     def getFreeMemory(self):
         return self.conn.getFreeMemory()
 
     def get_autostart(self, vmid):
-        vm = self.conn.lookupByName(vmid)
+        vm = self.find_vm(vmid)
         return vm.autostart()
 
     def set_autostart(self, vmid, val):
-        vm = self.conn.lookupByName(vmid)
+        vm = self.find_vm(vmid)
         return vm.setAutostart(val)
 
     def define_from_xml(self, xml):
-        return self.conn.defineXML(xml)
+        result = self.conn.defineXML(xml)
+        self.invalidate_domains()
+        return result
 
 
 class Virt(object):
@@ -255,9 +314,11 @@ class Virt(object):
     def __init__(self, uri, module):
         self.module = module
         self.uri = uri
+        self.conn = None
 
     def __get_conn(self):
-        self.conn = LibvirtConnection(self.uri, self.module)
+        if self.conn is None:
+            self.conn = LibvirtConnection(self.uri, self.module)
         return self.conn
 
     def get_vm(self, vmid):
@@ -266,17 +327,20 @@ class Virt(object):
 
     def state(self):
         vms = self.list_vms()
+        infos = self.conn.get_all_info()
         state = []
         for vm in vms:
-            state_blurb = self.conn.get_status(vm)
+            state_blurb = VIRT_STATE_NAME_MAP.get(infos[vm][0],"unknown")
             state.append("%s %s" % (vm,state_blurb))
         return state
 
     def info(self):
         vms = self.list_vms()
+        infos = self.conn.get_all_info()
+        autostart = self.conn.get_autostart_names()
         info = dict()
         for vm in vms:
-            data = self.conn.find_vm(vm).info()
+            data = infos[vm]
             # libvirt returns maxMem, memory, and cpuTime as long()'s, which
             # xmlrpclib tries to convert to regular int's during serialization.
             # This throws exceptions, so convert them to strings here and
@@ -289,7 +353,7 @@ class Virt(object):
                 "nrVirtCpu" : data[3],
                 "cpuTime"   : str(data[4]),
             }
-            info[vm]["autostart"] = self.conn.get_autostart(vm)
+            info[vm]["autostart"] = int(vm in autostart)
 
         return info
 
@@ -312,11 +376,13 @@ class Virt(object):
     def list_vms(self, state=None):
         self.conn = self.__get_conn()
         vms = self.conn.find_vm(-1)
+        if state:
+            infos = self.conn.get_all_info()
         results = []
         for x in vms:
             try:
                 if state:
-                    vmstate = self.conn.get_status2(x)
+                    vmstate = VIRT_STATE_NAME_MAP.get(infos[x.name()][0],"unknown")
                     if vmstate == state:
                         results.append(x.name())
                 else:
@@ -165,6 +165,43 @@ options:
           - the token key indentifying an ACL rule set. May be required to register services.
         required: false
         default: None
+    services:
+        description:
+          - a list of services to register or deregister in one run. Each item
+            takes the service_name, service_id, service_port, service_address
+            and tags options, and optionally the script, interval, ttl, http,
+            timeout and notes options of its check.
+          - The services and checks of the agent are listed once, and only the
+            services that are missing or differ, or whose check is missing,
+            are registered. Changes to the script, interval, ttl or http of an
+            already registered check can not be detected, change its check_id
+            or remove it to have it registered again.
+        required: false
+        default: None
+        version_added: "2.2"
+    checks:
+        description:
+          - a list of node level checks to register or deregister in one run,
+            each taking the check_id, check_name, script, interval, ttl, http,
+            timeout and notes options. Checks whose id is registered with the
+            same name and notes are left alone.
+        required: false
+        default: None
+        version_added: "2.2"
+    wait_for_passing:
+        description:
+          - with services or checks, wait until all their checks pass before
+            returning. The agent is watched with a blocking query on the health
+            of its node, so a change of status is seen as soon as it happens.
+        required: false
+        default: false
+        version_added: "2.2"
+    wait_timeout:
+        description:
+          - how many seconds to wait for the checks to pass.
+        required: false
+        default: 60
+        version_added: "2.2"
 """
 
 EXAMPLES = '''
@@ -213,8 +250,36 @@ EXAMPLES = '''
       script: "/opt/disk_usage.py"
       interval: 5m
 
+  - name: register the services of the node at once and wait for them to be healthy
+    consul:
+      services:
+        - service_name: nginx
+          service_port: 80
+          http: http://localhost/status
+          interval: 10s
+        - service_name: api
+          service_port: 8080
+          tags:
+            - prod
+      checks:
+        - check_name: Disk usage
+          check_id: disk_usage
+          script: /opt/disk_usage.py
+          interval: 5m
+      wait_for_passing: yes
+      wait_timeout: 120
+
+  - name: remove several services
+    consul:
+      services:
+        - service_name: nginx
+        - service_name: api
+      state: absent
+
 '''
 
+import time
+
 try:
     import consul
     from requests.exceptions import ConnectionError
@@ -226,7 +291,9 @@ def register_with_consul(module):
 
     state = module.params.get('state')
 
-    if state == 'present':
+    if module.params.get('services') or module.params.get('checks'):
+        sync_batch(module)
+    elif state == 'present':
         add(module)
     else:
         remove(module)
@@ -330,6 +397,131 @@ def remove_service(module, service_id):
     module.exit_json(changed=False, id=service_id)
 
 
+def sync_batch(module):
+    ''' registers or deregisters the items of services and checks. The services
+    and checks of the agent are listed once and only the items which differ
+    from them are sent to the agent '''
+    consul_api = get_consul_api(module)
+    registered_services = dict((s['ID'], s) for s in consul_api.agent.services().values())
+    registered_checks = consul_api.agent.checks()
+
+    if module.params.get('state') == 'absent':
+        remove_batch(module, consul_api, registered_services, registered_checks)
+
+    services = []
+    for params in module.params.get('services') or []:
+        service = parse_service(module, params)
+        if not service:
+            module.fail_json(msg='a name and port are required to register a service', service=params)
+        check = parse_check(module, params)
+        if check:
+            service.add_check(check)
+        services.append(service)
+
+    checks = []
+    for params in module.params.get('checks') or []:
+        check = parse_check(module, params)
+        if not check or not check.name:
+            module.fail_json(msg='a check name is required for a node level check, one not attached to a service', check=params)
+        checks.append(check)
+
+    changed_services = []
+    for service in services:
+        existing = registered_services.get(service.id)
+        # consul derives the id of the check of a service from the service id
+        check_missing = service.has_checks() and 'service:%s' % service.id not in registered_checks
+        if not existing or ConsulService(loaded=existing) != service or check_missing:
+            changed_services.append(service)
+    changed_checks = [check for check in checks if not is_check_registered(check, registered_checks)]
+
+    for service in changed_services:
+        service.register(consul_api)
+    for check in changed_checks:
+        check.register(consul_api)
+
+    result = dict(changed=bool(changed_services or changed_checks),
+                  registered_services=[service.id for service in changed_services],
+                  registered_checks=[check.check_id for check in changed_checks])
+
+    if module.params.get('wait_for_passing'):
+        check_ids = ['service:%s' % service.id for service in services if service.has_checks()]
+        check_ids.extend(check.check_id for check in checks)
+        passing, result['check_status'] = wait_for_passing(module, consul_api, check_ids)
+        if not passing:
+            module.fail_json(msg='checks did not pass within %s seconds' % module.params.get('wait_timeout'),
+                             **result)
+
+    module.exit_json(**result)
+
+
+def remove_batch(module, consul_api, registered_services, registered_checks):
+    ''' deregisters the items of services and checks which are registered '''
+    service_ids = [p.get('service_id') or p.get('service_name') for p in module.params.get('services') or []]
+    check_ids = [p.get('check_id') or p.get('check_name') for p in module.params.get('checks') or []]
+    if not all(service_ids + check_ids):
+        module.fail_json(msg='services and checks are removed by id or name. please supply a service id/name or a check id/name for every item')
+
+    removed_services = []
+    for service_id in service_ids:
+        if service_id in registered_services and service_id not in removed_services:
+            consul_api.agent.service.deregister(service_id)
+            removed_services.append(service_id)
+
+    removed_checks = []
+    for check_id in check_ids:
+        if check_id in registered_checks and check_id not in removed_checks:
+            consul_api.agent.check.deregister(check_id)
+            removed_checks.append(check_id)
+
+    module.exit_json(changed=bool(removed_services or removed_checks),
+                     deregistered_services=removed_services,
+                     deregistered_checks=removed_checks)
+
+
+def is_check_registered(check, registered_checks):
+    ''' whether a node level check with the same id, name and notes is
+    registered. The script, interval, ttl and http of a registered check
+    can't be retrieved, so changes of these are not seen '''
+    existing = registered_checks.get(check.check_id)
+    return (existing is not None
+            and not existing.get('ServiceID')
+            and existing.get('Name') == check.name
+            and (existing.get('Notes') or None) == (check.notes or None))
+
+
+def wait_for_passing(module, consul_api, check_ids):
+    ''' waits until the checks with the given ids pass. The health of the node
+    of the agent is watched with a blocking query, which returns as soon as
+    any of its checks changes, instead of polling it. Returns whether all the
+    checks passed in time and the status of each of them '''
+    status = {}
+    if not check_ids:
+        return True, status
+
+    node = consul_api.agent.self()['Config']['NodeName']
+    deadline = time.time() + module.params.get('wait_timeout')
+    index = None
+    blocking = True
+    while True:
+        wait = '%ds' % max(int(deadline - time.time()), 1)
+        if blocking:
+            try:
+                index, node_checks = consul_api.health.node(node, index=index, wait=wait)
+            except TypeError:
+                # python-consul without the wait argument, poll instead
+                blocking = False
+        if not blocking:
+            index, node_checks = consul_api.health.node(node)
+
+        status = dict((c['CheckID'], c['Status']) for c in node_checks if c['CheckID'] in check_ids)
+        if all(status.get(check_id) == 'passing' for check_id in check_ids):
+            return True, status
+        if time.time() >= deadline:
+            return False, status
+        if not blocking:
+            time.sleep(1)
+
+
 def get_consul_api(module, token=None):
     return consul.Consul(host=module.params.get('host'),
                          port=module.params.get('port'),
@@ -345,39 +537,46 @@ def get_service_by_id(consul_api, service_id):
             return ConsulService(loaded=service)
 
 
-def parse_check(module):
+def parse_check(module, params=None):
+    ''' builds a check from the module options or from an item of services
+    or checks '''
+    if params is None:
+        params = module.params
 
-    if len(filter(None, [module.params.get('script'), module.params.get('ttl'), module.params.get('http')])) > 1:
+    if len(filter(None, [params.get('script'), params.get('ttl'), params.get('http')])) > 1:
         module.fail_json(
             msg='check are either script, http or ttl driven, supplying more than one does not make sense')
 
-    if module.params.get('check_id') or module.params.get('script') or module.params.get('ttl') or module.params.get('http'):
+    if params.get('check_id') or params.get('script') or params.get('ttl') or params.get('http'):
 
        return ConsulCheck(
-            module.params.get('check_id'),
-            module.params.get('check_name'),
-            module.params.get('check_node'),
-            module.params.get('check_host'),
-            module.params.get('script'),
-            module.params.get('interval'),
-            module.params.get('ttl'),
-            module.params.get('notes'),
-            module.params.get('http'),
-            module.params.get('timeout')
+            params.get('check_id'),
+            params.get('check_name'),
+            params.get('check_node'),
+            params.get('check_host'),
+            params.get('script'),
+            params.get('interval'),
+            params.get('ttl'),
+            params.get('notes'),
+            params.get('http'),
+            params.get('timeout')
         )
 
 
-def parse_service(module):
+def parse_service(module, params=None):
+    ''' builds a service from the module options or from an item of services '''
+    if params is None:
+        params = module.params
 
-    if module.params.get('service_name') and module.params.get('service_port'):
+    if params.get('service_name') and params.get('service_port'):
         return ConsulService(
-            module.params.get('service_id'),
-            module.params.get('service_name'),
-            module.params.get('service_address'),
-            module.params.get('service_port'),
-            module.params.get('tags'),
+            params.get('service_id'),
+            params.get('service_name'),
+            params.get('service_address'),
+            int(params.get('service_port')),
+            params.get('tags'),
         )
-    elif module.params.get('service_name') and not module.params.get('service_port'):
+    elif params.get('service_name') and not params.get('service_port'):
 
         module.fail_json( msg="service_name supplied but no service_port, a port is required to configure a service. Did you configure the 'port' argument meaning 'service_port'?")
 
@@ -432,7 +631,7 @@ class  ConsulService():
                 and self.id == other.id
                 and self.name == other.name
                 and self.port == other.port
-                and self.tags == other.tags)
+                and (self.tags or []) == (other.tags or []))
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -552,8 +751,18 @@ def main():
             http=dict(required=False, type='str'),
             timeout=dict(required=False, type='str'),
             tags=dict(required=False, type='list'),
-            token=dict(required=False, no_log=True)
+            token=dict(required=False, no_log=True),
+            services=dict(required=False, type='list'),
+            checks=dict(required=False, type='list'),
+            wait_for_passing=dict(required=False, default=False, type='bool'),
+            wait_timeout=dict(required=False, default=60, type='int')
         ),
+        mutually_exclusive=[
+            ['services', 'service_name'],
+            ['services', 'service_id'],
+            ['checks', 'check_id'],
+            ['checks', 'check_name'],
+        ],
         supports_check_mode=False,
     )
 
@@ -51,13 +51,35 @@ options:
         default: present
     key:
         description:
-          - the key at which the value should be stored.
+          - the key at which the value should be stored. When 'values' is
+            given this is the prefix the keys in 'values' are relative to.
         required: true
     value:
         description:
           - the value should be associated with the given key, required if state
             is present
         required: true
+    values:
+        description:
+          - a mapping of keys, relative to 'key', to their values, managed in
+            bulk. Nested mappings are joined into paths, so
+            {app: {db: {host: x}}} sets 'key'/app/db/host. Values are stored as
+            strings.
+          - the existing keys below 'key' are fetched with one recursive
+            request and compared locally. The changes are then written with
+            the transaction endpoint of consul in batches of 64 operations,
+            each guarded by the ModifyIndex the comparison was based on.
+          - with state 'absent' the given keys are removed.
+        required: false
+        default: None
+        version_added: "2.2"
+    purge:
+        description:
+          - with 'values' and state 'present', remove the keys below 'key'
+            which are not in 'values', so the prefix matches 'values' exactly.
+        required: false
+        default: false
+        version_added: "2.2"
     recurse:
         description:
           - if the key represents a prefix, each entry with the prefix can be
@@ -131,6 +153,16 @@ EXAMPLES = '''
       key: ansible/groups/dc1/somenode
       value: 'top_secret'
 
+  - name: sync the configuration of a service, removing keys not listed
+    consul_kv:
+      key: config/web
+      purge: true
+      values:
+        workers: 8
+        db:
+          host: db1.example.com
+          port: 5432
+
   - name: Register a key/value pair with an associated session
     consul_kv:
       key: stg/node/server_birthday
@@ -139,10 +171,17 @@ EXAMPLES = '''
       state: acquire
 '''
 
+import base64
 import sys
 
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
 try:
     import consul
+    from consul.base import ClientError
     from requests.exceptions import ConnectionError
     python_consul_installed = True
 except ImportError, e:
@@ -150,10 +189,18 @@ except ImportError, e:
 
 from requests.exceptions import ConnectionError
 
+# TXN_MAX_OPS is the maximum number of operations consul accepts in one
+# transaction.
+TXN_MAX_OPS = 64
+
 def execute(module):
 
     state = module.params.get('state')
 
+    if module.params.get('values') is not None:
+        if state not in ('present', 'absent'):
+            module.fail_json(msg="'values' can only be used with state present or absent")
+        sync_values(module)
     if state == 'acquire' or state == 'release':
         lock(module, state)
     if state == 'present':
@@ -240,6 +287,128 @@ def remove_value(module):
                      data=existing)
 
 
+def flatten_values(values, prefix=''):
+    ''' join nested mappings of values into a mapping of full keys to string
+     values. '''
+    flat = {}
+    for name, value in values.items():
+        name = str(name).strip('/')
+        path = '%s/%s' % (prefix, name) if prefix else name
+        if isinstance(value, dict):
+            flat.update(flatten_values(value, path))
+        elif value is None:
+            flat[path] = ''
+        else:
+            flat[path] = str(value)
+    return flat
+
+
+def kv_operation(verb, key, index, value=None, flags=None):
+    operation = dict(Verb=verb, Key=key, Index=index)
+    if value is not None:
+        operation['Value'] = base64.b64encode(value)
+    if flags is not None:
+        operation['Flags'] = flags
+    return dict(KV=operation)
+
+
+def apply_operations(module, consul_api, operations):
+    ''' write the operations in transactions of at most TXN_MAX_OPS
+     operations. each transaction is applied completely or not at all. returns
+     the number of requests made. '''
+    if not hasattr(consul_api, 'txn'):
+        # python-consul < 0.7 has no transaction support
+        for operation in operations:
+            op = operation['KV']
+            if op['Verb'] == 'cas':
+                ok = consul_api.kv.put(op['Key'], base64.b64decode(op['Value']),
+                                       cas=op['Index'], flags=op.get('Flags'))
+            else:
+                ok = consul_api.kv.delete(op['Key'], cas=op['Index'])
+            if not ok:
+                module.fail_json(msg='%s changed while it was being updated' % op['Key'])
+        return len(operations)
+
+    sent = 0
+    for start in range(0, len(operations), TXN_MAX_OPS):
+        batch = operations[start:start + TXN_MAX_OPS]
+        sent += 1
+        try:
+            consul_api.txn.put(batch)
+        except ClientError, e:
+            # a rolled back transaction is answered with a 409 whose body
+            # lists the failed operations, python-consul raises it as
+            # "<code> <body>"
+            errors = None
+            try:
+                errors = json.loads(str(e).split(' ', 1)[1]).get('Errors')
+            except (IndexError, ValueError, AttributeError):
+                pass
+            if not errors:
+                module.fail_json(msg='consul transaction %d failed: %s' % (sent, e),
+                                 transactions=sent)
+            module.fail_json(
+                msg='consul transaction %d failed: %s' % (
+                    sent,
+                    '; '.join('%s: %s' % (batch[error['OpIndex']]['KV']['Key'], error['What'])
+                              for error in errors)),
+                transactions=sent)
+    return sent
+
+
+def sync_values(module):
+    ''' bring the keys below the prefix in line with the values parameter
+     with one recursive read and as few transactions as possible. '''
+    consul_api = get_consul_api(module)
+
+    prefix = module.params.get('key').rstrip('/')
+    state = module.params.get('state')
+    flags = module.params.get('flags')
+    if flags is not None:
+        flags = int(flags)
+    wanted = flatten_values(module.params.get('values'), prefix)
+
+    index, existing = consul_api.kv.get(prefix + '/' if prefix else '', recurse=True)
+    current = dict((entry['Key'], entry) for entry in existing or [])
+
+    operations = []
+    added = []
+    updated = []
+    removed = []
+    if state == 'present':
+        for key in sorted(wanted):
+            entry = current.get(key)
+            if entry is None:
+                added.append(key)
+                operations.append(kv_operation('cas', key, 0, wanted[key], flags))
+            elif (entry['Value'] or '') != wanted[key] or \
+                    (flags is not None and entry.get('Flags', 0) != flags):
+                updated.append(key)
+                operations.append(kv_operation('cas', key, entry['ModifyIndex'], wanted[key], flags))
+        if module.params.get('purge'):
+            for key in sorted(current):
+                if key not in wanted:
+                    removed.append(key)
+                    operations.append(kv_operation('delete-cas', key, current[key]['ModifyIndex']))
+    else:
+        for key in sorted(wanted):
+            if key in current:
+                removed.append(key)
+                operations.append(kv_operation('delete-cas', key, current[key]['ModifyIndex']))
+
+    transactions = 0
+    if operations and not module.check_mode:
+        transactions = apply_operations(module, consul_api, operations)
+
+    module.exit_json(changed=len(operations) > 0,
+                     index=index,
+                     key=prefix,
+                     added=added,
+                     updated=updated,
+                     removed=removed,
+                     transactions=transactions)
+
+
 def get_consul_api(module, token=None):
     return consul.Consul(host=module.params.get('host'),
                          port=module.params.get('port'),
@@ -267,10 +436,14 @@ def main():
         state=dict(default='present', choices=['present', 'absent', 'acquire', 'release']),
         token=dict(required=False, default='anonymous', no_log=True),
         value=dict(required=False),
+        values=dict(required=False, type='dict'),
+        purge=dict(required=False, type='bool', default=False),
         session=dict(required=False)
     )
 
-    module = AnsibleModule(argument_spec, supports_check_mode=False)
+    module = AnsibleModule(argument_spec,
+                           mutually_exclusive=[['value', 'values']],
+                           supports_check_mode=True)
 
     test_dependencies(module)
         
@@ -70,6 +70,14 @@ options:
     required: false
     default: false
     choices: [ "false", "true" ]
+  commit_interval:
+    description:
+      - With C(state=import) and autocommit=false, commit after every this many batches instead of only
+        once at the end, so a large import does not run as a single transaction. A failed import then keeps
+        the batches committed before the failure. C(0) commits only at the end.
+    required: false
+    default: 0
+    version_added: "2.2"
 notes:
    - Requires the pymssql Python package on the remote host. For Ubuntu, this
      is as easy as pip install pymssql (See M(pip).)
@@ -85,13 +93,51 @@ EXAMPLES = '''
 # Copy database dump file to remote host and restore it to database 'my_db'
 - copy: src=dump.sql dest=/tmp
 - mssql_db: name=my_db state=import target=/tmp/dump.sql
+# Restore a large dump, committing every 500 batches
+- mssql_db: name=my_db state=import target=/tmp/dump.sql commit_interval=500
 '''
 
 RETURN  = '''
-#
+batches:
+  description: Number of batches imported with C(state=import).
+  returned: when state is import
+  type: int
+  sample: 1520
+executions:
+  description: Number of batch executions, counting the repeats of C(GO n).
+  returned: when state is import
+  type: int
+  sample: 1524
+bytes:
+  description: Bytes of the dump file read.
+  returned: when state is import
+  type: int
+  sample: 104857600
+bytes_per_sec:
+  description: Bytes of the dump file imported per second.
+  returned: when state is import and the import succeeded
+  type: int
+  sample: 2097152
+commits:
+  description: Number of commits made.
+  returned: when state is import
+  type: int
+  sample: 4
+elapsed:
+  description: Seconds the import took.
+  returned: when state is import
+  type: float
+  sample: 50.12
+slowest_batches:
+  description: Starting line and seconds of the ten slowest batches.
+  returned: when state is import and the import succeeded
+  type: list
+  sample: [ { "line": 1204, "seconds": 12.5 } ]
 '''
 
 import os
+import re
+import time
 try:
     import pymssql
 except ImportError:
@@ -119,26 +165,109 @@ def db_delete(conn, cursor, db):
     cursor.execute("DROP DATABASE [%s]" % db)
     return not db_exists(conn, cursor, db)
 
-def db_import(conn, cursor, module, db, target):
+# GO_RE matches a batch separator line, GO with an optional repeat count
+# and an optional trailing comment, the way sqlcmd reads it.
+GO_RE = re.compile(r'^\s*GO(?:\s+(\d+))?\s*(?:--.*)?$', re.IGNORECASE)
+
+# SQL_TOKEN_RE matches the tokens which start or end comments, string
+# literals and quoted identifiers.
+SQL_TOKEN_RE = re.compile(r"/\*|\*/|--|'|\"|\[|\]")
+
+
+def split_batches(lines):
+    ''' split an iterable of script lines into GO delimited batches.
+
+    GO only ends a batch on a line of its own outside of block comments,
+    string literals and quoted identifiers. Yields the batch, its repeat
+    count, the line number it starts at and its size in bytes. '''
+    buf = []
+    size = 0
+    start = 1
+    comment_depth = 0
+    quote = None
+    for number, line in enumerate(lines, 1):
+        if comment_depth == 0 and quote is None:
+            match = GO_RE.match(line)
+            if match:
+                yield ''.join(buf), int(match.group(1) or 1), start, size + len(line)
+                buf = []
+                size = 0
+                start = number + 1
+                continue
+        buf.append(line)
+        size += len(line)
+        skip = -1
+        for match in SQL_TOKEN_RE.finditer(line):
+            token = match.group(0)
+            if match.start() == skip:
+                continue
+            if quote is not None:
+                if token == quote:
+                    # a doubled quote is an escaped quote
+                    if line[match.end():match.end() + 1] == quote:
+                        skip = match.end()
+                    else:
+                        quote = None
+            elif comment_depth > 0:
+                # block comments nest in T-SQL
+                if token == '/*':
+                    comment_depth += 1
+                elif token == '*/':
+                    comment_depth -= 1
+            elif token == '--':
+                break
+            elif token == '/*':
+                comment_depth = 1
+            elif token in ("'", '"'):
+                quote = token
+            elif token == '[':
+                quote = ']'
+    if buf:
+        yield ''.join(buf), 1, start, size
+
+
+def db_import(conn, cursor, module, db, target, commit_interval=0):
     if os.path.isfile(target):
         backup = open(target, 'r')
+        stats = dict(batches=0, executions=0, bytes=0, commits=0)
+        timings = []
+        pending = 0
+        started = time.time()
         try:
-            sqlQuery = "USE [%s]\n" % db
-            for line in backup:
-                if line is None:
-                    break
-                elif line.startswith('GO'):
-                    cursor.execute(sqlQuery)
-                    sqlQuery = "USE [%s]\n" % db
-                else:
-                    sqlQuery += line
-            cursor.execute(sqlQuery)
+            for batch, count, line, size in split_batches(backup):
+                stats['bytes'] += size
+                if not batch.strip():
+                    continue
+                sqlQuery = "USE [%s]\n%s" % (db, batch)
+                batch_started = time.time()
+                for i in range(count):
+                    try:
+                        cursor.execute(sqlQuery)
+                    except Exception as e:
+                        stats['elapsed'] = round(time.time() - started, 3)
+                        return 1, "", "error in batch starting at line %d: %s" % (line, e), stats
+                timings.append((round(time.time() - batch_started, 3), line))
+                stats['batches'] += 1
+                stats['executions'] += count
+                pending += 1
+                if commit_interval and pending >= commit_interval:
+                    conn.commit()
+                    stats['commits'] += 1
+                    pending = 0
+                    module.log(msg="mssql_db import into %s: %d batches, %d bytes, %.0f bytes/s" % (
+                        db, stats['batches'], stats['bytes'], stats['bytes'] / max(time.time() - started, 0.001)))
             conn.commit()
+            stats['commits'] += 1
         finally:
             backup.close()
-        return 0, "import successful", ""
+        elapsed = time.time() - started
+        stats['elapsed'] = round(elapsed, 3)
+        stats['bytes_per_sec'] = int(stats['bytes'] / max(elapsed, 0.001))
+        stats['slowest_batches'] = [dict(line=line, seconds=seconds)
+                                    for seconds, line in sorted(timings, reverse=True)[:10]]
+        return 0, "import successful", "", stats
     else:
-        return 1, "cannot find target file", "cannot find target file"
+        return 1, "cannot find target file", "cannot find target file", {}
 
 
 def main():
@@ -151,6 +280,7 @@ def main():
             login_port=dict(default='1433'),
             target=dict(default=None),
             autocommit=dict(type='bool', default=False),
+            commit_interval=dict(type='int', default=0),
             state=dict(
                 default='present', choices=['present', 'absent', 'import'])
         )
@@ -162,6 +292,7 @@ def main():
     db = module.params['name']
     state = module.params['state']
     autocommit = module.params['autocommit']
+    commit_interval = module.params['commit_interval']
     target = module.params["target"]
 
     login_user = module.params['login_user']
@@ -197,12 +328,12 @@ def main():
                 module.fail_json(msg="error deleting database: " + str(e))
         elif state == "import":
             conn.autocommit(autocommit)
-            rc, stdout, stderr = db_import(conn, cursor, module, db, target)
+            rc, stdout, stderr, stats = db_import(conn, cursor, module, db, target, commit_interval)
 
             if rc != 0:
-                module.fail_json(msg="%s" % stderr)
+                module.fail_json(msg="%s" % stderr, **stats)
             else:
-                module.exit_json(changed=True, db=db, msg=stdout)
+                module.exit_json(changed=True, db=db, msg=stdout, **stats)
     else:
         if state == "present":
             try:
@@ -216,12 +347,12 @@ def main():
                 module.fail_json(msg="error creating database: " + str(e))
 
             conn.autocommit(autocommit)
-            rc, stdout, stderr = db_import(conn, cursor, module, db, target)
+            rc, stdout, stderr, stats = db_import(conn, cursor, module, db, target, commit_interval)
 
             if rc != 0:
-                module.fail_json(msg="%s" % stderr)
+                module.fail_json(msg="%s" % stderr, **stats)
             else:
-                module.exit_json(changed=True, db=db, msg=stdout)
+                module.exit_json(changed=True, db=db, msg=stdout, **stats)
 
     module.exit_json(changed=changed, db=db)
 
@@ -100,6 +100,19 @@ options:
     description:
       - 'This flag indicates that filesystem links, if they exist, should be followed.'
     version_added: "2.1"
+  blocks:
+    required: false
+    default: null
+    description:
+      - A list of blocks to apply to C(dest) in one pass. Each item is a
+        dict with C(marker), C(block), and optionally C(state),
+        C(insertafter) and C(insertbefore), which default to the module's
+        own options. Every item needs its own marker.
+      - The file is read once and rewritten only if at least one block
+        differs from its current content. Insert positions are computed
+        against the original file, not against the result of earlier
+        items.
+    version_added: "2.2"
 """
 
 EXAMPLES = r"""
@@ -144,6 +157,14 @@ EXAMPLES = r"""
       - { name: host1, ip: 10.10.1.10 }
       - { name: host2, ip: 10.10.1.11 }
       - { name: host3, ip: 10.10.1.12 }
+
+- name: Add the same mappings to /etc/hosts in a single pass
+  blockinfile:
+    dest: /etc/hosts
+    blocks:
+      - { marker: "# {mark} ANSIBLE MANAGED BLOCK host1", block: "10.10.1.10 host1" }
+      - { marker: "# {mark} ANSIBLE MANAGED BLOCK host2", block: "10.10.1.11 host2" }
+      - { marker: "# {mark} ANSIBLE MANAGED BLOCK host3", state: absent }
 """
 
 import re
@@ -185,6 +206,187 @@ def check_file_attrs(module, changed, message):
     return message, changed
 
 
+def find_last_line(data, prefix):
+    """Return the (start, end) offsets of the last line starting with prefix."""
+    start = data.rfind('\n' + prefix)
+    if start != -1:
+        start += 1
+    elif data[:len(prefix)] == prefix:
+        start = 0
+    else:
+        return None
+    end = data.find('\n', start)
+    if end == -1:
+        return start, len(data)
+    return start, end + 1
+
+
+def find_last_matches(data, regexes):
+    """Return the (start, end) offsets of the last line matching each regex."""
+    matches = dict()
+    if not regexes:
+        return matches
+    compiled = [(regex, re.compile(regex)) for regex in regexes]
+    start = 0
+    size = len(data)
+    while start < size:
+        end = data.find('\n', start)
+        if end == -1:
+            end = size
+        else:
+            end += 1
+        line = data[start:end].rstrip('\r\n')
+        for regex, insertre in compiled:
+            if insertre.search(line):
+                matches[regex] = (start, end)
+        start = end
+    return matches
+
+
+def plan_blocks(module, data, blocks):
+    """Return the sorted (start, end, replacement) edits applying blocks to data."""
+    params = module.params
+    items = []
+    markers = set()
+    for item in blocks:
+        if not isinstance(item, dict):
+            module.fail_json(msg='each item of blocks must be a dict, got: %s' % item)
+        marker = item.get('marker', params['marker'])
+        if marker in markers:
+            module.fail_json(msg='each item of blocks needs a unique marker, got %s twice' % marker)
+        markers.add(marker)
+        state = item.get('state', params['state'])
+        if state not in ('present', 'absent'):
+            module.fail_json(msg='invalid state %s for marker %s' % (state, marker))
+        insertafter = item.get('insertafter', params['insertafter'])
+        insertbefore = item.get('insertbefore', params['insertbefore'])
+        if 'insertafter' in item and 'insertbefore' not in item:
+            insertbefore = None
+        elif 'insertbefore' in item and 'insertafter' not in item:
+            insertafter = None
+        if insertbefore is None and insertafter is None:
+            insertafter = 'EOF'
+        block = item.get('block', item.get('content', '')) or ''
+        items.append((marker, state == 'present', block, insertafter, insertbefore))
+
+    regexes = set()
+    for marker, present, block, insertafter, insertbefore in items:
+        if insertafter not in (None, 'EOF'):
+            regexes.add(insertafter)
+        elif insertbefore not in (None, 'BOF'):
+            regexes.add(insertbefore)
+    matches = None
+
+    size = len(data)
+    edits = []
+    for index, (marker, present, block, insertafter, insertbefore) in enumerate(items):
+        marker0 = re.sub(r'{mark}', 'BEGIN', marker)
+        marker1 = re.sub(r'{mark}', 'END', marker)
+        if present and block:
+            blocklines = [marker0] + block.splitlines() + [marker1]
+        else:
+            blocklines = []
+
+        line0 = find_last_line(data, marker0)
+        line1 = find_last_line(data, marker1)
+        if line0 is not None and line1 is not None:
+            start = min(line0[0], line1[0])
+            end = max(line0[1], line1[1])
+        elif not blocklines:
+            continue
+        else:
+            if insertafter not in (None, 'EOF') or insertbefore not in (None, 'BOF'):
+                if matches is None:
+                    matches = find_last_matches(data, regexes)
+                if insertafter is not None:
+                    match = matches.get(insertafter)
+                else:
+                    match = matches.get(insertbefore)
+                if match is None:
+                    start = size
+                elif insertafter is not None:
+                    start = match[1]
+                else:
+                    start = match[0]
+            elif insertbefore is not None:
+                start = 0     # insertbefore=BOF
+            else:
+                start = size  # insertafter=EOF
+            end = start
+
+        text = '\n'.join(blocklines)
+        if end == size and not data[size - 1:size] == '\n':
+            # the file has no trailing newline, keep it that way
+            if start > 0 and data[start - 1:start] == '\n':
+                start -= 1
+            if start > 0 and text:
+                text = '\n' + text
+        elif text:
+            text += '\n'
+        edits.append((start, end, index, text))
+
+    edits.sort()
+    for previous, current in zip(edits, edits[1:]):
+        if current[0] < previous[1]:
+            module.fail_json(msg='blocks overlap in %s' % params['dest'])
+    return [(start, end, text) for start, end, index, text in edits]
+
+
+def apply_blocks(data, edits):
+    """Return data with edits applied."""
+    result = []
+    pos = 0
+    for start, end, text in edits:
+        result.append(data[pos:start])
+        result.append(text)
+        pos = end
+    result.append(data[pos:])
+    return ''.join(result)
+
+
+def main_blocks(module, dest, path_exists):
+    params = module.params
+
+    if not path_exists:
+        data = ''
+    else:
+        f = open(dest, 'rb')
+        data = f.read()
+        f.close()
+        if not isinstance(data, str):
+            # python 3 reads bytes, work on text and encode it back on write
+            data = data.decode('utf-8')
+
+    edits = plan_blocks(module, data, params['blocks'])
+    changed = False
+    for start, end, text in edits:
+        if data[start:end] != text:
+            changed = True
+    if not path_exists and not edits:
+        module.exit_json(changed=False, msg="File not present")
+
+    if not changed:
+        msg = ''
+    elif not path_exists:
+        msg = 'File created'
+    else:
+        msg = 'Blocks updated'
+
+    if changed and not module.check_mode:
+        if module.boolean(params['backup']) and path_exists:
+            module.backup_local(dest)
+        contents = apply_blocks(data, edits)
+        if isinstance(contents, type(u'')):
+            contents = contents.encode('utf-8')
+        write_changes(module, contents, dest)
+
+    if module.check_mode and not path_exists:
+        module.exit_json(changed=changed, msg=msg)
+
+    msg, changed = check_file_attrs(module, changed, msg)
+    module.exit_json(changed=changed, msg=msg)
+
+
 def main():
     module = AnsibleModule(
         argument_spec=dict(
@@ -197,6 +399,7 @@ def main():
             create=dict(default=False, type='bool'),
             backup=dict(default=False, type='bool'),
             validate=dict(default=None, type='str'),
+            blocks=dict(default=None, type='list'),
         ),
         mutually_exclusive=[['insertbefore', 'insertafter']],
         add_file_common_args=True,
@@ -217,6 +420,11 @@ def main():
         if not module.boolean(params['create']):
             module.fail_json(rc=257,
                              msg='Destination %s does not exist !' % dest)
+
+    if params['blocks'] is not None:
+        main_blocks(module, dest, path_exists)
+
+    if not path_exists:
         original = None
         lines = []
     else:
@@ -116,18 +116,88 @@ except ImportError:
     HAS_ZABBIX_API = False
 
 
+# ZABBIX_ID_FIELDS maps the Zabbix API objects whose id field is not named
+# after the object to that field.
+ZABBIX_ID_FIELDS = {
+    'hostgroup': 'groupid',
+}
+
+
+class ZabbixIdResolver(object):
+    """
+    Resolve names of Zabbix objects to their ids.
+
+    All the names of one object type are looked up with a single filtered
+    get call, which only returns the id and name of the objects. The ids
+    found, and the names not found, are remembered for the rest of the
+    module run, so later lookups only ask for names not seen yet.
+    """
+
+    def __init__(self, zbx):
+        """
+        :param zbx: the logged in ZabbixAPI instance
+        """
+        self._zapi = zbx
+        self._ids = {}
+
+    def lookup(self, object_type, names, name_field='name'):
+        """
+        Look up objects by their names
+        :param object_type: the API object, e.g. 'host', 'hostgroup' or 'template'
+        :param names: the names to look up
+        :param name_field: the field holding the name, e.g. 'host' for templates
+        :return: dict of each name to its id, None for the names not found
+        """
+        id_field = ZABBIX_ID_FIELDS.get(object_type, object_type + 'id')
+        known = self._ids.setdefault((object_type, name_field), {})
+
+        wanted = []
+        for name in names:
+            if name not in known and name not in wanted:
+                wanted.append(name)
+        if wanted:
+            api = getattr(self._zapi, object_type)
+            for obj in api.get({'output': [id_field, name_field], 'filter': {name_field: wanted}}):
+                known.setdefault(obj[name_field], obj[id_field])
+            for name in wanted:
+                known.setdefault(name, None)
+
+        return dict((name, known[name]) for name in names)
+
+    def resolve(self, object_type, names, name_field='name'):
+        """
+        Look up the ids of objects by their names
+        :param object_type: the API object, e.g. 'host', 'hostgroup' or 'template'
+        :param names: the names to look up
+        :param name_field: the field holding the name, e.g. 'host' for templates
+        :return: the list of ids in the order of names and the list of names
+                 not found
+        """
+        found = self.lookup(object_type, names, name_field=name_field)
+        ids = []
+        missing = []
+        for name in names:
+            if found[name] is None:
+                if name not in missing:
+                    missing.append(name)
+            elif found[name] not in ids:
+                ids.append(found[name])
+        return ids, missing
+
+
 class HostGroup(object):
     def __init__(self, module, zbx):
         self._module = module
         self._zapi = zbx
+        self._resolver = ZabbixIdResolver(zbx)
 
     # create host group(s) if not exists
     def create_host_group(self, group_names):
         try:
             group_add_list = []
+            missing = self._resolver.resolve('hostgroup', group_names)[1]
             for group_name in group_names:
-                result = self._zapi.hostgroup.get({'filter': {'name': group_name}})
-                if not result:
+                if group_name in missing and group_name not in group_add_list:
                     try:
                         if self._module.check_mode:
                             self._module.exit_json(changed=True)
@@ -63,7 +63,22 @@ options:
         description:
             - Name of the host in Zabbix.
             - host_name is the unique identifier used and cannot be updated using this module.
-        required: true
+            - Required unless C(hosts) is given.
+        required: false
+    hosts:
+        description:
+            - List of hosts to create, update or delete at once, instead of C(host_name).
+            - Each item takes C(host_name) and optionally C(host_groups), C(link_templates), C(status), C(state),
+              C(interfaces), C(proxy), C(inventory_mode) and C(force). The options given outside of the list
+              are the defaults of the items.
+            - The existing hosts are fetched with one call and compared locally, and the changes are sent with
+              as few calls as possible, e.g. one C(host.create) for all the new hosts and one C(host.massupdate)
+              for each set of hosts needing the same change.
+            - Unlike with C(host_name), the interfaces of an existing host are left alone when an item has none,
+              and existing hosts are left alone instead of failing when C(force) is C(no).
+        required: false
+        default: None
+        version_added: "2.2"
     host_groups:
         description:
             - List of host groups the host is part of.
@@ -150,11 +165,55 @@ EXAMPLES = '''
         dns: ""
         port: 12345
     proxy: a.zabbix.proxy
+
+- name: Create or update many hosts at once
+  local_action:
+    module: zabbix_host
+    server_url: http://monitor.example.com
+    login_user: username
+    login_password: password
+    host_groups:
+      - Rack 12
+    link_templates:
+      - Template OS Linux
+    hosts:
+      - host_name: node001
+        interfaces:
+          - type: 1
+            main: 1
+            useip: 1
+            ip: 10.12.0.1
+            dns: ""
+            port: 10050
+      - host_name: node002
+        interfaces:
+          - type: 1
+            main: 1
+            useip: 1
+            ip: 10.12.0.2
+            dns: ""
+            port: 10050
+      - host_name: node003
+        state: absent
+  run_once: true
 '''
 
 import logging
 import copy
 
+# INVENTORY_MODES maps the inventory_mode choices to their API values.
+INVENTORY_MODES = {
+    'automatic': 1,
+    'manual': 0,
+    'disabled': -1,
+}
+
+# HOST_ITEM_KEYS lists the keys an item of the hosts option can have.
+HOST_ITEM_KEYS = [
+    'host_name', 'host_groups', 'link_templates', 'status', 'state',
+    'interfaces', 'proxy', 'inventory_mode', 'force',
+]
+
 try:
     from zabbix_api import ZabbixAPI, ZabbixAPISubClass
 
@@ -163,6 +222,75 @@ except ImportError:
     HAS_ZABBIX_API = False
 
 
+# ZABBIX_ID_FIELDS maps the Zabbix API objects whose id field is not named
+# after the object to that field.
+ZABBIX_ID_FIELDS = {
+    'hostgroup': 'groupid',
+}
+
+
+class ZabbixIdResolver(object):
+    """
+    Resolve names of Zabbix objects to their ids.
+
+    All the names of one object type are looked up with a single filtered
+    get call, which only returns the id and name of the objects. The ids
+    found, and the names not found, are remembered for the rest of the
+    module run, so later lookups only ask for names not seen yet.
+    """
+
+    def __init__(self, zbx):
+        """
+        :param zbx: the logged in ZabbixAPI instance
+        """
+        self._zapi = zbx
+        self._ids = {}
+
+    def lookup(self, object_type, names, name_field='name'):
+        """
+        Look up objects by their names
+        :param object_type: the API object, e.g. 'host', 'hostgroup' or 'template'
+        :param names: the names to look up
+        :param name_field: the field holding the name, e.g. 'host' for templates
+        :return: dict of each name to its id, None for the names not found
+        """
+        id_field = ZABBIX_ID_FIELDS.get(object_type, object_type + 'id')
+        known = self._ids.setdefault((object_type, name_field), {})
+
+        wanted = []
+        for name in names:
+            if name not in known and name not in wanted:
+                wanted.append(name)
+        if wanted:
+            api = getattr(self._zapi, object_type)
+            for obj in api.get({'output': [id_field, name_field], 'filter': {name_field: wanted}}):
+                known.setdefault(obj[name_field], obj[id_field])
+            for name in wanted:
+                known.setdefault(name, None)
+
+        return dict((name, known[name]) for name in names)
+
+    def resolve(self, object_type, names, name_field='name'):
+        """
+        Look up the ids of objects by their names
+        :param object_type: the API object, e.g. 'host', 'hostgroup' or 'template'
+        :param names: the names to look up
+        :param name_field: the field holding the name, e.g. 'host' for templates
+        :return: the list of ids in the order of names and the list of names
+                 not found
+        """
+        found = self.lookup(object_type, names, name_field=name_field)
+        ids = []
+        missing = []
+        for name in names:
+            if found[name] is None:
+                if name not in missing:
+                    missing.append(name)
+            elif found[name] not in ids:
+                ids.append(found[name])
+        return ids, missing
+
+
 # Extend the ZabbixAPI
 # Since the zabbix-api python module too old (version 1.0, no higher version so far),
 # it does not support the 'hostinterface' api calls,
@@ -179,6 +307,7 @@ class Host(object):
     def __init__(self, module, zbx):
         self._module = module
         self._zapi = zbx
+        self._resolver = ZabbixIdResolver(zbx)
 
     # exist host
     def is_host_exist(self, host_name):
@@ -187,23 +316,18 @@ class Host(object):
 
     # check if host group exists
     def check_host_group_exist(self, group_names):
-        for group_name in group_names:
-            result = self._zapi.hostgroup.get({'filter': {'name': group_name}})
-            if not result:
-                self._module.fail_json(msg="Hostgroup not found: %s" % group_name)
+        group_ids, missing = self._resolver.resolve('hostgroup', group_names)
+        if missing:
+            self._module.fail_json(msg="Hostgroup not found: %s" % ", ".join(missing))
         return True
 
     def get_template_ids(self, template_list):
         template_ids = []
         if template_list is None or len(template_list) == 0:
             return template_ids
-        for template in template_list:
-            template_list = self._zapi.template.get({'output': 'extend', 'filter': {'host': template}})
-            if len(template_list) < 1:
-                self._module.fail_json(msg="Template not found: %s" % template)
-            else:
-                template_id = template_list[0]['templateid']
-                template_ids.append(template_id)
+        template_ids, missing = self._resolver.resolve('template', template_list, name_field='host')
+        if missing:
+            self._module.fail_json(msg="Template not found: %s" % ", ".join(missing))
         return template_ids
 
     def add_host(self, host_name, group_ids, status, interfaces, proxy_id):
@@ -284,9 +408,7 @@ class Host(object):
     def get_group_ids_by_group_names(self, group_names):
         group_ids = []
         if self.check_host_group_exist(group_names):
-            group_list = self._zapi.hostgroup.get({'output': 'extend', 'filter': {'name': group_names}})
-            for group in group_list:
-                group_id = group['groupid']
+            for group_id in self._resolver.resolve('hostgroup', group_names)[0]:
                 group_ids.append({'groupid': group_id})
         return group_ids
 
@@ -395,12 +517,7 @@ class Host(object):
         if not inventory_mode:
             return
 
-        if inventory_mode == "automatic":
-            inventory_mode = int(1)
-        elif inventory_mode == "manual":
-            inventory_mode = int(0)
-        elif inventory_mode == "disabled":
-            inventory_mode = int(-1)
+        inventory_mode = INVENTORY_MODES[inventory_mode]
 
         # watch for - https://support.zabbix.com/browse/ZBX-6033
         request_str = {'hostid': host_id, 'inventory_mode': inventory_mode}
@@ -411,13 +528,206 @@ class Host(object):
         except Exception, e:
             self._module.fail_json(msg="Failed to set inventory_mode to host: %s" % e)
 
+    # get the existing hosts with their interfaces, groups and templates by host names
+    def get_hosts_by_host_names(self, host_names):
+        host_list = self._zapi.host.get({'output': ['hostid', 'host', 'status', 'proxy_hostid'],
+                                         'filter': {'host': host_names},
+                                         'selectInterfaces': 'extend',
+                                         'selectGroups': ['groupid'],
+                                         'selectParentTemplates': ['templateid']})
+        hosts = {}
+        for exist_host in host_list:
+            hosts[exist_host['host']] = exist_host
+        return hosts
+
+    # resolve names of one object type for all hosts, failing on all the missing names at once
+    def resolve_names(self, object_type, names, label, name_field='name'):
+        found = self._resolver.lookup(object_type, names, name_field=name_field)
+        missing = sorted(set(name for name in names if found[name] is None))
+        if missing:
+            self._module.fail_json(msg="%s not found: %s" % (label, ", ".join(missing)))
+        return found
+
+    # get the interface changes which make the existing interfaces equal the interfaces
+    def diff_interfaces(self, host_id, exist_interface_list, interfaces):
+        interface_list_copy = list(exist_interface_list)
+        create_list = []
+        update_list = []
+        for interface in interfaces:
+            interface_str = dict(interface)
+            for exist_interface in interface_list_copy:
+                if int(interface['type']) == int(exist_interface['type']):
+                    interface_str['interfaceid'] = exist_interface['interfaceid']
+                    update_list.append(interface_str)
+                    interface_list_copy.remove(exist_interface)
+                    break
+            else:
+                interface_str['hostid'] = host_id
+                create_list.append(interface_str)
+        delete_list = [exist_interface['interfaceid'] for exist_interface in interface_list_copy]
+        return create_list, update_list, delete_list
+
+    # create, update or delete many hosts with as few calls as possible
+    def sync_hosts(self, host_items, defaults):
+        items = []
+        for host_item in host_items:
+            if not isinstance(host_item, dict):
+                self._module.fail_json(msg="Every item of hosts must be a dict, got: %s" % host_item)
+            unknown = sorted(key for key in host_item if key not in HOST_ITEM_KEYS)
+            if unknown:
+                self._module.fail_json(msg="Unsupported keys in an item of hosts: %s" % ", ".join(unknown))
+            item = dict(defaults)
+            item.update(host_item)
+            if not item.get('host_name'):
+                self._module.fail_json(msg="Every item of hosts requires a host_name.")
+            host_name = item['host_name']
+            item['force'] = self._module.boolean(item.get('force', True))
+            if item.get('status', 'enabled') not in ('enabled', 'disabled'):
+                self._module.fail_json(msg="Invalid status %s for host %s, expected enabled or disabled." %
+                                           (item['status'], host_name))
+            if item.get('state', 'present') not in ('present', 'absent'):
+                self._module.fail_json(msg="Invalid state %s for host %s, expected present or absent." %
+                                           (item['state'], host_name))
+            if item.get('inventory_mode') and item['inventory_mode'] not in INVENTORY_MODES:
+                self._module.fail_json(msg="Invalid inventory_mode %s for host %s, expected one of: %s." %
+                                           (item['inventory_mode'], host_name, ", ".join(sorted(INVENTORY_MODES))))
+            items.append(item)
+
+        # resolve all names with one call per object type
+        present = [item for item in items if item.get('state', 'present') == 'present']
+        group_names = []
+        template_names = []
+        proxy_names = []
+        for item in present:
+            group_names.extend(item.get('host_groups') or [])
+            template_names.extend(item.get('link_templates') or [])
+            if item.get('proxy'):
+                proxy_names.append(item['proxy'])
+        group_ids = self.resolve_names('hostgroup', group_names, "Hostgroup")
+        template_ids = self.resolve_names('template', template_names, "Template", name_field='host')
+        proxy_ids = self.resolve_names('proxy', proxy_names, "Proxy", name_field='host')
+
+        exist_hosts = self.get_hosts_by_host_names([item['host_name'] for item in items])
+
+        create_list = []
+        create_names = []
+        mass_updates = {}
+        updated_names = []
+        unchanged_names = []
+        delete_ids = []
+        deleted_names = []
+        interface_creates = []
+        interface_updates = []
+        interface_deletes = []
+        inventory_modes = {}
+        for item in items:
+            host_name = item['host_name']
+            exist_host = exist_hosts.get(host_name)
+
+            if item.get('state', 'present') == 'absent':
+                if exist_host and exist_host['hostid'] not in delete_ids:
+                    delete_ids.append(exist_host['hostid'])
+                    deleted_names.append(host_name)
+                elif not exist_host:
+                    unchanged_names.append(host_name)
+                continue
+
+            status = 1 if item.get('status') == "disabled" else 0
+            host_group_ids = sorted(set(group_ids[name] for name in item.get('host_groups') or []))
+            host_template_ids = sorted(set(template_ids[name] for name in item.get('link_templates') or []))
+            proxy_id = proxy_ids.get(item.get('proxy'))
+            interfaces = item.get('interfaces')
+            if not host_group_ids:
+                self._module.fail_json(msg="Specify at least one group for host '%s'." % host_name)
+
+            if not exist_host:
+                if not interfaces:
+                    self._module.fail_json(msg="Specify at least one interface for creating host '%s'." % host_name)
+                parameters = {'host': host_name, 'interfaces': interfaces, 'status': status,
+                              'groups': [{'groupid': group_id} for group_id in host_group_ids],
+                              'templates': [{'templateid': template_id} for template_id in host_template_ids],
+                              'proxy_hostid': proxy_id or 0}
+                create_list.append(parameters)
+                create_names.append(host_name)
+                if item.get('inventory_mode'):
+                    inventory_modes.setdefault(INVENTORY_MODES[item['inventory_mode']], []).append(host_name)
+                continue
+
+            if not item.get('force', True):
+                unchanged_names.append(host_name)
+                continue
+
+            host_id = exist_host['hostid']
+            exist_group_ids = sorted(group['groupid'] for group in exist_host['groups'])
+            exist_template_ids = sorted(template['templateid'] for template in exist_host['parentTemplates'])
+            changed = False
+            if (exist_group_ids != host_group_ids or exist_template_ids != host_template_ids
+                    or int(exist_host['status']) != status
+                    or (proxy_id is not None and exist_host['proxy_hostid'] != proxy_id)):
+                # hosts needing the same change are updated together
+                key = (tuple(host_group_ids), tuple(host_template_ids),
+                       tuple(sorted(set(exist_template_ids) - set(host_template_ids))), status, proxy_id)
+                mass_updates.setdefault(key, []).append(host_id)
+                changed = True
+            # interfaces are left alone when none are given
+            if interfaces and self.check_interface_properties(exist_host['interfaces'], interfaces):
+                creates, updates, deletes = self.diff_interfaces(host_id, exist_host['interfaces'], interfaces)
+                interface_creates.extend(creates)
+                interface_updates.extend(updates)
+                interface_deletes.extend(deletes)
+                changed = True
+            if changed:
+                updated_names.append(host_name)
+                if item.get('inventory_mode'):
+                    inventory_modes.setdefault(INVENTORY_MODES[item['inventory_mode']], []).append(host_name)
+            else:
+                unchanged_names.append(host_name)
+
+        result = dict(changed=bool(create_names or updated_names or deleted_names),
+                      created_hosts=create_names, updated_hosts=updated_names,
+                      deleted_hosts=deleted_names, unchanged_hosts=unchanged_names)
+        if self._module.check_mode:
+            return result
+
+        try:
+            if delete_ids:
+                self._zapi.host.delete(delete_ids)
+            host_ids = {}
+            if create_list:
+                created = self._zapi.host.create(create_list)
+                host_ids = dict(zip(create_names, created['hostids']))
+            for (host_group_ids, host_template_ids, templates_clear, status, proxy_id), ids in mass_updates.items():
+                parameters = {'hosts': [{'hostid': host_id} for host_id in ids], 'status': status,
+                              'groups': [{'groupid': group_id} for group_id in host_group_ids],
+                              'templates': [{'templateid': template_id} for template_id in host_template_ids]}
+                if templates_clear:
+                    parameters['templates_clear'] = [{'templateid': template_id} for template_id in templates_clear]
+                if proxy_id is not None:
+                    parameters['proxy_hostid'] = proxy_id
+                self._zapi.host.massupdate(parameters)
+            if interface_updates:
+                self._zapi.hostinterface.update(interface_updates)
+            if interface_creates:
+                self._zapi.hostinterface.create(interface_creates)
+            if interface_deletes:
+                self._zapi.hostinterface.delete(interface_deletes)
+            for inventory_mode, host_names in inventory_modes.items():
+                ids = [host_ids.get(name) or exist_hosts[name]['hostid'] for name in host_names]
+                # watch for - https://support.zabbix.com/browse/ZBX-6033
+                self._zapi.host.massupdate({'hosts': [{'hostid': host_id} for host_id in ids],
+                                            'inventory_mode': inventory_mode})
+        except Exception, e:
+            self._module.fail_json(msg="Failed to update hosts: %s" % e, **result)
+        return result
+
 def main():
     module = AnsibleModule(
         argument_spec=dict(
             server_url=dict(type='str', required=True, aliases=['url']),
             login_user=dict(rtype='str', equired=True),
             login_password=dict(type='str', required=True, no_log=True),
-            host_name=dict(type='str', required=True),
+            host_name=dict(type='str', required=False),
+            hosts=dict(type='list', required=False),
             http_login_user=dict(type='str', required=False, default=None),
             http_login_password=dict(type='str', required=False, default=None, no_log=True),
             host_groups=dict(type='list', required=False),
@@ -430,6 +740,8 @@ def main():
             force=dict(type='bool', default=True),
             proxy=dict(type='str', required=False)
         ),
+        required_one_of=[['host_name', 'hosts']],
+        mutually_exclusive=[['host_name', 'hosts']],
         supports_check_mode=True
     )
 
@@ -465,6 +777,12 @@ def main():
 
     host = Host(module, zbx)
 
+    if module.params['hosts']:
+        defaults = dict(host_groups=host_groups, link_templates=link_templates, status=module.params['status'],
+                        state=state, interfaces=interfaces, proxy=proxy, inventory_mode=inventory_mode,
+                        force=force)
+        module.exit_json(**host.sync_hosts(module.params['hosts'], defaults))
+
     template_ids = []
     if link_templates:
         template_ids = host.get_template_ids(link_templates)
@@ -168,6 +168,75 @@ except ImportError:
     HAS_ZABBIX_API = False
 
 
+# ZABBIX_ID_FIELDS maps the Zabbix API objects whose id field is not named
+# after the object to that field.
+ZABBIX_ID_FIELDS = {
+    'hostgroup': 'groupid',
+}
+
+
+class ZabbixIdResolver(object):
+    """
+    Resolve names of Zabbix objects to their ids.
+
+    All the names of one object type are looked up with a single filtered
+    get call, which only returns the id and name of the objects. The ids
+    found, and the names not found, are remembered for the rest of the
+    module run, so later lookups only ask for names not seen yet.
+    """
+
+    def __init__(self, zbx):
+        """
+        :param zbx: the logged in ZabbixAPI instance
+        """
+        self._zapi = zbx
+        self._ids = {}
+
+    def lookup(self, object_type, names, name_field='name'):
+        """
+        Look up objects by their names
+        :param object_type: the API object, e.g. 'host', 'hostgroup' or 'template'
+        :param names: the names to look up
+        :param name_field: the field holding the name, e.g. 'host' for templates
+        :return: dict of each name to its id, None for the names not found
+        """
+        id_field = ZABBIX_ID_FIELDS.get(object_type, object_type + 'id')
+        known = self._ids.setdefault((object_type, name_field), {})
+
+        wanted = []
+        for name in names:
+            if name not in known and name not in wanted:
+                wanted.append(name)
+        if wanted:
+            api = getattr(self._zapi, object_type)
+            for obj in api.get({'output': [id_field, name_field], 'filter': {name_field: wanted}}):
+                known.setdefault(obj[name_field], obj[id_field])
+            for name in wanted:
+                known.setdefault(name, None)
+
+        return dict((name, known[name]) for name in names)
+
+    def resolve(self, object_type, names, name_field='name'):
+        """
+        Look up the ids of objects by their names
+        :param object_type: the API object, e.g. 'host', 'hostgroup' or 'template'
+        :param names: the names to look up
+        :param name_field: the field holding the name, e.g. 'host' for templates
+        :return: the list of ids in the order of names and the list of names
+                 not found
+        """
+        found = self.lookup(object_type, names, name_field=name_field)
+        ids = []
+        missing = []
+        for name in names:
+            if found[name] is None:
+                if name not in missing:
+                    missing.append(name)
+            elif found[name] not in ids:
+                ids.append(found[name])
+        return ids, missing
+
+
 def create_maintenance(zbx, group_ids, host_ids, start_time, maintenance_type, period, name, desc):
     end_time = start_time + period
     try:
@@ -220,50 +289,26 @@ def delete_maintenance(zbx, maintenance_id):
     return 0, None, None
 
 
-def get_group_ids(zbx, host_groups):
-    group_ids = []
-    for group in host_groups:
-        try:
-            result = zbx.hostgroup.get(
-                {
-                    "output": "extend",
-                    "filter":
-                    {
-                        "name": group
-                    }
-                }
-            )
-        except BaseException as e:
-            return 1, None, str(e)
-
-        if not result:
-            return 1, None, "Group id for group %s not found" % group
+def get_group_ids(resolver, host_groups):
+    try:
+        group_ids, missing = resolver.resolve('hostgroup', host_groups)
+    except BaseException as e:
+        return 1, None, str(e)
 
-        group_ids.append(result[0]["groupid"])
+    if missing:
+        return 1, None, "Group id for group %s not found" % ", ".join(missing)
 
     return 0, group_ids, None
 
 
-def get_host_ids(zbx, host_names):
-    host_ids = []
-    for host in host_names:
-        try:
-            result = zbx.host.get(
-                {
-                    "output": "extend",
-                    "filter":
-                    {
-                        "name": host
-                    }
-                }
-            )
-        except BaseException as e:
-            return 1, None, str(e)
-
-        if not result:
-            return 1, None, "Host id for host %s not found" % host
+def get_host_ids(resolver, host_names):
+    try:
+        host_ids, missing = resolver.resolve('host', host_names)
+    except BaseException as e:
+        return 1, None, str(e)
 
-        host_ids.append(result[0]["hostid"])
+    if missing:
+        return 1, None, "Host id for host %s not found" % ", ".join(missing)
 
     return 0, host_ids, None
 
@@ -316,6 +361,7 @@ def main():
     except BaseException as e:
         module.fail_json(msg="Failed to connect to Zabbix server: %s" % e)
 
+    resolver = ZabbixIdResolver(zbx)
     changed = False
 
     if state == "present":
@@ -325,14 +371,14 @@ def main():
         period = 60 * int(minutes)  # N * 60 seconds
 
         if host_groups:
-            (rc, group_ids, error) = get_group_ids(zbx, host_groups)
+            (rc, group_ids, error) = get_group_ids(resolver, host_groups)
             if rc != 0:
                 module.fail_json(msg="Failed to get group_ids: %s" % error)
         else:
             group_ids = []
 
         if host_names:
-            (rc, host_ids, error) = get_host_ids(zbx, host_names)
+            (rc, host_ids, error) = get_host_ids(resolver, host_names)
             if rc != 0:
                 module.fail_json(msg="Failed to get host_ids: %s" % error)
         else:
@@ -163,6 +163,7 @@ class Screen(object):
     def __init__(self, module, zbx):
         self._module = module
         self._zapi = zbx
+        self._graph_grids = {}
 
     # get group id by group name
     def get_host_group_id(self, group_name):
@@ -188,18 +189,24 @@ class Screen(object):
             return host_ids
 
     # get screen
-    def get_screen_id(self, screen_name):
+    def get_screen(self, screen_name):
         if screen_name == "":
             self._module.fail_json(msg="screen_name is required")
         try:
             screen_id_list = self._zapi.screen.get({'output': 'extend', 'search': {"name": screen_name}})
             if len(screen_id_list) >= 1:
-                screen_id = screen_id_list[0]['screenid']
-                return screen_id
+                return screen_id_list[0]
             return None
         except Exception as e:
             self._module.fail_json(msg="Failed to get screen %s from Zabbix: %s" % (screen_name, e))
 
+    # get screen id
+    def get_screen_id(self, screen_name):
+        screen = self.get_screen(screen_name)
+        if screen:
+            return screen['screenid']
+        return None
+
     # create screen
     def create_screen(self, screen_name, h_size, v_size):
         try:
@@ -228,12 +235,36 @@ class Screen(object):
         except Exception as e:
             self._module.fail_json(msg="Failed to delete screen %s: %s" % (screen_name, e))
 
+    # get the graph ids of every host, keyed by host id
+    def get_graph_grid(self, hosts, graph_name_list):
+        key = (tuple(hosts), tuple(graph_name_list))
+        if key not in self._graph_grids:
+            # one call for the graphs of all hosts, matched to the graph names
+            # like the case insensitive substring search of the API does
+            graphs_list = self._zapi.graph.get({'output': ['graphid', 'name'], 'hostids': hosts,
+                                                'selectHosts': ['hostid']})
+            graphs_by_host = {}
+            for graph in graphs_list:
+                for graph_host in graph['hosts']:
+                    graphs_by_host.setdefault(graph_host['hostid'], []).append(graph)
+            grid = {}
+            for host in hosts:
+                graph_ids = []
+                for graph_name in graph_name_list:
+                    for graph in graphs_by_host.get(host, []):
+                        if graph_name.lower() in graph['name'].lower():
+                            graph_ids.append(graph['graphid'])
+                grid[host] = graph_ids
+            self._graph_grids[key] = grid
+        return self._graph_grids[key]
+
     # get graph ids
     def get_graph_ids(self, hosts, graph_name_list):
         graph_id_lists = []
         vsize = 1
+        grid = self.get_graph_grid(hosts, graph_name_list)
         for host in hosts:
-            graph_id_list = self.get_graphs_by_host_id(graph_name_list, host)
+            graph_id_list = grid[host]
             size = len(graph_id_list)
             if size > 0:
                 graph_id_lists.extend(graph_id_list)
@@ -241,20 +272,6 @@ class Screen(object):
                     vsize = size
         return graph_id_lists, vsize
 
-    #  getGraphs
-    def get_graphs_by_host_id(self, graph_name_list, host_id):
-        graph_ids = []
-        for graph_name in graph_name_list:
-            graphs_list = self._zapi.graph.get({'output': 'extend', 'search': {'name': graph_name}, 'hostids': host_id})
-            graph_id_list = []
-            if len(graphs_list) > 0:
-                for graph in graphs_list:
-                    graph_id = graph['graphid']
-                    graph_id_list.append(graph_id)
-            if len(graph_id_list) > 0:
-                graph_ids.extend(graph_id_list)
-        return graph_ids
-
     # get screen items
     def get_screen_items(self, screen_id):
         screen_item_list = self._zapi.screenitem.get({'output': 'extend', 'screenids': screen_id})
@@ -265,13 +282,10 @@ class Screen(object):
         try:
             if len(screen_item_id_list) == 0:
                 return True
-            screen_item_list = self.get_screen_items(screen_id)
-            if len(screen_item_list) > 0:
-                if self._module.check_mode:
-                    self._module.exit_json(changed=True)
-                self._zapi.screenitem.delete(screen_item_id_list)
-                return True
-            return False
+            if self._module.check_mode:
+                self._module.exit_json(changed=True)
+            self._zapi.screenitem.delete(screen_item_id_list)
+            return True
         except ZabbixAPIException:
             pass
 
@@ -288,8 +302,12 @@ class Screen(object):
             v_size = (v_size - 1) / h_size + 1
         return h_size, v_size
 
-    # create screen_items
-    def create_screen_items(self, screen_id, hosts, graph_name_list, width, height, h_size):
+    # get the screen items of the graphs, keyed by their (x, y) cell
+    def get_screen_item_layout(self, hosts, graph_name_list, width, height, h_size):
+        if width is not None:
+            width = int(width)
+        if height is not None:
+            height = int(height)
         if len(hosts) < 4:
             if width is None or width < 0:
                 width = 500
@@ -299,30 +317,72 @@ class Screen(object):
         if height is None or height < 0:
             height = 100
 
+        grid = self.get_graph_grid(hosts, graph_name_list)
+        layout = {}
+        # when there're only one host, only one row is not good.
+        if len(hosts) == 1:
+            for i, graph_id in enumerate(grid[hosts[0]]):
+                layout[(i % h_size, i / h_size)] = {'resourceid': graph_id, 'width': width, 'height': height}
+        else:
+            for i, host in enumerate(hosts):
+                for j, graph_id in enumerate(grid[host]):
+                    layout[(i, j)] = {'resourceid': graph_id, 'width': width, 'height': height}
+        return layout
+
+    # create screen_items
+    def create_screen_items(self, screen_id, layout):
+        screen_items = []
+        for (x, y), item in sorted(layout.items()):
+            screen_items.append({'screenid': screen_id, 'resourcetype': 0, 'resourceid': item['resourceid'],
+                                 'width': item['width'], 'height': item['height'],
+                                 'x': x, 'y': y, 'colspan': 1, 'rowspan': 1,
+                                 'elements': 0, 'valign': 0, 'halign': 0,
+                                 'style': 0, 'dynamic': 0, 'sort_triggers': 0})
+        if not screen_items:
+            return
         try:
-            # when there're only one host, only one row is not good.
-            if len(hosts) == 1:
-                graph_id_list = self.get_graphs_by_host_id(graph_name_list, hosts[0])
-                for i, graph_id in enumerate(graph_id_list):
-                    if graph_id is not None:
-                        self._zapi.screenitem.create({'screenid': screen_id, 'resourcetype': 0, 'resourceid': graph_id,
-                                                      'width': width, 'height': height,
-                                                      'x': i % h_size, 'y': i / h_size, 'colspan': 1, 'rowspan': 1,
-                                                      'elements': 0, 'valign': 0, 'halign': 0,
-                                                      'style': 0, 'dynamic': 0, 'sort_triggers': 0})
-            else:
-                for i, host in enumerate(hosts):
-                    graph_id_list = self.get_graphs_by_host_id(graph_name_list, host)
-                    for j, graph_id in enumerate(graph_id_list):
-                        if graph_id is not None:
-                            self._zapi.screenitem.create({'screenid': screen_id, 'resourcetype': 0, 'resourceid': graph_id,
-                                                          'width': width, 'height': height,
-                                                          'x': i, 'y': j, 'colspan': 1, 'rowspan': 1,
-                                                          'elements': 0, 'valign': 0, 'halign': 0,
-                                                          'style': 0, 'dynamic': 0, 'sort_triggers': 0})
+            self._zapi.screenitem.create(screen_items)
         except Already_Exists:
             pass
 
+    # update the screen and its items to the layout, only touching the cells which differ
+    def update_screen_items(self, screen, screen_name, layout, h_size, v_size):
+        screen_id = screen['screenid']
+        delete_ids = []
+        updates = []
+        existing_cells = set()
+        for screen_item in self.get_screen_items(screen_id):
+            cell = (int(screen_item['x']), int(screen_item['y']))
+            item = layout.get(cell)
+            if item is None or cell in existing_cells or int(screen_item['resourcetype']) != 0:
+                delete_ids.append(screen_item['screenitemid'])
+                continue
+            existing_cells.add(cell)
+            if (str(screen_item['resourceid']) != str(item['resourceid'])
+                    or int(screen_item['width']) != item['width']
+                    or int(screen_item['height']) != item['height']):
+                updates.append({'screenitemid': screen_item['screenitemid'], 'resourceid': item['resourceid'],
+                                'width': item['width'], 'height': item['height']})
+        new_layout = dict((cell, item) for cell, item in layout.items() if cell not in existing_cells)
+        resize = int(screen['hsize']) != h_size or int(screen['vsize']) != v_size
+
+        if not (delete_ids or updates or new_layout or resize):
+            return False
+        if self._module.check_mode:
+            self._module.exit_json(changed=True)
+
+        # free the cells first, so the screen can shrink
+        self.delete_screen_items(screen_id, delete_ids)
+        if resize:
+            self.update_screen(screen_id, screen_name, h_size, v_size)
+        try:
+            if updates:
+                self._zapi.screenitem.update(updates)
+        except Exception as e:
+            self._module.fail_json(msg="Failed to update items of screen %s: %s" % (screen_name, e))
+        self.create_screen_items(screen_id, new_layout)
+        return True
+
 
 def main():
     module = AnsibleModule(
@@ -364,7 +424,8 @@ def main():
 
     for zabbix_screen in screens:
         screen_name = zabbix_screen['screen_name']
-        screen_id = screen.get_screen_id(screen_name)
+        existing_screen = screen.get_screen(screen_name)
+        screen_id = existing_screen['screenid'] if existing_screen else None
         state = "absent" if "state" in zabbix_screen and zabbix_screen['state'] == "absent" else "present"
 
         if state == "absent":
@@ -390,33 +451,19 @@ def main():
             host_group_id = screen.get_host_group_id(host_group)
             hosts = screen.get_host_ids_by_group_id(host_group_id)
 
-            screen_item_id_list = []
-            resource_id_list = []
-
             graph_ids, v_size = screen.get_graph_ids(hosts, graph_names)
             h_size, v_size = screen.get_hsize_vsize(hosts, v_size)
+            layout = screen.get_screen_item_layout(hosts, graph_names, graph_width, graph_height, h_size)
 
             if not screen_id:
                 # create screen
                 screen_id = screen.create_screen(screen_name, h_size, v_size)
-                screen.create_screen_items(screen_id, hosts, graph_names, graph_width, graph_height, h_size)
+                screen.create_screen_items(screen_id, layout)
                 created_screens.append(screen_name)
             else:
-                screen_item_list = screen.get_screen_items(screen_id)
-
-                for screen_item in screen_item_list:
-                    screen_item_id = screen_item['screenitemid']
-                    resource_id = screen_item['resourceid']
-                    screen_item_id_list.append(screen_item_id)
-                    resource_id_list.append(resource_id)
-
                 # when the screen items changed, then update
-                if graph_ids != resource_id_list:
-                    deleted = screen.delete_screen_items(screen_id, screen_item_id_list)
-                    if deleted:
-                        screen.update_screen(screen_id, screen_name, h_size, v_size)
-                        screen.create_screen_items(screen_id, hosts, graph_names, graph_width, graph_height, h_size)
-                        changed_screens.append(screen_name)
+                if screen.update_screen_items(existing_screen, screen_name, layout, h_size, v_size):
+                    changed_screens.append(screen_name)
 
     if created_screens and changed_screens:
         module.exit_json(changed=True, result="Successfully created screen(s): %s, and updated screen(s): %s" % (",".join(created_screens), ",".join(changed_screens)))
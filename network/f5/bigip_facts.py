@@ -115,6 +115,34 @@ options:
     default: null
     choices: []
     aliases: []
+  workers:
+    description:
+      - Number of fact categories to collect concurrently. Each worker
+        opens its own iControl session, so values above 1 always use
+        session support regardless of the C(session) option. Collection
+        time per category is returned in the C(collection_time) fact.
+    required: false
+    default: 1
+    version_added: "2.2"
+  cache_dir:
+    description:
+      - Directory in which collected fact categories are cached between
+        runs. Entries are keyed by user, server, port, filter and category and
+        are reused until C(cache_ttl) expires or the time of the last
+        configuration change of the device (its Configsync.LocalConfigTime
+        database variable) differs from the one recorded with the entry.
+        On devices where that variable can not be read, entries are reused
+        until C(cache_ttl) expires, even if the configuration changed.
+        Caching is disabled when not set.
+    required: false
+    default: null
+    version_added: "2.2"
+  cache_ttl:
+    description:
+      - Maximum age in seconds of a cached fact category.
+    required: false
+    default: 300
+    version_added: "2.2"
 '''
 
 EXAMPLES = '''
@@ -125,6 +153,25 @@ EXAMPLES = '''
       password: "secret"
       include: "interface,vlan"
   delegate_to: localhost
+
+- name: Collect large BIG-IP fact categories concurrently
+  bigip_facts:
+      server: "lb.mydomain.com"
+      user: "admin"
+      password: "secret"
+      include: "virtual_server,pool,node"
+      workers: 3
+  delegate_to: localhost
+
+- name: Collect BIG-IP facts, reusing categories unchanged since the last run
+  bigip_facts:
+      server: "lb.mydomain.com"
+      user: "admin"
+      password: "secret"
+      include: "virtual_server,pool"
+      cache_dir: "/var/cache/bigip_facts"
+      cache_ttl: 600
+  delegate_to: localhost
 '''
 
 try:
@@ -135,8 +182,15 @@ else:
     bigsuds_found = True
 
 import fnmatch
+import hashlib
+import json
+import os
 import re
+import tempfile
+import threading
+import time
 import traceback
+from multiprocessing.pool import ThreadPool
 
 
 class F5(object):
@@ -177,6 +231,17 @@ class F5(object):
     def get_active_folder(self):
         return self.api.System.Session.get_active_folder()
 
+    def get_change_token(self):
+        # Configsync.LocalConfigTime is updated by the device on every
+        # change of its local configuration.
+        try:
+            variables = self.api.Management.DBVariable.query(variables=['Configsync.LocalConfigTime'])
+        except (MethodNotFound, WebFault):
+            return None
+        if not variables:
+            return None
+        return variables[0]['value']
+
 
 class Interfaces(object):
     """Interfaces class.
@@ -1607,6 +1672,173 @@ def generate_software_list(f5):
     return software_list
 
 
+def generate_software_facts(f5, regex):
+    return generate_software_list(f5)
+
+
+def generate_system_info_facts(f5, regex):
+    return generate_system_info_dict(f5)
+
+
+FACT_GENERATORS = {
+    'address_class': generate_address_class_dict,
+    'certificate': generate_certificate_dict,
+    'client_ssl_profile': generate_client_ssl_profile_dict,
+    'device': generate_device_dict,
+    'device_group': generate_device_group_dict,
+    'interface': generate_interface_dict,
+    'key': generate_key_dict,
+    'node': generate_node_dict,
+    'pool': generate_pool_dict,
+    'rule': generate_rule_dict,
+    'self_ip': generate_self_ip_dict,
+    'software': generate_software_facts,
+    'system_info': generate_system_info_facts,
+    'traffic_group': generate_traffic_group_dict,
+    'trunk': generate_trunk_dict,
+    'virtual_address': generate_virtual_address_dict,
+    'virtual_server': generate_vs_dict,
+    'vlan': generate_vlan_dict,
+}
+
+
+class FactCache(object):
+    """Fact cache class.
+
+    On-disk cache of collected fact categories. Each category is stored
+    in its own file together with the time it was collected and the
+    device change token that was current at that time.
+
+    Attributes:
+        path: Directory holding the cache files.
+        ttl: Maximum age of an entry in seconds.
+        device: Identifier of the device the entries belong to.
+    """
+
+    def __init__(self, path, ttl, device):
+        self.path = path
+        self.ttl = ttl
+        self.device = device
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def get_filename(self, category, regex):
+        key = "%s|/|%s|%s" % (self.device, regex or '', category)
+        return os.path.join(self.path, "bigip_facts_%s.json" % hashlib.sha1(key).hexdigest())
+
+    def get(self, category, regex, token):
+        try:
+            f = open(self.get_filename(category, regex))
+            try:
+                entry = json.load(f)
+            finally:
+                f.close()
+        except (IOError, ValueError):
+            return None
+        if time.time() - entry.get('timestamp', 0) > self.ttl:
+            return None
+        if entry.get('token') != token:
+            return None
+        return entry.get('facts')
+
+    def set(self, category, regex, token, facts):
+        entry = dict(timestamp=time.time(), token=token, facts=facts)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path)
+        try:
+            f = os.fdopen(fd, 'w')
+            try:
+                json.dump(entry, f)
+            finally:
+                f.close()
+            os.rename(tmp_path, self.get_filename(category, regex))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class FactCollector(object):
+    """Fact collector class.
+
+    Collects fact categories over one iControl connection, or
+    concurrently over a pool of worker threads that each hold their own
+    iControl session, and records the time spent on each category.
+
+    Attributes:
+        connect: Callable returning a new F5 instance.
+        workers: Number of categories collected concurrently.
+        cache: Optional FactCache consulted before collecting.
+        timing: Seconds spent collecting each category.
+    """
+
+    def __init__(self, connect, workers=1, cache=None):
+        self.connect = connect
+        self.workers = workers
+        self.cache = cache
+        self.timing = {}
+        self.sessions = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def get_f5(self):
+        f5 = getattr(self.local, 'f5', None)
+        if f5 is None:
+            f5 = self.connect()
+            saved_active_folder = f5.get_active_folder()
+            saved_recursive_query_state = f5.get_recursive_query_state()
+            if saved_active_folder != "/":
+                f5.set_active_folder("/")
+            if saved_recursive_query_state != "STATE_ENABLED":
+                f5.enable_recursive_query_state()
+            with self.lock:
+                self.sessions.append((f5, saved_active_folder,
+                                      saved_recursive_query_state))
+            self.local.f5 = f5
+        return f5
+
+    def collect_category(self, category, regex):
+        f5 = self.get_f5()
+        start = time.time()
+        facts = FACT_GENERATORS[category](f5, regex)
+        return category, facts, time.time() - start
+
+    def collect(self, include, regex):
+        facts = {}
+        token = None
+        if self.cache:
+            token = self.get_f5().get_change_token()
+            for category in include:
+                cached = self.cache.get(category, regex, token)
+                if cached is not None:
+                    facts[category] = cached
+            include = [x for x in include if x not in facts]
+
+        if self.workers > 1 and len(include) > 1:
+            pool = ThreadPool(min(self.workers, len(include)))
+            try:
+                results = pool.map(lambda x: self.collect_category(x, regex), include)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [self.collect_category(x, regex) for x in include]
+
+        for category, category_facts, elapsed in results:
+            facts[category] = category_facts
+            self.timing[category] = round(elapsed, 3)
+            if self.cache:
+                self.cache.set(category, regex, token, category_facts)
+        return facts
+
+    def restore(self):
+        for f5, saved_active_folder, saved_recursive_query_state in self.sessions:
+            if saved_active_folder and saved_active_folder != "/":
+                f5.set_active_folder(saved_active_folder)
+            if saved_recursive_query_state and \
+               saved_recursive_query_state != "STATE_ENABLED":
+                f5.set_recursive_query_state(saved_recursive_query_state)
+
+
 def main():
     argument_spec = f5_argument_spec()
 
@@ -1614,6 +1846,9 @@ def main():
         session=dict(type='bool', default=False),
         include=dict(type='list', required=True),
         filter=dict(type='str', required=False),
+        workers=dict(type='int', default=1),
+        cache_dir=dict(type='path', required=False),
+        cache_ttl=dict(type='int', default=300),
     )
     argument_spec.update(meta_args)
 
@@ -1631,12 +1866,18 @@ def main():
     validate_certs = module.params['validate_certs']
     session = module.params['session']
     fact_filter = module.params['filter']
+    workers = module.params['workers']
+    cache_dir = module.params['cache_dir']
+    cache_ttl = module.params['cache_ttl']
 
     if validate_certs:
         import ssl
         if not hasattr(ssl, 'SSLContext'):
             module.fail_json(msg='bigsuds does not support verifying certificates with python < 2.7.9.  Either update python or set validate_certs=False on the task')
 
+    if workers < 1:
+        module.fail_json(msg="workers must be 1 or greater, got: %s" % workers)
+
     if fact_filter:
         regex = fnmatch.translate(fact_filter)
     else:
@@ -1650,62 +1891,25 @@ def main():
     include_test = map(lambda x: x in valid_includes, include)
     if not all(include_test):
         module.fail_json(msg="value of include must be one or more of: %s, got: %s" % (",".join(valid_includes), ",".join(include)))
+    include = [x for i, x in enumerate(include) if x not in include[:i]]
+
+    if workers > 1:
+        session = True
+
+    def connect():
+        return F5(server, user, password, session, validate_certs, server_port)
 
     try:
         facts = {}
 
         if len(include) > 0:
-            f5 = F5(server, user, password, session, validate_certs, server_port)
-            saved_active_folder = f5.get_active_folder()
-            saved_recursive_query_state = f5.get_recursive_query_state()
-            if saved_active_folder != "/":
-                f5.set_active_folder("/")
-            if saved_recursive_query_state != "STATE_ENABLED":
-                f5.enable_recursive_query_state()
-
-            if 'interface' in include:
-                facts['interface'] = generate_interface_dict(f5, regex)
-            if 'self_ip' in include:
-                facts['self_ip'] = generate_self_ip_dict(f5, regex)
-            if 'trunk' in include:
-                facts['trunk'] = generate_trunk_dict(f5, regex)
-            if 'vlan' in include:
-                facts['vlan'] = generate_vlan_dict(f5, regex)
-            if 'virtual_server' in include:
-                facts['virtual_server'] = generate_vs_dict(f5, regex)
-            if 'pool' in include:
-                facts['pool'] = generate_pool_dict(f5, regex)
-            if 'device' in include:
-                facts['device'] = generate_device_dict(f5, regex)
-            if 'device_group' in include:
-                facts['device_group'] = generate_device_group_dict(f5, regex)
-            if 'traffic_group' in include:
-                facts['traffic_group'] = generate_traffic_group_dict(f5, regex)
-            if 'rule' in include:
-                facts['rule'] = generate_rule_dict(f5, regex)
-            if 'node' in include:
-                facts['node'] = generate_node_dict(f5, regex)
-            if 'virtual_address' in include:
-                facts['virtual_address'] = generate_virtual_address_dict(f5, regex)
-            if 'address_class' in include:
-                facts['address_class'] = generate_address_class_dict(f5, regex)
-            if 'software' in include:
-                facts['software'] = generate_software_list(f5)
-            if 'certificate' in include:
-                facts['certificate'] = generate_certificate_dict(f5, regex)
-            if 'key' in include:
-                facts['key'] = generate_key_dict(f5, regex)
-            if 'client_ssl_profile' in include:
-                facts['client_ssl_profile'] = generate_client_ssl_profile_dict(f5, regex)
-            if 'system_info' in include:
-                facts['system_info'] = generate_system_info_dict(f5)
-
-            # restore saved state
-            if saved_active_folder and saved_active_folder != "/":
-                f5.set_active_folder(saved_active_folder)
-            if saved_recursive_query_state and \
-               saved_recursive_query_state != "STATE_ENABLED":
-                f5.set_recursive_query_state(saved_recursive_query_state)
+            cache = None
+            if cache_dir:
+                cache = FactCache(cache_dir, cache_ttl, "%s@%s:%s" % (user, server, server_port))
+            collector = FactCollector(connect, workers, cache)
+            facts = collector.collect(include, regex)
+            collector.restore()
+            facts['collection_time'] = collector.timing
 
         result = {'ansible_facts': facts}
 
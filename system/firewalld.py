@@ -86,6 +86,30 @@ options:
     required: false
     default: null
     version_added: "2.1"
+  ports:
+    description:
+      - "List of ports or port ranges in the form PORT/PROTOCOL to add/remove to/from the zone in one operation. Permanent changes for C(ports), C(services), C(sources) and C(rich_rules) are computed against a single snapshot of the zone settings and written back with one update; runtime changes are only made for the items that differ."
+    required: false
+    default: null
+    version_added: "2.2"
+  services:
+    description:
+      - "List of services to add/remove to/from the zone in one operation, see C(ports)."
+    required: false
+    default: null
+    version_added: "2.2"
+  sources:
+    description:
+      - "List of sources to add/remove to/from the zone in one operation, see C(ports). Like C(source), sources are always changed in the permanent configuration."
+    required: false
+    default: null
+    version_added: "2.2"
+  rich_rules:
+    description:
+      - "List of rich rules to add/remove to/from the zone in one operation, see C(ports)."
+    required: false
+    default: null
+    version_added: "2.2"
 notes:
   - Not tested on any Debian based system.
   - Requires the python2 bindings of firewalld, which may not be installed by default if the distribution switched to python 3 
@@ -102,6 +126,14 @@ EXAMPLES = '''
 - firewalld: source='192.168.1.0/24' zone=internal state=enabled
 - firewalld: zone=trusted interface=eth2 permanent=true state=enabled
 - firewalld: masquerade=yes state=enabled permanent=true zone=dmz
+- firewalld:
+    zone: internal
+    ports: [ "8080/tcp", "8443/tcp", "161-162/udp" ]
+    services: [ "http", "https" ]
+    sources: [ "192.168.1.0/24", "10.0.0.0/8" ]
+    permanent: true
+    immediate: true
+    state: enabled
 '''
 
 import os
@@ -329,6 +361,77 @@ def set_rich_rule_disabled_permanent(zone, rule):
     fw_zone.update(fw_settings)
 
 
+####################
+# bulk zone handling
+#
+def get_zone_changes(current, desired, desired_state):
+    changes = []
+    for item in desired:
+        if item in changes:
+            continue
+        if (item in current) != (desired_state == "enabled"):
+            changes.append(item)
+    return changes
+
+def set_zone_permanent(zone, ports, services, sources, rich_rules, desired_state, check_mode):
+    fw_zone = fw.config().getZoneByName(zone)
+    fw_settings = fw_zone.getSettings()
+    changes = dict(
+        ports=get_zone_changes([tuple(p) for p in fw_settings.getPorts()], ports, desired_state),
+        services=get_zone_changes(fw_settings.getServices(), services, desired_state),
+        sources=get_zone_changes(fw_settings.getSources(), sources, desired_state),
+        rich_rules=get_zone_changes(fw_settings.getRichRules(), rich_rules, desired_state),
+    )
+    if check_mode or not any(changes.values()):
+        return changes
+
+    if desired_state == "enabled":
+        for port, protocol in changes['ports']:
+            fw_settings.addPort(port, protocol)
+        for service in changes['services']:
+            fw_settings.addService(service)
+        for source in changes['sources']:
+            fw_settings.addSource(source)
+        for rule in changes['rich_rules']:
+            fw_settings.addRichRule(rule)
+    else:
+        for port, protocol in changes['ports']:
+            fw_settings.removePort(port, protocol)
+        for service in changes['services']:
+            fw_settings.removeService(service)
+        for source in changes['sources']:
+            fw_settings.removeSource(source)
+        for rule in changes['rich_rules']:
+            fw_settings.removeRichRule(rule)
+    fw_zone.update(fw_settings)
+    return changes
+
+def set_zone_runtime(zone, ports, services, rich_rules, desired_state, timeout, check_mode):
+    changes = dict(
+        ports=get_zone_changes([tuple(p) for p in fw.getPorts(zone)], ports, desired_state),
+        services=get_zone_changes(fw.getServices(zone), services, desired_state),
+        rich_rules=get_zone_changes(fw.getRichRules(zone), rich_rules, desired_state),
+    )
+    if check_mode:
+        return changes
+
+    if desired_state == "enabled":
+        for port, protocol in changes['ports']:
+            set_port_enabled(zone, port, protocol, timeout)
+        for service in changes['services']:
+            set_service_enabled(zone, service, timeout)
+        for rule in changes['rich_rules']:
+            set_rich_rule_enabled(zone, rule, timeout)
+    else:
+        for port, protocol in changes['ports']:
+            set_port_disabled(zone, port, protocol)
+        for service in changes['services']:
+            set_service_disabled(zone, service)
+        for rule in changes['rich_rules']:
+            set_rich_rule_disabled(zone, rule)
+    return changes
+
+
 def main():
 
     module = AnsibleModule(
@@ -344,10 +447,14 @@ def main():
             timeout=dict(type='int',required=False,default=0),
             interface=dict(required=False,default=None),
             masquerade=dict(required=False,default=None),
+            ports=dict(type='list',required=False,default=None),
+            services=dict(type='list',required=False,default=None),
+            sources=dict(type='list',required=False,default=None),
+            rich_rules=dict(type='list',required=False,default=None),
         ),
         supports_check_mode=True
     )
-    if module.params['source'] == None and module.params['permanent'] == None:
+    if module.params['source'] == None and module.params['sources'] == None and module.params['permanent'] == None:
         module.fail_json(msg='permanent is a required parameter')
 
     if module.params['interface'] != None and module.params['zone'] == None:
@@ -386,6 +493,19 @@ def main():
     interface = module.params['interface']
     masquerade = module.params['masquerade']
 
+    bulk = False
+    bulk_ports = []
+    for item in module.params['ports'] or []:
+        if '/' not in item:
+            module.fail_json(msg='improper port format for %s (missing protocol?)' % item)
+        bulk_ports.append(tuple(item.split('/', 1)))
+    bulk_services = module.params['services'] or []
+    bulk_sources = module.params['sources'] or []
+    bulk_rich_rules = [str(Rich_Rule(rule_str=rule)) for rule in module.params['rich_rules'] or []]
+    for param in ('ports', 'services', 'sources', 'rich_rules'):
+        if module.params[param] != None:
+            bulk = True
+
     ## Check for firewalld running
     try:
         if fw.connected == False:
@@ -405,10 +525,49 @@ def main():
         modification_count += 1
     if masquerade != None:
         modification_count += 1
+    if bulk:
+        modification_count += 1
 
     if modification_count > 1:
         module.fail_json(msg='can only operate on port, service, rich_rule or interface at once')
 
+    if bulk:
+        zone_changes = []
+        if permanent or bulk_sources:
+            # sources are always permanent, the rest only when asked for
+            if permanent:
+                permanent_ports = bulk_ports
+                permanent_services = bulk_services
+                permanent_rich_rules = bulk_rich_rules
+            else:
+                permanent_ports = []
+                permanent_services = []
+                permanent_rich_rules = []
+            changes = set_zone_permanent(zone, permanent_ports, permanent_services, bulk_sources,
+                                         permanent_rich_rules, desired_state, module.check_mode)
+            zone_changes.append(changes)
+            if permanent:
+                msgs.append('Permanent operation')
+        if (immediate or not permanent) and (bulk_ports or bulk_services or bulk_rich_rules):
+            changes = set_zone_runtime(zone, bulk_ports, bulk_services, bulk_rich_rules,
+                                       desired_state, timeout, module.check_mode)
+            zone_changes.append(changes)
+            msgs.append('Non-permanent operation')
+
+        for changes in zone_changes:
+            for port, protocol in changes.get('ports', []):
+                msgs.append("Changed port %s/%s to %s" % (port, protocol, desired_state))
+            for service in changes.get('services', []):
+                msgs.append("Changed service %s to %s" % (service, desired_state))
+            for source in changes.get('sources', []):
+                msgs.append("Changed source %s to %s" % (source, desired_state))
+            for rule in changes.get('rich_rules', []):
+                msgs.append("Changed rich_rule %s to %s" % (rule, desired_state))
+            if any(changes.values()):
+                changed = True
+
+        module.exit_json(changed=changed, msg=', '.join(msgs))
+
     if service != None:
         if permanent:
             is_enabled = get_service_enabled_permanent(zone, service)
@@ -23,6 +23,16 @@ BINS = dict(
     ipv6='ip6tables',
 )
 
+SAVE_BINS = dict(
+    ipv4='iptables-save',
+    ipv6='ip6tables-save',
+)
+
+RESTORE_BINS = dict(
+    ipv4='iptables-restore',
+    ipv6='ip6tables-restore',
+)
+
 DOCUMENTATION = '''
 ---
 module: iptables
@@ -75,7 +85,9 @@ options:
       - "Chain to operate on. This option can either be the name of a user
         defined chain or any of the builtin chains: 'INPUT', 'FORWARD',
         'OUTPUT', 'PREROUTING', 'POSTROUTING', 'SECMARK', 'CONNSECMARK'"
-    required: true
+      - Required unless C(rules) is given, in which case it is the default
+        chain of the listed rules.
+    required: false
   protocol:
     description:
       - The protocol of the rule or of the packet to check. The specified
@@ -288,6 +300,23 @@ options:
         type/code pair, or one of the ICMP type names shown by the command
         'iptables -p icmp -h'"
     required: false
+  rules:
+    version_added: "2.2"
+    description:
+      - "A list of rules to converge in one pass. Each item is a dict taking
+        the same rule options as the module (chain, protocol, source,
+        destination, match, jump, comment, ctstate, ...) plus C(state) and
+        C(action); options an item leaves out default to the module's
+        C(chain), C(state) and C(action), and to no value for the rule
+        options. C(table) and C(ip_version) apply to every item."
+      - "The table is read once with iptables-save, the rules are compared
+        in memory and all additions and removals are applied in a single
+        iptables-restore --noflush transaction. Rules whose saved form can
+        not be matched in memory are confirmed with iptables -C. The lines
+        applied, or that would be applied in check mode, are returned in
+        C(commands)."
+    required: false
+    default: null
 '''
 
 EXAMPLES = '''
@@ -308,9 +337,24 @@ EXAMPLES = '''
 
 # Tag all outbound tcp packets with DSCP DiffServ class CS1
 - iptables: chain=OUTPUT jump=DSCP table=mangle set_dscp_mark_class=CS1 protocol=tcp
+
+# Converge a set of rules in a single iptables-restore transaction
+- iptables:
+    chain: INPUT
+    rules:
+      - { protocol: tcp, destination_port: 22, jump: ACCEPT }
+      - { protocol: tcp, destination_port: 443, jump: ACCEPT, comment: "https" }
+      - { source: 8.8.8.8, jump: DROP, action: insert }
+      - { protocol: tcp, destination_port: 23, jump: ACCEPT, state: absent }
+  become: yes
 '''
 
 
+import re
+import shlex
+import socket
+
+
 def append_param(rule, param, flag, is_list):
     if is_list:
         for item in param:
@@ -398,6 +442,333 @@ def remove_rule(iptables_path, module, params):
     module.run_command(cmd, check_rc=True)
 
 
+# long option names and the short form iptables-save prints them as
+SAVE_ALIASES = {
+    '--protocol': '-p',
+    '--source': '-s',
+    '--destination': '-d',
+    '--match': '-m',
+    '--jump': '-j',
+    '--goto': '-g',
+    '--in-interface': '-i',
+    '--out-interface': '-o',
+    '--fragment': '-f',
+    '--source-port': '--sport',
+    '--destination-port': '--dport',
+}
+
+RULE_OPTIONS = dict(
+    protocol=None,
+    source=None,
+    to_source=None,
+    destination=None,
+    to_destination=None,
+    match=[],
+    jump=None,
+    goto=None,
+    in_interface=None,
+    out_interface=None,
+    fragment=None,
+    set_counters=None,
+    source_port=None,
+    destination_port=None,
+    to_ports=None,
+    set_dscp_mark=None,
+    set_dscp_mark_class=None,
+    comment=None,
+    ctstate=[],
+    limit=None,
+    limit_burst=None,
+    uid_owner=None,
+    reject_with=None,
+    icmp_type=None,
+)
+
+
+# options iptables-save prints in a form which can't be derived from the
+# form given, e.g. DSCP classes as numbers or user names as uids
+UNNORMALIZED_OPTIONS = ['--set-dscp', '--set-dscp-class', '--uid-owner']
+
+PORT_OPTIONS = ['--sport', '--dport', '--sports', '--dports']
+
+ICMP_TYPE_OPTIONS = ['--icmp-type', '--icmpv6-type']
+
+LIMIT_UNITS = {'s': 'sec', 'm': 'min', 'h': 'hour', 'd': 'day'}
+
+# options of the rule itself, not of one of its matches or of its target
+RULE_FLAGS = ['-p', '-s', '-d', '-i', '-o', '-f']
+
+# options of the match loaded implicitly by -p, wherever they are given
+PROTOCOL_OPTIONS = ['--sport', '--dport', '--tcp-flags', '--syn', '--tcp-option'] + ICMP_TYPE_OPTIONS
+
+# options iptables-save leaves out of a match when they have this value
+OMITTED_DEFAULTS = {
+    'limit': [('--limit-burst', ('5',))],
+}
+
+# options iptables-save prints with this value when they were not given
+PRINTED_DEFAULTS = {
+    'limit': [('--limit', ('3/hour',))],
+}
+
+# target options iptables-save prints with this value when not given
+TARGET_DEFAULTS = {
+    'ipv4': {'REJECT': [('--reject-with', ('icmp-port-unreachable',))]},
+    'ipv6': {'REJECT': [('--reject-with', ('icmp6-port-unreachable',))]},
+}
+
+
+def normalize_address(value, ip_version):
+    if '/' in value:
+        address, prefix = value.split('/', 1)
+    else:
+        address, prefix = value, None
+    if ip_version == 'ipv4':
+        family = socket.AF_INET
+        bits = 32
+    else:
+        family = socket.AF_INET6
+        bits = 128
+    try:
+        packed = socket.inet_pton(family, address)
+    except (socket.error, ValueError):
+        # a host name, iptables-save prints the addresses it resolves to
+        return None
+    if prefix is None:
+        prefix = bits
+    elif prefix.isdigit() and int(prefix) <= bits:
+        prefix = int(prefix)
+    else:
+        return None
+    # iptables-save prints the network address of the prefix
+    octets = []
+    for i in range(len(packed)):
+        keep = min(max(prefix - i * 8, 0), 8)
+        octets.append(chr(ord(packed[i]) & (0xff << (8 - keep)) & 0xff))
+    return '%s/%d' % (socket.inet_ntop(family, ''.join(octets)), prefix)
+
+
+def normalize_limit(value):
+    if '/' not in value:
+        return None
+    rate, unit = value.split('/', 1)
+    unit = LIMIT_UNITS.get(unit[:1].lower())
+    if not rate.isdigit() or unit is None:
+        return None
+    return '%s/%s' % (rate, unit)
+
+
+def normalize_rule(rule, ip_version):
+    """
+    Return the rule in a form which compares equal to the same rule as
+    printed by iptables-save, or None if the rule has parts whose saved
+    form can't be derived, e.g. host names or service names.
+    """
+    groups = []
+    negate = False
+    for token in rule:
+        token = str(token)
+        if token == '!':
+            negate = True
+        elif token.startswith('-') and not token.lstrip('-').isdigit():
+            flag = SAVE_ALIASES.get(token, token)
+            if negate:
+                flag = '!' + flag
+            groups.append([flag])
+            negate = False
+        elif groups:
+            groups[-1].append(token)
+        else:
+            return None
+
+    protocols = [g[1].lower() for g in groups if len(g) > 1 and g[0] == '-p']
+    base = []
+    matches = dict()
+    target = None
+    owner = None
+    for group in groups:
+        flag, values = group[0], group[1:]
+        option = flag.lstrip('!')
+        if option in UNNORMALIZED_OPTIONS:
+            return None
+        if flag == '-c':
+            # counters are not part of the rule
+            continue
+        if flag == '-m':
+            if not values:
+                return None
+            owner = matches.setdefault(values[0].lower(), [])
+            continue
+        if flag in ('-j', '-g'):
+            if not values:
+                return None
+            owner = []
+            target = (flag, values[0], owner)
+            continue
+        if flag == '-p':
+            values = [v.lower() for v in values]
+        elif option in ('-s', '-d'):
+            values = [normalize_address(v, ip_version) for v in values]
+        elif option in PORT_OPTIONS or option in ICMP_TYPE_OPTIONS:
+            for v in values:
+                if not v.replace(',', '').replace(':', '').replace('/', '').isdigit():
+                    # a service or icmp type name, saved as its number
+                    return None
+        elif flag == '--limit':
+            values = [normalize_limit(v) for v in values]
+        elif flag in ('--state', '--ctstate'):
+            values = [','.join(sorted(v.split(','))) for v in values]
+        if None in values:
+            return None
+        item = (flag, tuple(values))
+        if option in RULE_FLAGS:
+            base.append(item)
+        elif option in PROTOCOL_OPTIONS:
+            if not protocols:
+                return None
+            matches.setdefault(protocols[0], []).append(item)
+        elif owner is not None:
+            owner.append(item)
+        else:
+            return None
+
+    normalized_matches = []
+    for name, options in matches.items():
+        for default in OMITTED_DEFAULTS.get(name, []):
+            if default in options:
+                options.remove(default)
+        for default in PRINTED_DEFAULTS.get(name, []):
+            if default[0] not in [flag for flag, values in options]:
+                options.append(default)
+        # the options of a match stay grouped under it
+        normalized_matches.append((name, tuple(sorted(options))))
+    if target is not None:
+        flag, name, options = target
+        for default in TARGET_DEFAULTS[ip_version].get(name, []):
+            if default[0] not in [option for option, values in options]:
+                options.append(default)
+        target = (flag, name, tuple(sorted(options)))
+    base.sort()
+    normalized_matches.sort()
+    return (tuple(base), tuple(normalized_matches), target)
+
+
+def read_table(iptables_save_path, module, table, ip_version):
+    """
+    Read the rules of a table, returning the normalized rules of each
+    chain and the names of the chains with rules that could not be
+    normalized.
+    """
+    cmd = [iptables_save_path, '-t', table]
+    rc, out, _ = module.run_command(cmd, check_rc=True)
+    chains = dict()
+    unparsed = set()
+    for line in out.splitlines():
+        if line.startswith(':'):
+            chains.setdefault(line[1:].split()[0], [])
+        elif line.startswith('-A '):
+            try:
+                tokens = shlex.split(line)
+            except ValueError:
+                tokens = line.split()
+                key = None
+            else:
+                key = normalize_rule(tokens[2:], ip_version)
+            chains.setdefault(tokens[1], [])
+            if key is None:
+                unparsed.add(tokens[1])
+            else:
+                chains[tokens[1]].append(key)
+    return chains, unparsed
+
+
+def quote_restore_arg(arg):
+    if arg and not re.search(r'[\s"\'\\]', arg):
+        return arg
+    return '"%s"' % arg.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def restore_line(action, params):
+    cmd = [action, params['chain']]
+    cmd.extend(construct_rule(params))
+    return ' '.join(quote_restore_arg(str(arg)) for arg in cmd)
+
+
+def converge_rules(iptables_path, module):
+    table = module.params['table']
+    ip_version = module.params['ip_version']
+    iptables_save_path = module.get_bin_path(SAVE_BINS[ip_version], True)
+    iptables_restore_path = module.get_bin_path(RESTORE_BINS[ip_version], True)
+
+    rules = []
+    for item in module.params['rules']:
+        if not isinstance(item, dict):
+            module.fail_json(msg="each item of rules must be a dict, got: %s" % item)
+        unknown = set(item) - set(RULE_OPTIONS) - set(['chain', 'state', 'action'])
+        if unknown:
+            module.fail_json(msg="unsupported rule options: %s" % ', '.join(sorted(unknown)))
+        params = dict(RULE_OPTIONS)
+        params.update(
+            table=table,
+            chain=module.params['chain'],
+            state=module.params['state'],
+            action=module.params['action'],
+        )
+        params.update(item)
+        for key in ('match', 'ctstate'):
+            if isinstance(params[key], basestring):
+                params[key] = params[key].split(',')
+        if not params['chain']:
+            module.fail_json(msg="chain is required for rule: %s" % item)
+        if params['state'] not in ('present', 'absent') or params['action'] not in ('append', 'insert'):
+            module.fail_json(msg="invalid state or action for rule: %s" % item)
+        rules.append(params)
+
+    chains, unparsed = read_table(iptables_save_path, module, table, ip_version)
+    commands = []
+    for params in rules:
+        rule = construct_rule(params)
+        key = normalize_rule(rule, ip_version)
+        chain_exists = params['chain'] in chains
+        chain_rules = chains.setdefault(params['chain'], [])
+        should_be_present = (params['state'] == 'present')
+
+        rule_is_present = key is not None and key in chain_rules
+        if not rule_is_present and chain_exists and (key is None or params['chain'] in unparsed):
+            # the saved form of this rule or of some rules of the chain is
+            # not known, let iptables decide
+            rule_is_present = check_present(iptables_path, module, params)
+
+        if rule_is_present == should_be_present:
+            continue
+        if should_be_present:
+            if params['action'] == 'insert':
+                commands.append(restore_line('-I', params))
+                if key is not None:
+                    chain_rules.insert(0, key)
+            else:
+                commands.append(restore_line('-A', params))
+                if key is not None:
+                    chain_rules.append(key)
+        else:
+            commands.append(restore_line('-D', params))
+            if key in chain_rules:
+                chain_rules.remove(key)
+
+    args = dict(
+        changed=bool(commands),
+        ip_version=ip_version,
+        table=table,
+        commands=commands,
+    )
+
+    if commands and not module.check_mode:
+        data = '\n'.join(['*%s' % table] + commands + ['COMMIT', ''])
+        module.run_command([iptables_restore_path, '--noflush'], data=data, check_rc=True)
+
+    module.exit_json(**args)
+
+
 def main():
     module = AnsibleModule(
         supports_check_mode=True,
@@ -406,7 +777,7 @@ def main():
             state=dict(required=False, default='present', choices=['present', 'absent']),
             action=dict(required=False, default='append', type='str', choices=['append', 'insert']),
             ip_version=dict(required=False, default='ipv4', choices=['ipv4', 'ipv6']),
-            chain=dict(required=True, default=None, type='str'),
+            chain=dict(required=False, default=None, type='str'),
             protocol=dict(required=False, default=None, type='str'),
             source=dict(required=False, default=None, type='str'),
             to_source=dict(required=False, default=None, type='str'),
@@ -431,11 +802,20 @@ def main():
             uid_owner=dict(required=False, default=None, type='str'),
             reject_with=dict(required=False, default=None, type='str'),
             icmp_type=dict(required=False, default=None, type='str'),
+            rules=dict(required=False, default=None, type='list'),
         ),
         mutually_exclusive=(
             ['set_dscp_mark', 'set_dscp_mark_class'],
         ),
+        required_one_of=(
+            ['chain', 'rules'],
+        ),
     )
+
+    if module.params['rules'] is not None:
+        iptables_path = module.get_bin_path(BINS[module.params['ip_version']], True)
+        converge_rules(iptables_path, module)
+
     args = dict(
         changed=False,
         failed=False,
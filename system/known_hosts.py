@@ -26,14 +26,15 @@ description:
    - The M(known_hosts) module lets you add or remove a host keys from the C(known_hosts) file.
    - Starting at Ansible 2.2, multiple entries per host are allowed, but only one for each key type supported by ssh.
      This is useful if you're going to want to use the M(git) module over ssh, for example.
-   - If you have a very large number of host keys to manage, you will find the M(template) module more useful.
+   - If you have a very large number of host keys to manage, use the I(keys) option or the M(template) module.
 version_added: "1.9"
 options:
   name:
     aliases: [ 'host' ]
     description:
-      - The host to add or remove (must match a host specified in key)
-    required: true
+      - The host to add or remove (must match a host specified in key).
+        Required unless C(keys) is given.
+    required: false
     default: null
   key:
     description:
@@ -51,6 +52,15 @@ options:
     choices: [ "present", "absent" ]
     required: no
     default: present
+  keys:
+    description:
+      - A list of dicts with C(name), C(key) and optionally C(state) (defaulting
+        to the module's I(state)) to add or remove many host keys at once. The
+        file is read and indexed once, plain and hashed entries included, and
+        written back with a single atomic rewrite.
+    required: no
+    default: null
+    version_added: "2.2"
 requirements: [ ]
 author: "Matthew Vernon (@mcv21)"
 '''
@@ -61,6 +71,17 @@ EXAMPLES = '''
   known_hosts: path='/etc/ssh/ssh_known_hosts'
                name='foo.com.invalid'
                key="{{ lookup('file', 'pubkeys/foo.com.invalid') }}"
+
+# Seed many host keys in one rewrite of the file
+- known_hosts:
+    path: /etc/ssh/ssh_known_hosts
+    keys:
+      - name: foo.com.invalid
+        key: "{{ lookup('file', 'pubkeys/foo.com.invalid') }}"
+      - name: bar.com.invalid
+        key: "{{ lookup('file', 'pubkeys/bar.com.invalid') }}"
+      - name: old.com.invalid
+        state: absent
 '''
 
 # Makes sure public host keys are present or absent in the given known_hosts
@@ -72,27 +93,168 @@ EXAMPLES = '''
 #    key = line(s) to add to known_hosts file
 #    path = the known_hosts file to edit (default: ~/.ssh/known_hosts)
 #    state = absent|present (default: present)
+#    keys = list of dicts with the name, key and state arguments above
 
 import os
 import os.path
 import tempfile
 import errno
 import re
+import hmac
+import base64
+try:
+    from hashlib import sha1
+except ImportError:
+    # python 2.4
+    import sha as sha1
 from ansible.module_utils.pycompat24 import get_exception
 from ansible.module_utils.basic import *
 
+try:
+    text_type = unicode
+except NameError:
+    text_type = str
+
+class KnownHosts(object):
+    '''
+    In-memory copy of a known_hosts file.
+
+    Plain host names are indexed so they can be looked up directly;
+    hashed entries (HashKnownHosts) and wildcard patterns are kept in a
+    separate list and matched the way ssh does. Removed lines are left
+    as None so that line indexes stay valid until the file is written.
+    '''
+
+    def __init__(self, lines):
+        self.lines = []
+        self.plain = dict()
+        self.patterns = []
+        for line in lines:
+            self.add(line)
+
+    def add(self, line):
+        self.lines.append(line)
+        index = len(self.lines) - 1
+        hosts = parse_hosts_field(line)
+        if hosts is None:
+            return
+        if hosts.startswith('|') or re.search(r'[*?!]', hosts):
+            self.patterns.append(index)
+        else:
+            for name in hosts.split(','):
+                self.plain.setdefault(name.lower(), []).append(index)
+
+    def remove(self, index):
+        self.lines[index] = None
+
+    def lookup(self, host):
+        '''Returns the indexes of the lines holding a key for host.'''
+        indexes = set(self.plain.get(host.lower(), []))
+        for index in self.patterns:
+            if self.lines[index] is not None and match_host(parse_hosts_field(self.lines[index]), host):
+                indexes.add(index)
+        return sorted(i for i in indexes if self.lines[i] is not None)
+
+    def content(self):
+        return ''.join(line for line in self.lines if line is not None)
+
+def parse_hosts_field(line):
+    '''Returns the host field of a known_hosts line, or None for comments.'''
+    fields = line.split()
+    if not fields or fields[0].startswith('#'):
+        return None
+    if fields[0].startswith('@'):
+        if len(fields) < 2:
+            return None
+        return fields[1]
+    return fields[0]
+
+def match_host(hosts, host):
+    '''
+    Returns True if host matches the host field of a known_hosts line,
+    which is either a hashed name or a comma separated list of names and
+    patterns, some of which may be negated.
+    '''
+    if hosts.startswith('|1|'):
+        try:
+            salt, hashed = hosts[3:].split('|', 1)
+            salt = base64.b64decode(salt)
+            hashed = base64.b64decode(hashed)
+        except (ValueError, TypeError):
+            return False
+        if isinstance(host, text_type):
+            host = host.encode('utf-8')
+        return hmac.new(salt, host, sha1).digest() == hashed
+    matched = False
+    for pattern in hosts.split(','):
+        negate = pattern.startswith('!')
+        regex = re.escape(pattern.lstrip('!').lower()).replace('\\*', '.*').replace('\\?', '.')
+        if re.match(regex + '$', host.lower()):
+            if negate:
+                return False
+            matched = True
+    return matched
+
+def read_known_hosts(module, path):
+    try:
+        f = open(path, "r")
+    except IOError:
+        e = get_exception()
+        if e.errno == errno.ENOENT:
+            return KnownHosts([])
+        module.fail_json(msg="Failed to read %s: %s" % (path,str(e)))
+    try:
+        return KnownHosts(f.readlines())
+    finally:
+        f.close()
+
+def write_known_hosts(module, path, known_hosts):
+    try:
+        outf=tempfile.NamedTemporaryFile(dir=os.path.dirname(path))
+        outf.write(known_hosts.content())
+        outf.flush()
+        module.atomic_move(outf.name,path)
+    except (IOError,OSError):
+        e = get_exception()
+        module.fail_json(msg="Failed to write to file %s: %s" % \
+                             (path,str(e)))
+
+    try:
+        outf.close()
+    except:
+        pass
+
 def enforce_state(module, params):
     """
     Add or remove key.
     """
 
-    host = params["name"]
-    key = params.get("key",None)
-    port = params.get("port",None)
     path = params.get("path")
-    state = params.get("state")
-    #Find the ssh-keygen binary
-    sshkeygen = module.get_bin_path("ssh-keygen",True)
+    keys = params.get("keys")
+    if keys is None:
+        keys = [dict(name=params["name"], key=params.get("key"), state=params.get("state"))]
+
+    known_hosts = read_known_hosts(module, path)
+    changed = False
+    for item in keys:
+        if not isinstance(item, dict) or not item.get("name"):
+            module.fail_json(msg="Each item of keys needs a name, got: %s" % item)
+        state = item.get("state") or params.get("state")
+        if state not in ("present", "absent"):
+            module.fail_json(msg="Invalid state %s for host %s" % (state, item["name"]))
+        if apply_host_key(module, known_hosts, item["name"], item.get("key"), state):
+            changed = True
+
+    if changed and not module.check_mode:
+        write_known_hosts(module, path, known_hosts)
+
+    params['changed'] = changed
+    return params
+
+def apply_host_key(module, known_hosts, host, key, state):
+    """
+    Add or remove the key of host in known_hosts, returning whether it changed.
+    """
 
     # Trailing newline in files gets lost, so re-add if necessary
     if key and key[-1] != '\n':
@@ -101,143 +263,85 @@ def enforce_state(module, params):
     if key is None and state != "absent":
         module.fail_json(msg="No key specified when adding a host")
 
-    sanity_check(module,host,key,sshkeygen)
+    sanity_check(module,host,key)
+
+    found,replace_or_add,found_line=search_for_host_key(module,host,key,known_hosts)
 
-    found,replace_or_add,found_line=search_for_host_key(module,host,key,path,sshkeygen)
+    #Only remove whole host if found and no key provided
+    if key is None:
+        if not found:
+            return False
+        for index in known_hosts.lookup(host):
+            known_hosts.remove(index)
+        return True
 
     #We will change state if found==True & state!="present"
     #or found==False & state=="present"
-    #i.e found XOR (state=="present")
     #Alternatively, if replace is true (i.e. key present, and we must change it)
-    if module.check_mode:
-        module.exit_json(changed = replace_or_add or (state=="present") != found)
-
-    #Now do the work.
-
-    #Only remove whole host if found and no key provided
-    if found and key is None and state=="absent":
-        module.run_command([sshkeygen,'-R',host,'-f',path], check_rc=True)
-        params['changed'] = True
-
-    #Next, add a new (or replacing) entry
-    if replace_or_add or found != (state=="present"):
-        try:
-            inf=open(path,"r")
-        except IOError:
-            e = get_exception()
-            if e.errno == errno.ENOENT:
-                inf=None
-            else:
-                module.fail_json(msg="Failed to read %s: %s" % \
-                                     (path,str(e)))
-        try:
-            outf=tempfile.NamedTemporaryFile(dir=os.path.dirname(path))
-            if inf is not None:
-                for line_number, line in enumerate(inf, start=1):
-                    if found_line==line_number and (replace_or_add or state=='absent'):
-                        continue # skip this line to replace its key
-                    outf.write(line)
-                inf.close()
-            if state == 'present':
-                outf.write(key)
-            outf.flush()
-            module.atomic_move(outf.name,path)
-        except (IOError,OSError):
-            e = get_exception()
-            module.fail_json(msg="Failed to write to file %s: %s" % \
-                                 (path,str(e)))
-
-        try:
-            outf.close()
-        except:
-            pass
-
-        params['changed'] = True
-
-    return params
-
-def sanity_check(module,host,key,sshkeygen):
+    if state == "absent":
+        if found_line is None:
+            return False
+        known_hosts.remove(found_line)
+        return True
+
+    if found and not replace_or_add:
+        return False
+    if found_line is not None:
+        known_hosts.remove(found_line) # skip this line to replace its key
+    for line in key.splitlines(True):
+        known_hosts.add(line)
+    return True
+
+def sanity_check(module,host,key):
     '''Check supplied key is sensible
 
     host and key are parameters provided by the user; If the host
     provided is inconsistent with the key supplied, then this function
     quits, providing an error to the user.
-    sshkeygen is the path to ssh-keygen, found earlier with get_bin_path
     '''
     #If no key supplied, we're doing a removal, and have nothing to check here.
     if key is None:
         return
-    #Rather than parsing the key ourselves, get ssh-keygen to do it
-    #(this is essential for hashed keys, but otherwise useful, as the
-    #key question is whether ssh-keygen thinks the key matches the host).
-
-    #The approach is to write the key to a temporary file,
-    #and then attempt to look up the specified host in that file.
-    try:
-        outf=tempfile.NamedTemporaryFile()
-        outf.write(key)
-        outf.flush()
-    except IOError:
-        e = get_exception()
-        module.fail_json(msg="Failed to write to temporary file %s: %s" % \
-                             (outf.name,str(e)))
-    rc,stdout,stderr=module.run_command([sshkeygen,'-F',host,
-                                         '-f',outf.name],
-                                        check_rc=True)
-    try:
-        outf.close()
-    except:
-        pass
-
-    if stdout=='': #host not found
-        module.fail_json(msg="Host parameter does not match hashed host field in supplied key")
-
-def search_for_host_key(module,host,key,path,sshkeygen):
-    '''search_for_host_key(module,host,key,path,sshkeygen) -> (found,replace_or_add,found_line)
-
-    Looks up host and keytype in the known_hosts file path; if it's there, looks to see
+    #The key question is whether the host field of the key, which may be
+    #hashed, matches the host.
+    for line in key.splitlines():
+        hosts = parse_hosts_field(line)
+        if hosts is not None and match_host(hosts, host):
+            return
+    module.fail_json(msg="Host parameter does not match hashed host field in supplied key")
+
+def search_for_host_key(module,host,key,known_hosts):
+    '''search_for_host_key(module,host,key,known_hosts) -> (found,replace_or_add,found_line)
+
+    Looks up host and keytype in the known_hosts index; if it's there, looks to see
     if one of those entries matches key. Returns:
-    found (Boolean): is host found in path?
-    replace_or_add (Boolean): is the key in path different to that supplied by user?
-    found_line (int or None): the line where a key of the same type was found
+    found (Boolean): is host found in known_hosts?
+    replace_or_add (Boolean): is the key in known_hosts different to that supplied by user?
+    found_line (int or None): the index of the line where a key of the same type was found
     if found=False, then replace is always False.
-    sshkeygen is the path to ssh-keygen, found earlier with get_bin_path
     '''
-    if os.path.exists(path)==False:
-        return False, False, None
-    #openssh >=6.4 has changed ssh-keygen behaviour such that it returns
-    #1 if no host is found, whereas previously it returned 0
-    rc,stdout,stderr=module.run_command([sshkeygen,'-F',host,'-f',path],
-                                 check_rc=False)
-    if stdout=='' and stderr=='' and (rc==0 or rc==1):
-        return False, False, None #host not found, no other errors
-    if rc!=0: #something went wrong
-        module.fail_json(msg="ssh-keygen failed (rc=%d,stdout='%s',stderr='%s')" % (rc,stdout,stderr))
+    indexes = known_hosts.lookup(host)
+    if not indexes:
+        return False, False, None #host not found
 
     #If user supplied no key, we don't want to try and replace anything with it
     if key is None:
         return True, False, None
 
-    lines=stdout.split('\n')
     new_key = normalize_known_hosts_key(key, host)
 
-    for l in lines:
-        if l=='':
+    found_line = None
+    for index in indexes:
+        try:
+            found_key = normalize_known_hosts_key(known_hosts.lines[index],host)
+        except IndexError:
             continue
-        elif l[0]=='#': # info output from ssh-keygen; contains the line number where key was found
-            try:
-                # This output format has been hardcoded in ssh-keygen since at least OpenSSH 4.0
-                # It always outputs the non-localized comment before the found key
-                found_line = int(re.search(r'found: line (\d+)', l).group(1))
-            except IndexError:
-                e = get_exception()
-                module.fail_json(msg="failed to parse output of ssh-keygen for line number: '%s'" % l)
-        else:
-            found_key = normalize_known_hosts_key(l,host)
-            if new_key==found_key: #found a match
-                return True, False, found_line  #found exactly the same key, don't replace
-            elif new_key['type'] == found_key['type']: # found a different key for the same key type
-                return True, True, found_line
+        if new_key==found_key: #found a match
+            return True, False, index  #found exactly the same key, don't replace
+        elif new_key['type'] == found_key['type']: # found a different key for the same key type
+            found_line = index
+    if found_line is not None:
+        return True, True, found_line
     #No match found, return found and replace, but no line
     return True, True, None
 
@@ -269,11 +373,13 @@ def main():
 
     module = AnsibleModule(
         argument_spec = dict(
-            name      = dict(required=True,  type='str', aliases=['host']),
+            name      = dict(required=False, type='str', aliases=['host']),
             key       = dict(required=False,  type='str'),
             path      = dict(default="~/.ssh/known_hosts", type='path'),
             state     = dict(default='present', choices=['absent','present']),
+            keys      = dict(required=False, type='list'),
             ),
+        required_one_of = [['name', 'keys']],
         supports_check_mode = True
         )
 